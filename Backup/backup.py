@@ -1,18 +1,358 @@
 from config import db
-import sqlite3
 from datetime import datetime
+import glob
+import hashlib
 import os
-import pandas as pd
-
-def create_sqlite_backup():
-    backup_dir = "backups"
-    os.makedirs(backup_dir, exist_ok=True)
-    backup_path = os.path.join(backup_dir, f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db")
-    
-    supabase_engine = db.get_engine()
-    with sqlite3.connect(backup_path) as sqlite_conn:
-        for table in db.metadata.tables.keys():
-            df = pd.read_sql_table(table, supabase_engine)
-            df.to_sql(table, sqlite_conn, if_exists='replace', index=False)
-    
-    return backup_path
\ No newline at end of file
+import queue
+import shutil
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from sqlalchemy import create_engine, select, insert, MetaData, Table, Column, Integer, String
+from sqlalchemy.dialects import sqlite
+
+CHUNK_SIZE = 5000
+# largura, em valores da primeira coluna da chave primária, de cada bloco
+# comparado entre backups; um bloco alterado é regravado inteiro no delta
+BLOCK_SIZE = 1000
+BACKUP_DIR = "backups"
+MODES = ("completo", "incremental", "diferencial")
+
+backup_metadata = MetaData()
+
+backup_info = Table(
+    "_backup_info", backup_metadata,
+    Column("chave", String(20), primary_key=True),
+    Column("valor", String(255))
+)
+
+# digest de cada bloco de cada tabela no momento do backup
+backup_manifest = Table(
+    "_backup_manifest", backup_metadata,
+    Column("tabela", String(64), primary_key=True),
+    Column("bloco", Integer, primary_key=True),
+    Column("digest", String(32), nullable=False)
+)
+
+# blocos que o delta substitui (inclusive os que deixaram de existir)
+backup_blocks = Table(
+    "_backup_blocks", backup_metadata,
+    Column("tabela", String(64), primary_key=True),
+    Column("bloco", Integer, primary_key=True),
+    Column("coluna", String(64), nullable=False),
+    Column("inicio", Integer, nullable=False),
+    Column("fim", Integer, nullable=False)
+)
+
+# assinatura de cada tabela (só PostgreSQL); uma tabela com a mesma
+# assinatura do backup de referência não é lida de novo
+backup_tables = Table(
+    "_backup_tables", backup_metadata,
+    Column("tabela", String(64), primary_key=True),
+    Column("linhas", Integer, nullable=False),
+    Column("maior_chave", Integer),
+    Column("assinatura", String(40), nullable=False)
+)
+
+def _signature(source_conn, table):
+    # xmin e ctid mudam a cada INSERT ou UPDATE de uma linha, então a soma dos
+    # seus hashes (com contagem e maior chave) muda com qualquer escrita visível
+    # no snapshot. A varredura roda no servidor: nada é transferido nem
+    # hasheado aqui. Sem colunas de sistema equivalentes (SQLite), não há
+    # assinatura e a tabela é sempre comparada bloco a bloco.
+    if source_conn.dialect.name != "postgresql":
+        return None
+    preparer = source_conn.dialect.identifier_preparer
+    key = list(table.primary_key.columns)[0]
+    rows, max_key, hashes = source_conn.exec_driver_sql(
+        f"SELECT count(*), max({preparer.quote(key.name)}), "
+        f"sum(hashtextextended(xmin::text || ':' || ctid::text, 0)) "
+        f"FROM {preparer.format_table(table)}"
+    ).one()
+    return rows, max_key, str(hashes)
+
+def _blocks(result, key_index):
+    block, rows = None, []
+    for chunk in result.partitions():
+        for row in chunk:
+            row = tuple(row)
+            current = row[key_index] // BLOCK_SIZE
+            if rows and current != block:
+                yield block, rows
+                rows = []
+            block = current
+            rows.append(row)
+    if rows:
+        yield block, rows
+
+def _copy_table(source_conn, write, table, chunk_size, previous=None, previous_signature=None):
+    signature = _signature(source_conn, table)
+    if previous is not None and signature is not None and signature == previous_signature:
+        return 0, dict(previous), [], signature
+
+    # stream_results abre um cursor no servidor (PostgreSQL), então só um
+    # lote de linhas fica em memória por vez, qualquer que seja a tabela
+    key_columns = list(table.primary_key.columns)
+    key_index = list(table.columns).index(key_columns[0])
+    result = source_conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+        select(table).order_by(*key_columns)
+    )
+    statement = str(insert(table).compile(dialect=sqlite.dialect()))
+
+    rows, manifest, changed = 0, {}, []
+    for block, block_rows in _blocks(result, key_index):
+        manifest[block] = hashlib.blake2b(repr(block_rows).encode(), digest_size=16).hexdigest()
+        if previous is not None and previous.get(block) == manifest[block]:
+            continue
+        # tuplas direto no executemany do sqlite3, na ordem das colunas da tabela
+        write(statement, block_rows)
+        rows += len(block_rows)
+        changed.append(block)
+
+    if previous is not None:
+        changed += [block for block in previous if block not in manifest]
+    return rows, manifest, changed, signature
+
+def _new_backup_path(prefix):
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(BACKUP_DIR, f"{prefix}_{stamp}.db")
+    suffix = 1
+    while os.path.exists(path):
+        path = os.path.join(BACKUP_DIR, f"{prefix}_{stamp}_{suffix}.db")
+        suffix += 1
+    return path
+
+def _read_info(path):
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT chave, valor FROM _backup_info"))
+    except sqlite3.OperationalError:
+        # backups anteriores ao manifesto não servem de referência
+        return None
+    finally:
+        conn.close()
+
+def _read_manifest(path):
+    conn = sqlite3.connect(path)
+    try:
+        manifest = {}
+        for table, block, digest in conn.execute("SELECT tabela, bloco, digest FROM _backup_manifest"):
+            manifest.setdefault(table, {})[block] = digest
+        return manifest
+    finally:
+        conn.close()
+
+def _read_signatures(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {
+            table: (rows, max_key, signature)
+            for table, rows, max_key, signature in conn.execute(
+                "SELECT tabela, linhas, maior_chave, assinatura FROM _backup_tables"
+            )
+        }
+    except sqlite3.OperationalError:
+        # backups anteriores às assinaturas: todas as tabelas são lidas
+        return {}
+    finally:
+        conn.close()
+
+def _chain(path):
+    chain = [path]
+    info = _read_info(path)
+    while info and info.get("anterior"):
+        chain.append(os.path.join(os.path.dirname(path), info["anterior"]))
+        info = _read_info(chain[-1])
+    if not info or info.get("tipo") != "completo":
+        raise ValueError(f"Cadeia de backups incompleta a partir de {path}")
+    return list(reversed(chain))
+
+def latest_backup(backup_dir=BACKUP_DIR):
+    backups = []
+    for path in glob.glob(os.path.join(backup_dir, "*.db")):
+        info = _read_info(path)
+        if info:
+            backups.append((info["criado_em"], path))
+    return max(backups)[1] if backups else None
+
+@contextmanager
+def _snapshot_connection(engine, snapshot=None):
+    # todas as tabelas são lidas dentro de uma única transação de leitura,
+    # para que uma súmula nunca seja copiada sem os seus gols
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+            if snapshot:
+                conn.exec_driver_sql(f"SET TRANSACTION SNAPSHOT '{snapshot}'")
+        elif engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("BEGIN")
+        yield conn
+
+def _copy_sequential(target_conn, tables, chunk_size, previous, signatures):
+    results = {}
+    with _snapshot_connection(db.engine) as source_conn:
+        for table in tables:
+            start = time.perf_counter()
+            results[table.name] = _copy_table(
+                source_conn, target_conn.exec_driver_sql, table, chunk_size,
+                previous.get(table.name), signatures.get(table.name)
+            ) + (time.perf_counter() - start,)
+    return results
+
+def _copy_parallel(target_conn, tables, chunk_size, previous, signatures, workers):
+    # cada thread lê uma tabela numa conexão própria que importa o snapshot
+    # exportado pela conexão coordenadora; a escrita no SQLite fica na thread
+    # principal, alimentada por uma fila limitada
+    engine = db.engine
+    pending = queue.Queue(maxsize=workers * 2)
+    cancelled = threading.Event()
+    finished = object()
+
+    def enqueue(item):
+        while not cancelled.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise RuntimeError("Backup cancelado")
+
+    def copy(table, snapshot):
+        try:
+            start = time.perf_counter()
+            with _snapshot_connection(engine, snapshot) as source_conn:
+                result = _copy_table(
+                    source_conn, lambda statement, rows: enqueue((statement, rows)),
+                    table, chunk_size, previous.get(table.name), signatures.get(table.name)
+                )
+            return result + (time.perf_counter() - start,)
+        finally:
+            if not cancelled.is_set():
+                enqueue(finished)
+
+    with _snapshot_connection(engine) as coordinator:
+        snapshot = coordinator.exec_driver_sql("SELECT pg_export_snapshot()").scalar()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {table.name: pool.submit(copy, table, snapshot) for table in tables}
+            try:
+                running = len(futures)
+                while running:
+                    item = pending.get()
+                    if item is finished:
+                        running -= 1
+                    else:
+                        target_conn.exec_driver_sql(*item)
+            except BaseException:
+                cancelled.set()
+                raise
+            return {name: future.result() for name, future in futures.items()}
+
+def _run_backup(mode, chunk_size, reference=None, workers=1):
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    backup_path = _new_backup_path("backup" if reference is None else "delta")
+    previous = _read_manifest(reference) if reference else None
+    signatures = _read_signatures(reference) if reference else {}
+
+    sqlite_engine = create_engine(f"sqlite:///{backup_path}")
+    db.metadata.create_all(sqlite_engine)
+    backup_metadata.create_all(sqlite_engine)
+
+    tables = db.metadata.sorted_tables
+    report = []
+    try:
+        with sqlite_engine.begin() as target_conn:
+            # sem snapshot exportável (SQLite), a cópia é sequencial numa só transação
+            if workers > 1 and db.engine.dialect.name == "postgresql":
+                results = _copy_parallel(target_conn, tables, chunk_size, previous or {}, signatures, workers)
+            else:
+                results = _copy_sequential(target_conn, tables, chunk_size, previous or {}, signatures)
+
+            for table in tables:
+                rows, manifest, changed, signature, seconds = results[table.name]
+                if signature is not None:
+                    target_conn.execute(insert(backup_tables), [
+                        {"tabela": table.name, "linhas": signature[0], "maior_chave": signature[1], "assinatura": signature[2]}
+                    ])
+                if manifest:
+                    target_conn.execute(insert(backup_manifest), [
+                        {"tabela": table.name, "bloco": block, "digest": digest}
+                        for block, digest in manifest.items()
+                    ])
+                if previous is not None and changed:
+                    column = list(table.primary_key.columns)[0].name
+                    target_conn.execute(insert(backup_blocks), [
+                        {
+                            "tabela": table.name,
+                            "bloco": block,
+                            "coluna": column,
+                            "inicio": block * BLOCK_SIZE,
+                            "fim": (block + 1) * BLOCK_SIZE
+                        }
+                        for block in changed
+                    ])
+                report.append({
+                    "tabela": table.name,
+                    "linhas": rows,
+                    "blocos": len(changed) if previous is not None else len(manifest),
+                    "segundos": round(seconds, 3)
+                })
+
+            target_conn.execute(insert(backup_info), [
+                {"chave": "tipo", "valor": mode},
+                {"chave": "anterior", "valor": os.path.basename(reference) if reference else None},
+                {"chave": "criado_em", "valor": datetime.now().isoformat()}
+            ])
+    finally:
+        sqlite_engine.dispose()
+
+    return backup_path, report
+
+def create_sqlite_backup(chunk_size=CHUNK_SIZE, workers=1):
+    return _run_backup("completo", chunk_size, workers=workers)
+
+def create_delta_backup(differential=False, chunk_size=CHUNK_SIZE, workers=1):
+    # incremental: alterações desde o último backup da cadeia
+    # diferencial: alterações desde o último backup completo
+    reference = latest_backup()
+    if reference is None:
+        return create_sqlite_backup(chunk_size, workers)
+    if differential:
+        reference = _chain(reference)[0]
+    return _run_backup("diferencial" if differential else "incremental", chunk_size, reference, workers)
+
+def restore_backup(path, target_path):
+    chain = _chain(path)
+    shutil.copyfile(chain[0], target_path)
+
+    conn = sqlite3.connect(target_path)
+    try:
+        for delta in chain[1:]:
+            conn.execute("ATTACH DATABASE ? AS delta", (delta,))
+            blocks = conn.execute("SELECT tabela, coluna, inicio, fim FROM delta._backup_blocks").fetchall()
+            for table, column, start, end in blocks:
+                exists = conn.execute(
+                    "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                ).fetchone()
+                if not exists:
+                    # tabela criada depois do backup completo
+                    (ddl,) = conn.execute(
+                        "SELECT sql FROM delta.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                    ).fetchone()
+                    conn.execute(ddl)
+                conn.execute(f'DELETE FROM main."{table}" WHERE "{column}" >= ? AND "{column}" < ?', (start, end))
+                conn.execute(
+                    f'INSERT INTO main."{table}" SELECT * FROM delta."{table}" WHERE "{column}" >= ? AND "{column}" < ?',
+                    (start, end)
+                )
+            conn.commit()
+            conn.execute("DETACH DATABASE delta")
+
+        for table in backup_metadata.tables:
+            conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        conn.commit()
+    finally:
+        conn.close()
+
+    return chain
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request, g, Response
+from Model.versao import obter_versao
+
+class CacheRespostas:
+    def __init__(self):
+        self._itens = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+
+    def obter(self, chave):
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[0]
+
+    def guardar(self, chave, valor, tamanho, limite_bytes):
+        if tamanho > limite_bytes:
+            return
+        with self._lock:
+            if chave in self._itens:
+                self._bytes -= self._itens.pop(chave)[1]
+            self._itens[chave] = (valor, tamanho)
+            self._bytes += tamanho
+            while self._bytes > limite_bytes:
+                _, (_, tamanho_removido) = self._itens.popitem(last=False)
+                self._bytes -= tamanho_removido
+                self.descartes += 1
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self._bytes = 0
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "itens": len(self._itens),
+                "bytes": self._bytes,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "descartes": self.descartes
+            }
+
+cache = CacheRespostas()
+
+def versao_da_requisicao(competicao_id=None):
+    versoes = g.setdefault("versoes_dados", {})
+    if competicao_id not in versoes:
+        versoes[competicao_id] = obter_versao(competicao_id)
+    return versoes[competicao_id]
+
+def _separar(resultado):
+    if isinstance(resultado, tuple):
+        return resultado[0], (resultado[1] if len(resultado) > 1 else 200)
+    if isinstance(resultado, Response):
+        return resultado, resultado.status_code
+    return resultado, 200
+
+def cache_resposta(competicao_arg=None):
+    def decorador(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            versao = versao_da_requisicao(kwargs.get(competicao_arg) if competicao_arg else None)
+            chave = (request.path, request.query_string, versao)
+
+            guardado = cache.obter(chave)
+            if guardado is not None:
+                tipo, valor = guardado
+                if tipo == "resposta":
+                    dados, mimetype, cabecalhos = valor
+                    return current_app.response_class(dados, status=200, mimetype=mimetype, headers=cabecalhos)
+                return valor
+
+            resultado = func(*args, **kwargs)
+            corpo, status = _separar(resultado)
+            if status != 200:
+                return resultado
+
+            if isinstance(corpo, Response):
+                if corpo.is_streamed:
+                    return resultado
+                dados = corpo.get_data()
+                cabecalhos = dict(resultado[2]) if isinstance(resultado, tuple) and len(resultado) > 2 else {}
+                valor, tamanho = ("resposta", (dados, corpo.mimetype, cabecalhos)), len(dados)
+            else:
+                valor, tamanho = ("dados", resultado), len(json.dumps(corpo, default=str))
+
+            cache.guardar(chave, valor, tamanho, current_app.config.get("CACHE_RESPOSTAS_BYTES", 64 * 1024 * 1024))
+            return resultado
+        return wrapper
+    return decorador
+
+def _com_cabecalhos(resultado, cabecalhos):
+    if isinstance(resultado, Response):
+        resultado.headers.update(cabecalhos)
+        return resultado
+    if isinstance(resultado, tuple):
+        if isinstance(resultado[0], Response):
+            resultado[0].headers.update(cabecalhos)
+            return resultado
+        corpo, status, *resto = resultado
+        extras = dict(resto[0]) if resto else {}
+        extras.update(cabecalhos)
+        return corpo, status, extras
+    return resultado, 200, cabecalhos
+
+def etag_versionado(competicao_arg=None):
+    def decorador(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            versao = versao_da_requisicao(kwargs.get(competicao_arg) if competicao_arg else None)
+            assinatura = f"{request.path}?{request.query_string.decode()}|{versao}"
+            etag = hashlib.sha1(assinatura.encode()).hexdigest()
+            cabecalhos = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+
+            if request.if_none_match.contains(etag):
+                return current_app.response_class(status=304, headers=cabecalhos)
+
+            resultado = func(*args, **kwargs)
+            if _separar(resultado)[1] != 200:
+                return resultado
+            return _com_cabecalhos(resultado, cabecalhos)
+        return wrapper
+    return decorador
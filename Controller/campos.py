@@ -0,0 +1,25 @@
+from flask import request
+
+def _lista(nome):
+    valor = request.args.get(nome)
+    if valor is None:
+        return None
+    return {c.strip() for c in valor.split(",") if c.strip()}
+
+def ler_campos(basicos, grupos=None):
+    campos = _lista("fields")
+    incluir = _lista("include")
+    if campos is None and incluir is None:
+        return None
+
+    selecionados = set(basicos) if campos is None else campos | {"id"}
+    selecionados |= incluir or set()
+    for nome, membros in (grupos or {}).items():
+        if nome in selecionados:
+            selecionados |= set(membros)
+    return selecionados
+
+def filtrar_modelo(modelo, campos):
+    if campos is None:
+        return modelo
+    return {nome: campo for nome, campo in modelo.items() if nome in campos}
@@ -0,0 +1,106 @@
+import time
+import click
+from flask.cli import AppGroup
+from Model.estatisticas import ReconstruirEstatisticas, VerificarEstatisticas
+from Model.classificacao import ReconstruirClassificacoes, VerificarClassificacoes
+from Model.importacao import ImportarRegistros, TIPOS_IMPORTACAO, FORMATOS_IMPORTACAO
+from Backup.backup import create_sqlite_backup, create_delta_backup, restore_backup, CHUNK_SIZE, MODES
+
+Estatisticas_CLI = AppGroup("estatisticas", help="Manutenção das estatísticas persistidas dos jogadores")
+Classificacao_CLI = AppGroup("classificacao", help="Manutenção das classificações persistidas dos grupos")
+Importacao_CLI = AppGroup("importacao", help="Importação em massa de cadastros")
+Backup_CLI = AppGroup("backup", help="Cópias de segurança do banco em arquivos SQLite")
+
+@Estatisticas_CLI.command("reconstruir")
+def reconstruir_estatisticas():
+    """Recalcula as estatísticas de todos os jogadores a partir das súmulas"""
+    total = ReconstruirEstatisticas()
+    click.echo(f"Estatísticas recalculadas para {total} jogadores")
+
+    divergencias = VerificarEstatisticas()
+    if divergencias:
+        raise click.ClickException(f"{len(divergencias)} divergências após a reconstrução")
+    click.echo("Estatísticas conferem com as súmulas")
+
+@Estatisticas_CLI.command("verificar")
+def verificar_estatisticas():
+    """Compara as estatísticas persistidas com a contagem das súmulas"""
+    divergencias = VerificarEstatisticas()
+    for d in divergencias:
+        click.echo(f"Jogador {d['jogador_id']} - {d['categoria']}: persistido {d['persistido']}, real {d['real']}")
+
+    if divergencias:
+        raise click.ClickException(f"{len(divergencias)} divergências encontradas")
+    click.echo("Estatísticas conferem com as súmulas")
+
+
+@Classificacao_CLI.command("reconstruir")
+def reconstruir_classificacoes():
+    """Recalcula a classificação de todos os grupos a partir das partidas"""
+    total = ReconstruirClassificacoes()
+    click.echo(f"Classificação recalculada para {total} grupos")
+
+    divergencias = VerificarClassificacoes()
+    if divergencias:
+        raise click.ClickException(f"{len(divergencias)} divergências após a reconstrução")
+    click.echo("Classificações conferem com as partidas")
+
+@Classificacao_CLI.command("verificar")
+def verificar_classificacoes():
+    """Compara as classificações persistidas com os resultados das partidas"""
+    divergencias = VerificarClassificacoes()
+    for d in divergencias:
+        click.echo(f"Grupo {d['grupo_id']}, time {d['time_id']} - {d['campo']}: persistido {d['persistido']}, real {d['real']}")
+
+    if divergencias:
+        raise click.ClickException(f"{len(divergencias)} divergências encontradas")
+    click.echo("Classificações conferem com as partidas")
+
+
+@Importacao_CLI.command("importar")
+@click.argument("tipo", type=click.Choice(TIPOS_IMPORTACAO))
+@click.argument("arquivo", type=click.File("r", encoding="utf-8-sig"))
+@click.option("--formato", type=click.Choice(FORMATOS_IMPORTACAO), help="Padrão: pela extensão do arquivo")
+@click.option("--simular", is_flag=True, help="Só valida, sem gravar")
+def importar(tipo, arquivo, formato, simular):
+    """Importa jogadores, times ou partidas de um arquivo CSV ou JSON"""
+    formato = formato or ("csv" if arquivo.name.lower().endswith(".csv") else "json")
+    resultado, erro = ImportarRegistros(tipo, arquivo, formato, simular)
+    if erro:
+        raise click.ClickException(erro)
+
+    for e in resultado["erros"]:
+        click.echo(f"Linha {e['linha']}: {e['mensagem']}")
+    acao = "validados" if simular else "importados"
+    click.echo(f"{resultado['validas']} de {resultado['linhas']} registros {acao}")
+
+
+@Backup_CLI.command("criar")
+@click.option("--modo", type=click.Choice(MODES), default="completo", show_default=True,
+              help="incremental: desde o último backup; diferencial: desde o último completo")
+@click.option("--lote", default=CHUNK_SIZE, show_default=True, help="Linhas lidas por vez de cada tabela")
+@click.option("--paralelo", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Tabelas lidas ao mesmo tempo (só PostgreSQL, todas no mesmo snapshot)")
+def criar_backup(modo, lote, paralelo):
+    """Copia as tabelas (ou só os blocos alterados) para um novo arquivo em backups/"""
+    inicio = time.perf_counter()
+    if modo == "completo":
+        caminho, relatorio = create_sqlite_backup(lote, paralelo)
+    else:
+        caminho, relatorio = create_delta_backup(modo == "diferencial", lote, paralelo)
+    for item in relatorio:
+        click.echo(f"{item['tabela']}: {item['linhas']} linhas, {item['blocos']} blocos em {item['segundos']:.3f}s")
+    click.echo(f"Backup gravado em {caminho} em {time.perf_counter() - inicio:.3f}s")
+
+@Backup_CLI.command("restaurar")
+@click.argument("arquivo", type=click.Path(exists=True, dir_okay=False))
+@click.argument("destino", type=click.Path(dir_okay=False))
+def restaurar_backup(arquivo, destino):
+    """Monta um SQLite completo a partir de um backup e da sua cadeia de deltas"""
+    try:
+        cadeia = restore_backup(arquivo, destino)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    for caminho in cadeia:
+        click.echo(f"Aplicado {caminho}")
+    click.echo(f"Banco restaurado em {destino}")
@@ -1,16 +1,19 @@
 from flask import Blueprint, jsonify
 from Model.competicao import *
+from Controller.cache import cache_resposta, etag_versionado
 
 Competicao_Blueprint = Blueprint('competicao', __name__)
 
 @Competicao_Blueprint.route('/', methods=["GET"])
+@etag_versionado()
+@cache_resposta()
 def get_competicoes():
     competicoes = ListarCompeticoes()
     return jsonify([c.dici() for c in competicoes])
 
 @Competicao_Blueprint.route('/<int:id>', methods=["GET"])
 def get_competicao_por_nome(id):
-    competicao = ListarCompeticaoPorId(id)
+    competicao = ListarCompeticaoDetalhadaPorId(id)
     if not competicao:
         return jsonify({"erro": "Competição não encontrada"}), 404
     return jsonify(competicao.dici())
@@ -1,26 +1,68 @@
+import threading
+import time
 from functools import wraps
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-from Model.usuario import Usuario
-from flask import jsonify
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from Model.usuario import papeis_dos_usuarios, papel_do_usuario
+from flask import current_app
+
+class PapeisUsuarios:
+    # Retrato {id: papel} dos usuários, recarregado inteiro a cada
+    # PAPEIS_TTL_SEGUNDOS. Um usuário fora do retrato, ou com token emitido
+    # depois da última conferência dele, é relido sozinho. Serve só para
+    # recusar tokens de usuários removidos ou que mudaram de papel.
+    def __init__(self):
+        self._papeis = None
+        self._carregado_em = 0
+        self._conferido_em = {}
+        self._lock = threading.Lock()
+
+    def obter(self, usuario_id, emitido_em=0):
+        agora = time.time()
+        ttl = current_app.config.get("PAPEIS_TTL_SEGUNDOS", 60)
+        with self._lock:
+            if self._papeis is None or agora - self._carregado_em >= ttl:
+                self._papeis = papeis_dos_usuarios()
+                self._carregado_em = agora
+                self._conferido_em = {}
+            conferido_em = self._conferido_em.get(usuario_id, self._carregado_em)
+            if usuario_id in self._papeis and emitido_em < int(conferido_em):
+                return self._papeis[usuario_id]
+
+        # usuário removido fica no retrato como None, para não ser relido a cada requisição
+        papel = papel_do_usuario(usuario_id)
+        with self._lock:
+            if self._papeis is not None:
+                self._papeis[usuario_id] = papel
+                self._conferido_em[usuario_id] = agora
+        return papel
+
+    def limpar(self):
+        with self._lock:
+            self._papeis = None
+            self._conferido_em = {}
+
+papeis = PapeisUsuarios()
+
+def papel_do_token():
+    verify_jwt_in_request()
+    claims = get_jwt()
+    atual = papeis.obter(int(claims["sub"]), claims.get("iat", 0))
+    # tokens emitidos antes do claim existir usam o papel atual
+    papel = claims.get("papel", atual)
+    return papel if papel == atual else None
 
 def admin_required(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        user = Usuario.query.get(int(current_user_id))
-        if not user or user.papel != "admin":
-            return jsonify({"mensagem": "Acesso restrito a administradores"}), 403
+        if papel_do_token() != "admin":
+            return {"mensagem": "Acesso restrito a administradores"}, 403
         return func(*args, **kwargs)
     return wrapper
 
 def editor_ou_admin(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        user = Usuario.query.get(int(current_user_id))
-        if not user or user.papel not in ["admin", "editor"]:
-            return jsonify({"mensagem": "Acesso negado"}), 403
+        if papel_do_token() not in ["admin", "editor"]:
+            return {"mensagem": "Acesso negado"}, 403
         return func(*args, **kwargs)
-    return wrapper
\ No newline at end of file
+    return wrapper
@@ -0,0 +1,54 @@
+import json
+from functools import wraps
+from flask import request, current_app, stream_with_context
+from flask_restx import marshal
+from Controller.paginacao import ler_paginacao
+from Controller.campos import ler_campos, filtrar_modelo
+
+TAMANHO_BLOCO = 64 * 1024
+
+def pediu_fluxo():
+    return request.args.get("stream", "false").lower() in ("1", "true", "sim")
+
+def _array_json(itens, modelo):
+    bloco = ["["]
+    tamanho = 1
+    separador = ""
+    for item in itens:
+        if modelo is not None:
+            item = marshal(item, modelo)
+        parte = separador + json.dumps(item)
+        separador = ","
+        bloco.append(parte)
+        tamanho += len(parte)
+        if tamanho >= TAMANHO_BLOCO:
+            yield "".join(bloco)
+            bloco, tamanho = [], 0
+    bloco.append("]")
+    yield "".join(bloco)
+
+def resposta_em_fluxo(itens, modelo=None):
+    return current_app.response_class(
+        stream_with_context(_array_json(itens, modelo)),
+        mimetype="application/json"
+    )
+
+def em_fluxo(gerador, modelo=None, basicos=None, grupos=None):
+    # o fluxo devolve os mesmos itens da resposta comum: limit/after e, quando
+    # a rota aceita (basicos), fields/include. Só o X-Next-Cursor fica de fora,
+    # porque o último id não é conhecido antes de o corpo começar a ser enviado
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not pediu_fluxo():
+                return f(*args, **kwargs)
+            limite, apos = ler_paginacao()
+            opcoes = {"apos": apos, "limite": limite}
+            modelo_itens = modelo
+            if basicos is not None:
+                campos = ler_campos(basicos, grupos)
+                opcoes["campos"] = campos
+                modelo_itens = filtrar_modelo(modelo, campos)
+            return resposta_em_fluxo(gerador(**opcoes), modelo_itens)
+        return wrapper
+    return decorator
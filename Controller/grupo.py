@@ -1,9 +1,12 @@
 from flask import Blueprint, jsonify
 from Model.grupo import *
+from Controller.cache import cache_resposta, etag_versionado
 
 Grupo_Blueprint = Blueprint('grupo', __name__)
 
 @Grupo_Blueprint.route('/', methods=["GET"])
+@etag_versionado()
+@cache_resposta()
 def get_grupos():
     grupos = ListarGrupos()
     return jsonify([g.dici() for g in grupos])
@@ -1,12 +1,17 @@
 from flask import Blueprint, jsonify
 from Model.jogador import *
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
 
 Jogador_Blueprint = Blueprint('jogador', __name__)
 
 @Jogador_Blueprint.route('/', methods=["GET"])
+@etag_versionado()
+@cache_resposta()
 def get_jogadores():
-    jogadores = ListarJogadores()
-    return jsonify([j.dici() for j in jogadores])
+    limite, apos = ler_paginacao()
+    jogadores = ListarJogadoresComEstatisticas(limite, apos)
+    return jsonify(jogadores), 200, cabecalhos_paginacao(jogadores, limite)
 
 @Jogador_Blueprint.route('/buscar/<string:nome>', methods=["GET"])
 def get_jogador_por_nome(nome):
@@ -0,0 +1,17 @@
+from flask import request
+
+LIMITE_MAXIMO = 500
+
+def ler_paginacao():
+    limite = request.args.get("limit", type=int)
+    apos = request.args.get("after", type=int)
+    if limite is not None:
+        limite = max(1, min(limite, LIMITE_MAXIMO))
+    return limite, apos
+
+def cabecalhos_paginacao(itens, limite):
+    if limite is None or len(itens) < limite:
+        return {}
+    ultimo = itens[-1]
+    cursor = ultimo["id"] if isinstance(ultimo, dict) else ultimo.id
+    return {"X-Next-Cursor": str(cursor)}
@@ -1,12 +1,17 @@
 from flask import Blueprint, jsonify
 from Model.partida import *
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
 
 Partida_Blueprint = Blueprint("partida", __name__)
 
 @Partida_Blueprint.route("/", methods=["GET"])
+@etag_versionado()
+@cache_resposta()
 def listar_partidas():
-    partidas = ListarPartidas()
-    return jsonify([p.dici() for p in partidas])
+    limite, apos = ler_paginacao()
+    partidas = ListarPartidas(limite, apos)
+    return jsonify([p.dici() for p in partidas]), 200, cabecalhos_paginacao(partidas, limite)
 
 @Partida_Blueprint.route("/rodada/<int:rodada>", methods=["GET"])
 def get_partidas_por_rodada(rodada):
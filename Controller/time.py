@@ -1,12 +1,17 @@
 from flask import Blueprint, jsonify
 from Model.time import *
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
 
 Time_Blueprint = Blueprint('time', __name__)
 
 @Time_Blueprint.route('/', methods=["GET"])
+@etag_versionado()
+@cache_resposta()
 def get_times():
-    times = ListarTimes()
-    return jsonify([t.dici() for t in times])
+    limite, apos = ler_paginacao()
+    times = ListarTimes(limite, apos)
+    return jsonify([t.dici() for t in times]), 200, cabecalhos_paginacao(times, limite)
 
 @Time_Blueprint.route('/<int:id>', methods=["GET"])
 def get_time_por_id(id):
@@ -0,0 +1,100 @@
+from sqlalchemy.orm import selectinload, joinedload, selectin_polymorphic
+
+# Perfis de carregamento: cada um reúne as relações que o dici() do modelo
+# percorre, para que listagens e detalhes rodem um número fixo de consultas.
+# Quando a requisição pede só alguns campos, o perfil recebe o conjunto e
+# deixa de carregar as relações que não serão serializadas.
+# Os modelos são importados dentro das funções para evitar ciclos.
+
+def _partida():
+    from Model.partida import Partida
+    return [
+        joinedload(Partida.competicao),
+        joinedload(Partida.time_casa),
+        joinedload(Partida.time_fora)
+    ]
+
+def _time():
+    from Model.time import Time
+    return [
+        joinedload(Time.competicao),
+        joinedload(Time.grupo),
+        selectinload(Time.jogadores)
+    ]
+
+def _competicao():
+    from Model.competicao import Competicao
+    from Model.liga import Liga
+    from Model.torneio import Torneio
+    return [
+        selectin_polymorphic(Competicao, [Liga, Torneio]),
+        selectinload(Liga.partidas).options(*_partida()),
+        selectinload(Torneio.partidas).options(*_partida()),
+        selectinload(Competicao.times)
+    ]
+
+def _grupo(campos=None):
+    from Model.grupo import Grupo
+    opcoes = []
+    if campos is None or "times" in campos:
+        opcoes.append(selectinload(Grupo.times).options(*_time()))
+    elif "classificacao" in campos:
+        opcoes.append(selectinload(Grupo.times))
+    if campos is None or "classificacao" in campos:
+        opcoes.append(selectinload(Grupo.classificacao_persistida))
+    return opcoes
+
+def _jogador(campos=None):
+    from Model.jogador import Jogador
+    from Model.time import Time
+    if campos is not None and "times" not in campos:
+        return []
+    return [
+        selectinload(Jogador.times).joinedload(Time.competicao)
+    ]
+
+def _sumula():
+    from Model.sumula import Sumula, Gol, Cartao, CleanSheet
+    return [
+        joinedload(Sumula.mvp),
+        selectinload(Sumula.gols).options(joinedload(Gol.jogador), joinedload(Gol.assistencia)),
+        selectinload(Sumula.cartoes).joinedload(Cartao.jogador),
+        selectinload(Sumula.cleansheets).joinedload(CleanSheet.jogador)
+    ]
+
+def _selecao():
+    from Model.selecao import SelecaoRodada, JogadorSelecao
+    return [
+        joinedload(SelecaoRodada.competicao),
+        selectinload(SelecaoRodada.jogadores).joinedload(JogadorSelecao.jogador).options(*_jogador())
+    ]
+
+def _premiacao():
+    from Model.premiacao import Premiacao, TopJogadorPremiacao
+    return [
+        joinedload(Premiacao.mvp),
+        joinedload(Premiacao.artilheiro),
+        joinedload(Premiacao.luva_de_ouro),
+        joinedload(Premiacao.revelacao),
+        joinedload(Premiacao.campeao),
+        selectinload(Premiacao.tops).joinedload(TopJogadorPremiacao.jogador)
+    ]
+
+PERFIS = {
+    "partida": _partida,
+    "time": _time,
+    "competicao": _competicao,
+    "grupo": _grupo,
+    "jogador": _jogador,
+    "sumula": _sumula,
+    "selecao": _selecao,
+    "premiacao": _premiacao
+}
+
+def perfil(nome, campos=None):
+    if campos is None:
+        return PERFIS[nome]()
+    return PERFIS[nome](campos)
+
+def com_perfil(consulta, nome, campos=None):
+    return consulta.options(*perfil(nome, campos))
@@ -0,0 +1,293 @@
+from sqlalchemy import select, func, case
+from sqlalchemy.orm import aliased
+from config import db
+from Model.versao import registrar_alteracao
+from Model.resolvedor import resolver_ids
+
+NOMES_FASES = {
+    1: "Final",
+    2: "Semifinal",
+    4: "Quartas de final",
+    8: "Oitavas de final"
+}
+FASE_ENCERRADA = "encerrado"
+
+class ChaveConfronto(db.Model):
+    __tablename__ = "chave_confronto"
+
+    # fase 0 é a primeira rodada do mata-mata; o vencedor de (fase, posicao)
+    # ocupa (fase + 1, posicao // 2), como mandante quando a posição é par
+    id = db.Column(db.Integer, primary_key=True)
+    torneio_id = db.Column(db.Integer, db.ForeignKey("torneio.id"), nullable=False)
+    fase = db.Column(db.Integer, nullable=False)
+    posicao = db.Column(db.Integer, nullable=False)
+    time_casa_id = db.Column(db.Integer, db.ForeignKey("time.id"), nullable=True)
+    time_fora_id = db.Column(db.Integer, db.ForeignKey("time.id"), nullable=True)
+    vencedor_id = db.Column(db.Integer, db.ForeignKey("time.id"), nullable=True)
+    partida_id = db.Column(db.Integer, db.ForeignKey("partida.id"), nullable=True, unique=True)
+
+    partida = db.relationship("Partida")
+
+    __table_args__ = (
+        db.Index("ix_chave_confronto_slot", "torneio_id", "fase", "posicao", unique=True),
+    )
+
+def nome_da_fase(confrontos):
+    return NOMES_FASES.get(confrontos, f"Rodada de {confrontos * 2}")
+
+def ordem_de_sementes(tamanho):
+    # 1 x N, N/2 x N/2+1, ...: as melhores sementes só se cruzam no fim
+    ordem = [1]
+    while len(ordem) < tamanho:
+        total = len(ordem) * 2 + 1
+        ordem = [s for semente in ordem for s in (semente, total - semente)]
+    return ordem
+
+def _lista_de_ids(valores):
+    # o payload não é validado pelo modelo do restx; bool também é int
+    return isinstance(valores, list) and all(
+        isinstance(v, int) and not isinstance(v, bool) for v in valores
+    )
+
+def _sementes_informadas(times_ids):
+    from Model.time import Time
+
+    if len(times_ids) < 2:
+        return None, "São necessários pelo menos dois times"
+    if len(set(times_ids)) != len(times_ids):
+        return None, "Um time não pode aparecer duas vezes na chave"
+    _, faltando = resolver_ids(Time, times_ids)
+    if faltando:
+        return None, f"Time {min(faltando)} não encontrado"
+    return list(times_ids), None
+
+def _sementes_dos_grupos(grupos_ids, classificados):
+    from Model.grupo import Grupo
+    from Model.classificacao import ClassificacaoPersistida
+
+    if classificados < 1:
+        return None, "Classificados por grupo deve ser maior que zero"
+    _, faltando = resolver_ids(Grupo, grupos_ids)
+    if faltando:
+        return None, f"Grupo {min(faltando)} não encontrado"
+
+    # primeiros colocados na ordem dos grupos, depois os segundos etc.; com
+    # a ordem de sementes isso cruza o 1º de um grupo com o 2º de outro
+    tabelas = [ClassificacaoPersistida(grupo_id) for grupo_id in grupos_ids]
+    sementes = [
+        tabela[colocacao]["id"]
+        for colocacao in range(classificados)
+        for tabela in tabelas
+        if len(tabela) > colocacao
+    ]
+    return _sementes_informadas(sementes)
+
+def _vencedor(partida, confronto, desempate=None):
+    if partida.gols_casa is None or partida.gols_fora is None:
+        return None
+    if partida.gols_casa > partida.gols_fora:
+        return partida.time_casa_id
+    if partida.gols_fora > partida.gols_casa:
+        return partida.time_fora_id
+
+    # empate: vale o vencedor informado (pênaltis) ou o já registrado
+    times = (partida.time_casa_id, partida.time_fora_id)
+    for candidato in (desempate, confronto.vencedor_id):
+        if candidato in times:
+            return candidato
+    return None
+
+def _criar_partida(confronto, confrontos_na_fase):
+    from Model.partida import Partida
+
+    partida = Partida(
+        competicao_id=confronto.torneio_id,
+        rodada=nome_da_fase(confrontos_na_fase),
+        time_casa_id=confronto.time_casa_id,
+        time_fora_id=confronto.time_fora_id
+    )
+    db.session.add(partida)
+    confronto.partida = partida
+
+def _atualizar_fase_atual(torneio_id):
+    from Model.torneio import Torneio
+
+    pendente, ultima = db.session.execute(
+        select(
+            func.min(case((ChaveConfronto.vencedor_id.is_(None), ChaveConfronto.fase))),
+            func.max(ChaveConfronto.fase)
+        ).where(ChaveConfronto.torneio_id == torneio_id)
+    ).one()
+    if ultima is None:
+        return
+    torneio = db.session.get(Torneio, torneio_id)
+    torneio.fase_atual = FASE_ENCERRADA if pendente is None else nome_da_fase(1 << (ultima - pendente))
+
+def MontarChave(torneio_id, dados):
+    from Model.torneio import Torneio
+
+    torneio = db.session.get(Torneio, torneio_id)
+    if not torneio:
+        return None, "Torneio não encontrado"
+    existente = db.session.execute(
+        select(ChaveConfronto.id).where(ChaveConfronto.torneio_id == torneio_id).limit(1)
+    ).first()
+    if existente:
+        return None, "O torneio já possui chaveamento"
+
+    if dados.get("grupos_ids"):
+        if not _lista_de_ids(dados["grupos_ids"]):
+            return None, "grupos_ids deve ser uma lista de ids inteiros"
+        try:
+            classificados = int(dados.get("classificados_por_grupo", 2))
+        except (TypeError, ValueError):
+            return None, "Classificados por grupo deve ser um número inteiro"
+        sementes, erro = _sementes_dos_grupos(dados["grupos_ids"], classificados)
+    else:
+        if not _lista_de_ids(dados.get("times_ids") or []):
+            return None, "times_ids deve ser uma lista de ids inteiros"
+        sementes, erro = _sementes_informadas(dados.get("times_ids") or [])
+    if erro:
+        return None, erro
+
+    tamanho = 1 << (len(sementes) - 1).bit_length()
+    fases = tamanho.bit_length() - 1
+    slots = {
+        (fase, posicao): ChaveConfronto(torneio_id=torneio_id, fase=fase, posicao=posicao)
+        for fase in range(fases)
+        for posicao in range(tamanho >> (fase + 1))
+    }
+
+    ordem = [s if s <= len(sementes) else None for s in ordem_de_sementes(tamanho)]
+    for posicao in range(tamanho // 2):
+        confronto = slots[(0, posicao)]
+        casa, fora = ordem[2 * posicao], ordem[2 * posicao + 1]
+        confronto.time_casa_id = sementes[casa - 1] if casa else None
+        confronto.time_fora_id = sementes[fora - 1] if fora else None
+
+        # sem adversário (folga), o time avança direto
+        if confronto.time_fora_id is None:
+            confronto.vencedor_id = confronto.time_casa_id
+            proximo = slots[(1, posicao // 2)]
+            lado = "time_casa_id" if posicao % 2 == 0 else "time_fora_id"
+            setattr(proximo, lado, confronto.vencedor_id)
+
+    for (fase, _), confronto in slots.items():
+        if confronto.time_casa_id and confronto.time_fora_id:
+            _criar_partida(confronto, tamanho >> (fase + 1))
+
+    db.session.add_all(slots.values())
+    torneio.fase_atual = nome_da_fase(tamanho // 2)
+    registrar_alteracao(torneio_id)
+    db.session.commit()
+    return ListarChave(torneio_id)
+
+def avancar_chave(partida, desempate=None):
+    confronto = db.session.execute(
+        select(ChaveConfronto).where(ChaveConfronto.partida_id == partida.id)
+    ).scalar_one_or_none()
+    if confronto is None:
+        return None
+
+    vencedor = _vencedor(partida, confronto, desempate)
+    if vencedor == confronto.vencedor_id:
+        return None
+
+    proximo = db.session.execute(
+        select(ChaveConfronto).where(
+            ChaveConfronto.torneio_id == confronto.torneio_id,
+            ChaveConfronto.fase == confronto.fase + 1,
+            ChaveConfronto.posicao == confronto.posicao // 2
+        )
+    ).scalar_one_or_none()
+
+    if proximo is not None:
+        seguinte = proximo.partida
+        if seguinte is not None and (seguinte.gols_casa is not None or seguinte.gols_fora is not None):
+            return "A partida da fase seguinte já tem placar; corrija-a antes"
+
+        lado = "time_casa_id" if confronto.posicao % 2 == 0 else "time_fora_id"
+        setattr(proximo, lado, vencedor)
+        if seguinte is not None:
+            if vencedor is None:
+                proximo.partida = None
+                db.session.delete(seguinte)
+            else:
+                setattr(seguinte, lado, vencedor)
+        elif proximo.time_casa_id and proximo.time_fora_id:
+            confrontos_na_fase = db.session.execute(
+                select(func.count()).where(
+                    ChaveConfronto.torneio_id == proximo.torneio_id,
+                    ChaveConfronto.fase == proximo.fase
+                )
+            ).scalar()
+            _criar_partida(proximo, confrontos_na_fase)
+
+    confronto.vencedor_id = vencedor
+    db.session.flush()
+    _atualizar_fase_atual(confronto.torneio_id)
+    return None
+
+def partida_na_chave(partida_id):
+    return db.session.execute(
+        select(ChaveConfronto.id).where(ChaveConfronto.partida_id == partida_id)
+    ).first() is not None
+
+def ListarChave(torneio_id):
+    from Model.partida import Partida
+    from Model.time import Time
+    from Model.torneio import Torneio
+
+    casa = aliased(Time)
+    fora = aliased(Time)
+    torneio = Torneio.__table__
+    consulta = select(
+        ChaveConfronto.id,
+        ChaveConfronto.fase,
+        ChaveConfronto.posicao,
+        torneio.c.fase_atual,
+        ChaveConfronto.time_casa_id,
+        casa.nome.label("time_casa"),
+        ChaveConfronto.time_fora_id,
+        fora.nome.label("time_fora"),
+        ChaveConfronto.vencedor_id,
+        ChaveConfronto.partida_id,
+        Partida.gols_casa,
+        Partida.gols_fora,
+        Partida.link
+    ).join(
+        torneio, torneio.c.id == ChaveConfronto.torneio_id
+    ).outerjoin(
+        casa, casa.id == ChaveConfronto.time_casa_id
+    ).outerjoin(
+        fora, fora.id == ChaveConfronto.time_fora_id
+    ).outerjoin(
+        Partida, Partida.id == ChaveConfronto.partida_id
+    ).where(
+        ChaveConfronto.torneio_id == torneio_id
+    ).order_by(
+        ChaveConfronto.fase,
+        ChaveConfronto.posicao
+    )
+
+    linhas = db.session.execute(consulta).mappings().all()
+    if not linhas:
+        if not db.session.get(Torneio, torneio_id):
+            return None, "Torneio não encontrado"
+        return None, "O torneio ainda não possui chaveamento"
+
+    fases = {}
+    for linha in linhas:
+        confronto = dict(linha)
+        fase = confronto.pop("fase")
+        confronto.pop("fase_atual")
+        fases.setdefault(fase, []).append(confronto)
+
+    return {
+        "torneio_id": torneio_id,
+        "fase_atual": linhas[0]["fase_atual"],
+        "fases": [
+            {"fase": fase, "nome": nome_da_fase(len(confrontos)), "confrontos": confrontos}
+            for fase, confrontos in fases.items()
+        ]
+    }, None
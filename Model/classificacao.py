@@ -0,0 +1,401 @@
+from collections import Counter
+import numpy as np
+from sqlalchemy import select, insert, update, delete, func, and_, case, union_all
+from config import db
+
+CAMPOS_CLASSIFICACAO = (
+    "pontos",
+    "vitorias",
+    "empates",
+    "derrotas",
+    "gols_marcados",
+    "gols_sofridos",
+    "saldo_de_gols",
+    "jogos"
+)
+
+class ClassificacaoGrupo(db.Model):
+    __tablename__ = "classificacao_grupo"
+
+    grupo_id = db.Column(db.Integer, db.ForeignKey("grupo.id"), primary_key=True)
+    time_id = db.Column(db.Integer, db.ForeignKey("time.id"), primary_key=True)
+    pontos = db.Column(db.Integer, nullable=False, default=0)
+    vitorias = db.Column(db.Integer, nullable=False, default=0)
+    empates = db.Column(db.Integer, nullable=False, default=0)
+    derrotas = db.Column(db.Integer, nullable=False, default=0)
+    gols_marcados = db.Column(db.Integer, nullable=False, default=0)
+    gols_sofridos = db.Column(db.Integer, nullable=False, default=0)
+    saldo_de_gols = db.Column(db.Integer, nullable=False, default=0)
+    jogos = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ix_classificacao_grupo_ordem", "grupo_id", "pontos", "vitorias", "saldo_de_gols", "gols_marcados"),
+    )
+
+def resultado_da_partida(partida):
+    return (partida.grupo_id, partida.time_casa_id, partida.time_fora_id, partida.gols_casa, partida.gols_fora)
+
+def _contribuicoes(resultado):
+    grupo_id, casa_id, fora_id, gols_casa, gols_fora = resultado
+    if grupo_id is None or gols_casa is None or gols_fora is None:
+        return []
+
+    casa = Counter(jogos=1, gols_marcados=gols_casa, gols_sofridos=gols_fora, saldo_de_gols=gols_casa - gols_fora)
+    fora = Counter(jogos=1, gols_marcados=gols_fora, gols_sofridos=gols_casa, saldo_de_gols=gols_fora - gols_casa)
+
+    if gols_casa > gols_fora:
+        casa.update(pontos=3, vitorias=1)
+        fora.update(derrotas=1)
+    elif gols_fora > gols_casa:
+        fora.update(pontos=3, vitorias=1)
+        casa.update(derrotas=1)
+    else:
+        casa.update(pontos=1, empates=1)
+        fora.update(pontos=1, empates=1)
+
+    return [((grupo_id, casa_id), casa), ((grupo_id, fora_id), fora)]
+
+def agregar_resultados(removidos=(), adicionados=()):
+    deltas = {}
+    for resultado in removidos:
+        for chave, valores in _contribuicoes(resultado):
+            deltas.setdefault(chave, Counter()).subtract(valores)
+    for resultado in adicionados:
+        for chave, valores in _contribuicoes(resultado):
+            deltas.setdefault(chave, Counter()).update(valores)
+
+    deltas = {chave: {c: v for c, v in delta.items() if v} for chave, delta in deltas.items()}
+    return {chave: delta for chave, delta in deltas.items() if delta}
+
+def atualizar_classificacao(anterior=None, atual=None):
+    atualizar_classificacao_em_lote(
+        removidos=[anterior] if anterior else [],
+        adicionados=[atual] if atual else []
+    )
+
+def _garantir_linhas(chaves):
+    dialeto = db.session.get_bind().dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+        comando = insert_dialeto(ClassificacaoGrupo).on_conflict_do_nothing()
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+        comando = insert_dialeto(ClassificacaoGrupo).on_conflict_do_nothing()
+    else:
+        existentes = set(db.session.execute(
+            select(ClassificacaoGrupo.grupo_id, ClassificacaoGrupo.time_id).where(
+                ClassificacaoGrupo.grupo_id.in_({grupo_id for grupo_id, _ in chaves})
+            )
+        ).tuples())
+        chaves = [chave for chave in chaves if chave not in existentes]
+        comando = insert(ClassificacaoGrupo)
+
+    if chaves:
+        db.session.execute(comando, [{"grupo_id": g, "time_id": t} for g, t in chaves])
+
+def atualizar_classificacao_em_lote(removidos=(), adicionados=()):
+    deltas = agregar_resultados(removidos, adicionados)
+    if not deltas:
+        return
+
+    # dois primeiros resultados simultâneos no grupo criam a mesma linha;
+    # o segundo não pode falhar por chave duplicada
+    _garantir_linhas(list(deltas))
+
+    for (grupo_id, time_id), delta in deltas.items():
+        db.session.execute(
+            update(ClassificacaoGrupo)
+            .where(ClassificacaoGrupo.grupo_id == grupo_id, ClassificacaoGrupo.time_id == time_id)
+            .values({c: getattr(ClassificacaoGrupo, c) + v for c, v in delta.items()})
+        )
+
+def ClassificacaoPersistida(grupo_id):
+    from Model.time import Time
+
+    colunas = {
+        c: func.coalesce(getattr(ClassificacaoGrupo, c), 0).label(c)
+        for c in CAMPOS_CLASSIFICACAO
+    }
+    consulta = select(
+        Time.id,
+        Time.nome,
+        *colunas.values()
+    ).outerjoin(
+        ClassificacaoGrupo,
+        and_(ClassificacaoGrupo.time_id == Time.id, ClassificacaoGrupo.grupo_id == grupo_id)
+    ).where(
+        Time.grupo_id == grupo_id
+    ).order_by(
+        colunas["pontos"].desc(),
+        colunas["vitorias"].desc(),
+        colunas["saldo_de_gols"].desc(),
+        colunas["gols_marcados"].desc(),
+        Time.id
+    )
+
+    return [
+        {
+            "id": linha.id,
+            "nome": linha.nome,
+            "pontos": linha.pontos,
+            "vitorias": linha.vitorias,
+            "empates": linha.empates,
+            "derrotas": linha.derrotas,
+            "gols_marcados": linha.gols_marcados,
+            "gols_sofridos": linha.gols_sofridos,
+            "saldo_de_gols": linha.saldo_de_gols,
+            "jogos": linha.jogos
+        }
+        for linha in db.session.execute(consulta)
+    ]
+
+def ClassificacaoCarregada(times, linhas):
+    por_time = {linha.time_id: linha for linha in linhas}
+    tabela = []
+    for time in times:
+        linha = por_time.get(time.id)
+        item = {"id": time.id, "nome": time.nome}
+        for campo in CAMPOS_CLASSIFICACAO:
+            item[campo] = getattr(linha, campo) if linha else 0
+        tabela.append(item)
+
+    return sorted(
+        tabela,
+        key=lambda x: (-x["pontos"], -x["vitorias"], -x["saldo_de_gols"], -x["gols_marcados"], x["id"])
+    )
+
+def ClassificacaoSQL(grupo_id):
+    from Model.partida import Partida
+    from Model.time import Time
+
+    finalizada = (
+        Partida.grupo_id == grupo_id,
+        Partida.gols_casa.isnot(None),
+        Partida.gols_fora.isnot(None)
+    )
+    lados = union_all(
+        select(
+            Partida.time_casa_id.label("time_id"),
+            Partida.gols_casa.label("marcados"),
+            Partida.gols_fora.label("sofridos")
+        ).where(*finalizada),
+        select(
+            Partida.time_fora_id.label("time_id"),
+            Partida.gols_fora.label("marcados"),
+            Partida.gols_casa.label("sofridos")
+        ).where(*finalizada)
+    ).subquery("lados")
+
+    vitorias = func.sum(case((lados.c.marcados > lados.c.sofridos, 1), else_=0))
+    empates = func.sum(case((lados.c.marcados == lados.c.sofridos, 1), else_=0))
+    agregado = select(
+        lados.c.time_id,
+        (vitorias * 3 + empates).label("pontos"),
+        vitorias.label("vitorias"),
+        empates.label("empates"),
+        func.sum(case((lados.c.marcados < lados.c.sofridos, 1), else_=0)).label("derrotas"),
+        func.sum(lados.c.marcados).label("gols_marcados"),
+        func.sum(lados.c.sofridos).label("gols_sofridos"),
+        func.sum(lados.c.marcados - lados.c.sofridos).label("saldo_de_gols"),
+        func.count().label("jogos")
+    ).group_by(lados.c.time_id).subquery("agregado")
+
+    colunas = {
+        c: func.coalesce(getattr(agregado.c, c), 0).label(c)
+        for c in CAMPOS_CLASSIFICACAO
+    }
+    consulta = select(
+        Time.id,
+        Time.nome,
+        *colunas.values()
+    ).outerjoin(
+        agregado, agregado.c.time_id == Time.id
+    ).where(
+        Time.grupo_id == grupo_id
+    ).order_by(
+        colunas["pontos"].desc(),
+        colunas["vitorias"].desc(),
+        colunas["saldo_de_gols"].desc(),
+        colunas["gols_marcados"].desc(),
+        Time.id
+    )
+
+    return [
+        {
+            "id": linha.id,
+            "nome": linha.nome,
+            **{c: int(getattr(linha, c)) for c in CAMPOS_CLASSIFICACAO}
+        }
+        for linha in db.session.execute(consulta)
+    ]
+
+def ClassificacaoLiga(liga_id):
+    from Model.liga import Liga
+    from Model.grupo import Grupo
+    from Model.partida import Partida
+    from Model.time import Time
+
+    liga = db.session.get(Liga, liga_id)
+    if not liga:
+        return None, "Liga não encontrada"
+
+    grupos = db.session.execute(
+        select(Grupo.id, Grupo.nome).where(Grupo.liga_id == liga_id).order_by(Grupo.id)
+    ).all()
+    por_grupos = liga.usar_grupos and bool(grupos)
+
+    if por_grupos:
+        grupo_ids = [g.id for g in grupos]
+        times = db.session.execute(
+            select(Time.id, Time.nome, Time.grupo_id).where(Time.grupo_id.in_(grupo_ids)).order_by(Time.id)
+        ).all()
+        filtro_partidas = Partida.grupo_id.in_(grupo_ids)
+    else:
+        grupos = [(None, None)]
+        times = db.session.execute(
+            select(Time.id, Time.nome, Time.grupo_id).where(Time.competicao_id == liga_id).order_by(Time.id)
+        ).all()
+        filtro_partidas = Partida.competicao_id == liga_id
+
+    posicao_grupo = {grupo_id: i for i, (grupo_id, _) in enumerate(grupos)}
+    time_ids = np.array([t.id for t in times], dtype=np.int64)
+    time_grupos = np.array(
+        [posicao_grupo[t.grupo_id] if por_grupos else 0 for t in times],
+        dtype=np.int64
+    )
+
+    partidas = np.array([
+        (posicao_grupo[grupo_id] if por_grupos else 0, casa_id, fora_id, gols_casa, gols_fora)
+        for grupo_id, casa_id, fora_id, gols_casa, gols_fora in db.session.execute(
+            select(
+                Partida.grupo_id,
+                Partida.time_casa_id,
+                Partida.time_fora_id,
+                Partida.gols_casa,
+                Partida.gols_fora
+            ).where(
+                filtro_partidas,
+                Partida.gols_casa.isnot(None),
+                Partida.gols_fora.isnot(None)
+            )
+        )
+    ], dtype=np.int64).reshape(-1, 5)
+
+    casa = np.searchsorted(time_ids, partidas[:, 1])
+    fora = np.searchsorted(time_ids, partidas[:, 2])
+    validas = (
+        (casa < len(time_ids)) & (fora < len(time_ids))
+    )
+    validas[validas] &= (
+        (time_ids[casa[validas]] == partidas[validas, 1]) &
+        (time_ids[fora[validas]] == partidas[validas, 2])
+    )
+    casa, fora, partidas = casa[validas], fora[validas], partidas[validas]
+    gols_casa, gols_fora = partidas[:, 3], partidas[:, 4]
+
+    # matriz (grupo da partida, time) achatada: como nas outras engines, o
+    # resultado conta no grupo em que a partida foi registrada, e cada time
+    # aparece com a linha do grupo em que está hoje
+    n = len(time_ids)
+    casa = partidas[:, 0] * n + casa
+    fora = partidas[:, 0] * n + fora
+    celulas = len(grupos) * n
+    jogos, vitorias, empates, derrotas = (np.zeros(celulas, dtype=np.int64) for _ in range(4))
+    gols_marcados, gols_sofridos = np.zeros(celulas, dtype=np.int64), np.zeros(celulas, dtype=np.int64)
+
+    np.add.at(jogos, casa, 1)
+    np.add.at(jogos, fora, 1)
+    np.add.at(gols_marcados, casa, gols_casa)
+    np.add.at(gols_marcados, fora, gols_fora)
+    np.add.at(gols_sofridos, casa, gols_fora)
+    np.add.at(gols_sofridos, fora, gols_casa)
+    np.add.at(vitorias, casa, gols_casa > gols_fora)
+    np.add.at(vitorias, fora, gols_fora > gols_casa)
+    np.add.at(derrotas, casa, gols_casa < gols_fora)
+    np.add.at(derrotas, fora, gols_fora < gols_casa)
+    np.add.at(empates, casa, gols_casa == gols_fora)
+    np.add.at(empates, fora, gols_casa == gols_fora)
+
+    linhas = time_grupos * n + np.arange(n)
+    jogos, vitorias, empates, derrotas = jogos[linhas], vitorias[linhas], empates[linhas], derrotas[linhas]
+    gols_marcados, gols_sofridos = gols_marcados[linhas], gols_sofridos[linhas]
+
+    pontos = vitorias * 3 + empates
+    saldo_de_gols = gols_marcados - gols_sofridos
+
+    ordem = np.lexsort((time_ids, -gols_marcados, -saldo_de_gols, -vitorias, -pontos, time_grupos))
+
+    classificacoes = [[] for _ in grupos]
+    for i in ordem.tolist():
+        classificacoes[time_grupos[i]].append({
+            "id": times[i].id,
+            "nome": times[i].nome,
+            "pontos": int(pontos[i]),
+            "vitorias": int(vitorias[i]),
+            "empates": int(empates[i]),
+            "derrotas": int(derrotas[i]),
+            "gols_marcados": int(gols_marcados[i]),
+            "gols_sofridos": int(gols_sofridos[i]),
+            "saldo_de_gols": int(saldo_de_gols[i]),
+            "jogos": int(jogos[i])
+        })
+
+    return {
+        "id": liga.id,
+        "nome": liga.nome,
+        "grupos": [
+            {"id": grupo_id, "nome": nome, "classificacao": classificacao}
+            for (grupo_id, nome), classificacao in zip(grupos, classificacoes)
+        ]
+    }, None
+
+def _resultados_finalizados():
+    from Model.partida import Partida
+
+    return db.session.execute(
+        select(
+            Partida.grupo_id,
+            Partida.time_casa_id,
+            Partida.time_fora_id,
+            Partida.gols_casa,
+            Partida.gols_fora
+        ).where(
+            Partida.grupo_id.isnot(None),
+            Partida.gols_casa.isnot(None),
+            Partida.gols_fora.isnot(None)
+        )
+    ).tuples()
+
+def ReconstruirClassificacoes():
+    deltas = agregar_resultados(adicionados=_resultados_finalizados())
+
+    db.session.execute(delete(ClassificacaoGrupo))
+    if deltas:
+        db.session.execute(insert(ClassificacaoGrupo), [
+            {"grupo_id": g, "time_id": t, **dict.fromkeys(CAMPOS_CLASSIFICACAO, 0), **delta}
+            for (g, t), delta in deltas.items()
+        ])
+    db.session.commit()
+    return len({g for g, _ in deltas})
+
+def VerificarClassificacoes():
+    reais = agregar_resultados(adicionados=_resultados_finalizados())
+    persistidas = {
+        (c.grupo_id, c.time_id): {campo: getattr(c, campo) for campo in CAMPOS_CLASSIFICACAO if getattr(c, campo)}
+        for c in db.session.execute(select(ClassificacaoGrupo)).scalars()
+    }
+
+    divergencias = []
+    for chave in sorted(reais.keys() | persistidas.keys()):
+        real = reais.get(chave, {})
+        persistida = persistidas.get(chave, {})
+        for campo in CAMPOS_CLASSIFICACAO:
+            if real.get(campo, 0) != persistida.get(campo, 0):
+                divergencias.append({
+                    "grupo_id": chave[0],
+                    "time_id": chave[1],
+                    "campo": campo,
+                    "persistido": persistida.get(campo, 0),
+                    "real": real.get(campo, 0)
+                })
+    return divergencias
@@ -1,5 +1,7 @@
 from flask import request
 from config import db
+from Model.versao import registrar_alteracao
+from Model.carregamento import com_perfil, perfil
 
 class Competicao(db.Model):
     __tablename__ = "competicao"
@@ -38,31 +40,39 @@ def CriarCompeticao(dados):
         competicao = Torneio(nome=dados['nome'])
     
     db.session.add(competicao)
+    db.session.flush()
+    registrar_alteracao(competicao.id)
     db.session.commit()
     return competicao, None
 
 def ListarCompeticoes():
-    return Competicao.query.all()
+    return com_perfil(Competicao.query, "competicao").all()
 
 def ListarCompeticaoPorId(id):
-    return Competicao.query.get(id)
+    return db.session.get(Competicao, id)
+
+def ListarCompeticaoDetalhadaPorId(id):
+    # com partidas e times, para o dici() completo
+    return db.session.get(Competicao, id, options=perfil("competicao"))
 
 def AtualizarCompeticao(id, dados):
-    competicao = Competicao.query.get(id)
+    competicao = db.session.get(Competicao, id)
     if not competicao:
         return None, "Competição não encontrada"
     
     if 'nome' in dados:
         competicao.nome = dados['nome']
     
+    registrar_alteracao(competicao.id)
     db.session.commit()
     return competicao, None
 
 def DeletarCompeticao(id):
-    competicao = Competicao.query.get(id)
+    competicao = db.session.get(Competicao, id)
     if not competicao:
         return False, "Competição não encontrada"
     
     db.session.delete(competicao)
+    registrar_alteracao(competicao.id)
     db.session.commit()
     return True, None
\ No newline at end of file
@@ -0,0 +1,13 @@
+from config import db
+
+class EstatisticaJogador(db.Model):
+    __tablename__ = "estatistica_jogador"
+
+    jogador_id = db.Column(db.Integer, db.ForeignKey("jogador.id"), primary_key=True)
+    gols = db.Column(db.Integer, nullable=False, default=0)
+    assistencias = db.Column(db.Integer, nullable=False, default=0)
+    cleansheets = db.Column(db.Integer, nullable=False, default=0)
+    gols_contra = db.Column(db.Integer, nullable=False, default=0)
+    cartoes_amarelos = db.Column(db.Integer, nullable=False, default=0)
+    cartoes_vermelhos = db.Column(db.Integer, nullable=False, default=0)
+    mvps = db.Column(db.Integer, nullable=False, default=0)
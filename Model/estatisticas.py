@@ -0,0 +1,351 @@
+from collections import Counter
+from sqlalchemy import select, union_all, literal, func, or_, insert, update, delete
+from config import db
+from Model.competicao import Competicao
+from Model.estatistica_jogador import EstatisticaJogador
+from Model.jogador import Jogador
+from Model.partida import Partida
+from Model.sumula import Sumula, Gol, Cartao, CleanSheet
+from Model.selecao import JogadorSelecao
+from Model.premiacao import Premiacao, TopJogadorPremiacao
+
+CATEGORIAS_EVENTOS = (
+    "gols",
+    "assistencias",
+    "cleansheets",
+    "gols_contra",
+    "cartoes_amarelos",
+    "cartoes_vermelhos",
+    "mvps"
+)
+
+CATEGORIAS_RANKING = ("gols", "assistencias", "cleansheets", "mvps")
+
+CAMPOS_ESTATISTICAS = (
+    "gols",
+    "assistencias",
+    "cleansheets",
+    "gols_contra",
+    "cartoes_amarelos",
+    "cartoes_vermelhos",
+    "selecao",
+    "mvps",
+    "premiacoes"
+)
+
+TIPOS_PREMIACAO = (
+    ("mvp_id", "MVP"),
+    ("artilheiro_id", "Artilheiro"),
+    ("luva_de_ouro_id", "Luva de Ouro"),
+    ("revelacao_id", "Revelação")
+)
+
+def _evento(coluna_jogador, categoria, coluna_sumula, *condicoes):
+    return select(
+        coluna_jogador.label("jogador_id"),
+        literal(categoria).label("categoria"),
+        coluna_sumula.label("sumula_id")
+    ).where(*condicoes)
+
+def _eventos():
+    return union_all(
+        _evento(Gol.jogador_id, "gols", Gol.sumula_id, Gol.contra == False),
+        _evento(Gol.assistencia_id, "assistencias", Gol.sumula_id, Gol.assistencia_id.isnot(None)),
+        _evento(CleanSheet.jogador_id, "cleansheets", CleanSheet.sumula_id),
+        _evento(Gol.jogador_id, "gols_contra", Gol.sumula_id, Gol.contra == True),
+        _evento(Cartao.jogador_id, "cartoes_amarelos", Cartao.sumula_id, Cartao.tipo == 'amarelo'),
+        _evento(Cartao.jogador_id, "cartoes_vermelhos", Cartao.sumula_id, Cartao.tipo == 'vermelho'),
+        _evento(Sumula.mvp_id, "mvps", Sumula.id, Sumula.mvp_id.isnot(None))
+    ).subquery("eventos")
+
+def _sumulas_da_competicao(competicao_id):
+    return select(Sumula.id).join(
+        Partida, Sumula.partida_id == Partida.id
+    ).where(Partida.competicao_id == competicao_id)
+
+def contar_eventos(jogador_ids=None, competicao_id=None):
+    eventos = _eventos()
+    consulta = select(
+        eventos.c.jogador_id,
+        eventos.c.categoria,
+        func.count()
+    ).group_by(eventos.c.jogador_id, eventos.c.categoria)
+
+    if competicao_id is not None:
+        consulta = consulta.where(eventos.c.sumula_id.in_(_sumulas_da_competicao(competicao_id)))
+
+    if jogador_ids is not None:
+        consulta = consulta.where(eventos.c.jogador_id.in_(jogador_ids))
+        contagens = {jogador_id: dict.fromkeys(CATEGORIAS_EVENTOS, 0) for jogador_id in jogador_ids}
+    else:
+        contagens = {}
+
+    for jogador_id, categoria, total in db.session.execute(consulta):
+        contagens.setdefault(jogador_id, dict.fromkeys(CATEGORIAS_EVENTOS, 0))[categoria] = total
+    return contagens
+
+def ler_estatisticas(jogador_ids):
+    consulta = select(EstatisticaJogador).where(EstatisticaJogador.jogador_id.in_(jogador_ids))
+
+    contagens = {jogador_id: dict.fromkeys(CATEGORIAS_EVENTOS, 0) for jogador_id in jogador_ids}
+    for estatistica in db.session.execute(consulta).scalars():
+        contagens[estatistica.jogador_id] = {c: getattr(estatistica, c) for c in CATEGORIAS_EVENTOS}
+    return contagens
+
+def eventos_da_sumula(sumula):
+    eventos = []
+    for g in sumula.gols:
+        if g.contra is not None:
+            eventos.append((g.jogador_id, "gols_contra" if g.contra else "gols"))
+        if g.assistencia_id:
+            eventos.append((g.assistencia_id, "assistencias"))
+    for cs in sumula.cleansheets:
+        eventos.append((cs.jogador_id, "cleansheets"))
+    for c in sumula.cartoes:
+        if c.tipo == 'amarelo':
+            eventos.append((c.jogador_id, "cartoes_amarelos"))
+        elif c.tipo == 'vermelho':
+            eventos.append((c.jogador_id, "cartoes_vermelhos"))
+    if sumula.mvp_id:
+        eventos.append((sumula.mvp_id, "mvps"))
+    return eventos
+
+def _garantir_linhas(jogador_ids):
+    dialeto = db.session.get_bind().dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+        comando = insert_dialeto(EstatisticaJogador).on_conflict_do_nothing()
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+        comando = insert_dialeto(EstatisticaJogador).on_conflict_do_nothing()
+    else:
+        existentes = set(db.session.execute(
+            select(EstatisticaJogador.jogador_id).where(EstatisticaJogador.jogador_id.in_(jogador_ids))
+        ).scalars())
+        jogador_ids = [j for j in jogador_ids if j not in existentes]
+        comando = insert(EstatisticaJogador)
+
+    if jogador_ids:
+        db.session.execute(comando, [{"jogador_id": j} for j in jogador_ids])
+
+def atualizar_estatisticas(removidos=(), adicionados=()):
+    deltas = {}
+    for jogador_id, categoria in removidos:
+        deltas.setdefault(jogador_id, Counter())[categoria] -= 1
+    for jogador_id, categoria in adicionados:
+        deltas.setdefault(jogador_id, Counter())[categoria] += 1
+
+    deltas = {
+        jogador_id: {c: v for c, v in delta.items() if v}
+        for jogador_id, delta in deltas.items()
+    }
+    deltas = {jogador_id: delta for jogador_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    # duas súmulas simultâneas podem criar a primeira linha do mesmo jogador;
+    # a segunda não pode falhar por chave duplicada
+    _garantir_linhas(list(deltas))
+
+    for jogador_id, delta in deltas.items():
+        db.session.execute(
+            update(EstatisticaJogador)
+            .where(EstatisticaJogador.jogador_id == jogador_id)
+            .values({c: getattr(EstatisticaJogador, c) + v for c, v in delta.items()})
+        )
+
+def ReconstruirEstatisticas():
+    contagens = contar_eventos()
+
+    db.session.execute(delete(EstatisticaJogador))
+    if contagens:
+        db.session.execute(insert(EstatisticaJogador), [
+            {"jogador_id": jogador_id, **contagem} for jogador_id, contagem in contagens.items()
+        ])
+    db.session.commit()
+    return len(contagens)
+
+def VerificarEstatisticas():
+    reais = contar_eventos()
+    persistidas = {
+        e.jogador_id: {c: getattr(e, c) for c in CATEGORIAS_EVENTOS}
+        for e in db.session.execute(select(EstatisticaJogador)).scalars()
+    }
+
+    divergencias = []
+    for jogador_id in sorted(reais.keys() | persistidas.keys()):
+        real = reais.get(jogador_id, dict.fromkeys(CATEGORIAS_EVENTOS, 0))
+        persistida = persistidas.get(jogador_id, dict.fromkeys(CATEGORIAS_EVENTOS, 0))
+        for categoria in CATEGORIAS_EVENTOS:
+            if real[categoria] != persistida[categoria]:
+                divergencias.append({
+                    "jogador_id": jogador_id,
+                    "categoria": categoria,
+                    "persistido": persistida[categoria],
+                    "real": real[categoria]
+                })
+    return divergencias
+
+def contar_selecoes(jogador_ids):
+    consulta = select(
+        JogadorSelecao.jogador_id,
+        func.count()
+    ).where(
+        JogadorSelecao.jogador_id.in_(jogador_ids)
+    ).group_by(JogadorSelecao.jogador_id)
+
+    return dict(db.session.execute(consulta).all())
+
+def listar_premiacoes(jogador_ids):
+    premiacoes = {jogador_id: [] for jogador_id in jogador_ids}
+
+    consulta = select(
+        Premiacao.mvp_id,
+        Premiacao.artilheiro_id,
+        Premiacao.luva_de_ouro_id,
+        Premiacao.revelacao_id,
+        Competicao.nome
+    ).join(
+        Competicao, Premiacao.competicao_id == Competicao.id
+    ).where(
+        or_(*(getattr(Premiacao, campo).in_(jogador_ids) for campo, _ in TIPOS_PREMIACAO))
+    ).order_by(Premiacao.id)
+
+    for linha in db.session.execute(consulta):
+        for campo, tipo in TIPOS_PREMIACAO:
+            jogador_id = getattr(linha, campo)
+            if jogador_id in premiacoes:
+                premiacoes[jogador_id].append({"tipo": tipo, "competicao": linha.nome})
+
+    consulta = select(
+        TopJogadorPremiacao.jogador_id,
+        TopJogadorPremiacao.posicao,
+        TopJogadorPremiacao.categoria,
+        Competicao.nome
+    ).join(
+        Premiacao, TopJogadorPremiacao.premiacao_id == Premiacao.id
+    ).join(
+        Competicao, Premiacao.competicao_id == Competicao.id
+    ).where(
+        TopJogadorPremiacao.jogador_id.in_(jogador_ids)
+    ).order_by(TopJogadorPremiacao.id)
+
+    for jogador_id, posicao, categoria, competicao in db.session.execute(consulta):
+        premiacoes[jogador_id].append({
+            "tipo": f"Top {posicao} - {categoria}",
+            "competicao": competicao
+        })
+
+    return premiacoes
+
+def contar_estatisticas_em_lote(jogadores, campos=None):
+    jogador_ids = [j.id for j in jogadores]
+    if not jogador_ids:
+        return {}
+
+    pedidos = [c for c in CAMPOS_ESTATISTICAS if campos is None or c in campos]
+    eventos = ler_estatisticas(jogador_ids) if any(c in CATEGORIAS_EVENTOS for c in pedidos) else {}
+    selecoes = contar_selecoes(jogador_ids) if "selecao" in pedidos else {}
+    premiacoes = listar_premiacoes(jogador_ids) if "premiacoes" in pedidos else {}
+
+    def valor(jogador_id, campo):
+        if campo == "selecao":
+            return selecoes.get(jogador_id, 0)
+        if campo == "premiacoes":
+            return premiacoes[jogador_id]
+        return eventos[jogador_id][campo]
+
+    return {
+        jogador_id: {c: valor(jogador_id, c) for c in pedidos}
+        for jogador_id in jogador_ids
+    }
+
+def _linha_ranking(linha, estatisticas, colocacao):
+    resultado = {
+        "id": linha.id,
+        "nome": linha.nome,
+        "posicao": linha.posicao,
+        "nacionalidade": linha.nacionalidade,
+        **{c: estatisticas[c] for c in CATEGORIAS_RANKING}
+    }
+    if colocacao:
+        resultado["colocacao"] = linha.colocacao
+    return resultado
+
+def RankingGeral(limite, colocacao=False):
+    ranking = {}
+    for categoria in CATEGORIAS_RANKING:
+        coluna = getattr(EstatisticaJogador, categoria)
+        consulta = select(
+            Jogador.id,
+            Jogador.nome,
+            Jogador.posicao,
+            Jogador.nacionalidade,
+            *(getattr(EstatisticaJogador, c) for c in CATEGORIAS_RANKING),
+            func.rank().over(order_by=coluna.desc()).label("colocacao")
+        ).join(
+            EstatisticaJogador, EstatisticaJogador.jogador_id == Jogador.id
+        ).where(
+            coluna > 0
+        ).order_by(coluna.desc(), Jogador.id).limit(limite)
+
+        ranking[categoria] = [
+            _linha_ranking(linha, linha._mapping, colocacao)
+            for linha in db.session.execute(consulta)
+        ]
+    return ranking
+
+def RankingPorCompeticao(competicao_id, limite, colocacao=False):
+    eventos = _eventos()
+    sumulas = _sumulas_da_competicao(competicao_id)
+
+    linhas_por_categoria = {}
+    for categoria in CATEGORIAS_RANKING:
+        total = func.count().label("total")
+        contagem = select(
+            eventos.c.jogador_id,
+            total
+        ).where(
+            eventos.c.categoria == categoria,
+            eventos.c.sumula_id.in_(sumulas)
+        ).group_by(eventos.c.jogador_id).subquery()
+
+        consulta = select(
+            Jogador.id,
+            Jogador.nome,
+            Jogador.posicao,
+            Jogador.nacionalidade,
+            func.rank().over(order_by=contagem.c.total.desc()).label("colocacao")
+        ).join(
+            contagem, contagem.c.jogador_id == Jogador.id
+        ).order_by(contagem.c.total.desc(), Jogador.id).limit(limite)
+
+        linhas_por_categoria[categoria] = db.session.execute(consulta).all()
+
+    jogador_ids = {linha.id for linhas in linhas_por_categoria.values() for linha in linhas}
+    estatisticas = contar_eventos(jogador_ids, competicao_id) if jogador_ids else {}
+
+    return {
+        categoria: [_linha_ranking(linha, estatisticas[linha.id], colocacao) for linha in linhas]
+        for categoria, linhas in linhas_por_categoria.items()
+    }
+
+def ListarEstatisticasPorCompeticao(competicao_id, incluir_sem_eventos=True):
+    contagens = contar_eventos(competicao_id=competicao_id)
+
+    consulta = select(Jogador.id, Jogador.nome, Jogador.posicao, Jogador.nacionalidade)
+    if not incluir_sem_eventos:
+        if not contagens:
+            return []
+        consulta = consulta.where(Jogador.id.in_(contagens))
+
+    return [
+        {
+            "id": j.id,
+            "nome": j.nome,
+            "posicao": j.posicao,
+            "nacionalidade": j.nacionalidade,
+            **contagens.get(j.id, dict.fromkeys(CATEGORIAS_EVENTOS, 0))
+        }
+        for j in db.session.execute(consulta)
+    ]
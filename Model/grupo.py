@@ -1,5 +1,11 @@
-from flask import request
+from flask import request, current_app
+from sqlalchemy import inspect
 from config import db
+from Model.versao import registrar_alteracao
+from Model.carregamento import com_perfil, perfil
+from Model.classificacao import ClassificacaoGrupo, ClassificacaoPersistida, ClassificacaoSQL, ClassificacaoCarregada
+
+CAMPOS_GRUPO = ("id", "nome", "liga_id")
 
 class Grupo(db.Model):
     __tablename__ = "grupo"
@@ -11,6 +17,7 @@ class Grupo(db.Model):
     times = db.relationship("Time", back_populates="grupo", lazy=True)
     liga = db.relationship("Liga", back_populates="grupos")
     partidas = db.relationship("Partida", back_populates="grupo")
+    classificacao_persistida = db.relationship("ClassificacaoGrupo", cascade="all, delete-orphan")
     
     def __init__(self, nome, liga_id):
         self.nome = nome
@@ -30,7 +37,18 @@ class Grupo(db.Model):
             "classificacao": list(classificacao.values())
         }
     
-    def calcular_classificacao(self):
+    def calcular_classificacao(self, modo=None):
+        modo = modo or current_app.config.get("CLASSIFICACAO_MODO", "persistida")
+        if modo == "sql":
+            return ClassificacaoSQL(self.id)
+        if modo == "partidas":
+            return self.calcular_classificacao_partidas()
+        nao_carregadas = inspect(self).unloaded
+        if "times" not in nao_carregadas and "classificacao_persistida" not in nao_carregadas:
+            return ClassificacaoCarregada(self.times, self.classificacao_persistida)
+        return ClassificacaoPersistida(self.id)
+
+    def calcular_classificacao_partidas(self):
         classificacao = {
             time.id: {
                 "id": time.id,
@@ -95,20 +113,25 @@ class Grupo(db.Model):
             key=lambda x: (-x["pontos"], -x["vitorias"], -x["saldo_de_gols"], -x["gols_marcados"])
         )
 
-    def dici(self):
-        return {
+    def dici(self, campos=None):
+        dados = {
             "id": self.id,
             "nome": self.nome,
-            "liga_id": self.liga_id,
-            "times": [t.dici() for t in self.times],
-            "classificacao": self.calcular_classificacao()
+            "liga_id": self.liga_id
         }
+        if campos is not None:
+            dados = {k: v for k, v in dados.items() if k in campos}
+        if campos is None or "times" in campos:
+            dados["times"] = [t.dici() for t in self.times]
+        if campos is None or "classificacao" in campos:
+            dados["classificacao"] = self.calcular_classificacao()
+        return dados
 
-def ListarGrupos():
-    return Grupo.query.all()
+def ListarGrupos(campos=None):
+    return com_perfil(Grupo.query, "grupo", campos).all()
 
-def ListarGrupoPorId(id_grupo):
-    return Grupo.query.get(id_grupo)
+def ListarGrupoPorId(id_grupo, campos=None):
+    return db.session.get(Grupo, id_grupo, options=perfil("grupo", campos))
 
 def CriarGrupo(dados):
     if not dados.get('nome'):
@@ -123,13 +146,16 @@ def CriarGrupo(dados):
     )
         
     db.session.add(novo_grupo)
+    registrar_alteracao(novo_grupo.liga_id)
     db.session.commit()
     return novo_grupo, None
 
 def AtualizarGrupo(id_grupo, dados):
-    grupo = Grupo.query.get(id_grupo)
+    grupo = db.session.get(Grupo, id_grupo)
     if not grupo:
         return None, "Grupo não encontrado"
+
+    liga_anterior = grupo.liga_id
     
     if 'nome' in dados:
         grupo.nome = dados['nome']
@@ -137,25 +163,27 @@ def AtualizarGrupo(id_grupo, dados):
     if 'liga_id' in dados:
         grupo.liga_id = dados['liga_id']
             
+    registrar_alteracao(liga_anterior, grupo.liga_id)
     db.session.commit()
     return grupo, None
 
 def DeletarGrupo(id_grupo):
-    grupo = Grupo.query.get(id_grupo)
+    grupo = db.session.get(Grupo, id_grupo)
     if not grupo:
         return False, "Grupo não encontrado"
     
     db.session.delete(grupo)
+    registrar_alteracao(grupo.liga_id)
     db.session.commit()
     return True, None
 
-def ObterClassificacaoPorGrupoId(id_grupo):
-    grupo = Grupo.query.get(id_grupo)
+def ObterClassificacaoPorGrupoId(id_grupo, modo=None):
+    grupo = db.session.get(Grupo, id_grupo)
     if not grupo:
         return None, "Grupo não encontrado"
     
     try:
-        classificacao = grupo.calcular_classificacao()
+        classificacao = grupo.calcular_classificacao(modo)
         return classificacao, None
     except Exception as e:
         return None, f"Erro ao calcular classificação: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,341 @@
+import csv
+import io
+import json
+import re
+from itertools import islice
+from sqlalchemy import select, insert, func
+from config import db
+from Model.versao import registrar_alteracao
+
+TIPOS_IMPORTACAO = ("jogadores", "times", "partidas")
+FORMATOS_IMPORTACAO = ("csv", "json")
+# registros validados e gravados por vez; só um lote fica em memória
+TAMANHO_LOTE_IMPORTACAO = 5000
+TAMANHO_LEITURA_JSON = 64 * 1024
+SEPARADORES_JSON = re.compile(r"[\s,]*")
+
+def _itens_do_array(arquivo):
+    # lê um array JSON (já sem o "[") item a item, sem carregar o arquivo inteiro
+    decodificador = json.JSONDecoder()
+    buffer, inicio, fim = "", 0, False
+    while True:
+        inicio = SEPARADORES_JSON.match(buffer, inicio).end()
+        if buffer.startswith("]", inicio):
+            return
+        try:
+            item, posicao = decodificador.raw_decode(buffer, inicio)
+        except json.JSONDecodeError:
+            if fim:
+                raise
+            posicao = None
+        # item incompleto, ou um número no fim do buffer que pode continuar
+        if posicao is None or (posicao == len(buffer) and not fim):
+            pedaco = arquivo.read(TAMANHO_LEITURA_JSON)
+            fim = not pedaco
+            buffer, inicio = buffer[inicio:] + pedaco, 0
+            continue
+        yield item
+        inicio = posicao
+
+def ler_registros(arquivo, formato):
+    if formato == "csv":
+        for linha in csv.DictReader(arquivo):
+            yield {
+                chave.strip(): (valor.strip() or None) if isinstance(valor, str) else valor
+                for chave, valor in linha.items() if chave
+            }
+        return
+
+    inicio = arquivo.read(1)
+    while inicio and inicio.isspace():
+        inicio = arquivo.read(1)
+    if inicio == "[":
+        yield from _itens_do_array(arquivo)
+        return
+
+    # JSON Lines: um objeto por linha, lido sem carregar o arquivo inteiro
+    pendente = inicio
+    for linha in arquivo:
+        linha = (pendente + linha).strip()
+        pendente = ""
+        if linha:
+            yield json.loads(linha)
+
+def _lista_de_nomes(valor):
+    if valor is None:
+        return []
+    if isinstance(valor, str):
+        return [nome.strip() for nome in valor.split(";") if nome.strip()]
+    return list(valor)
+
+def _inteiro(valor):
+    if valor is None or valor == "":
+        return None
+    return int(valor)
+
+def _por_nome(modelo, nomes, *colunas):
+    nomes = {n for n in nomes if n}
+    if not nomes:
+        return {}
+    consulta = select(modelo.nome, modelo.id, *colunas).where(modelo.nome.in_(list(nomes))).order_by(modelo.id)
+    resultado = {}
+    for linha in db.session.execute(consulta):
+        resultado.setdefault(linha[0], linha[1:] if colunas else linha[1])
+    return resultado
+
+def _dialeto():
+    return db.session.get_bind().dialect.name
+
+def _copiar(tabela, colunas, linhas, gerar_ids=True):
+    preparador = db.session.get_bind().dialect.identifier_preparer
+    if gerar_ids:
+        sequencia = func.pg_get_serial_sequence(tabela.name, "id")
+        ids = db.session.execute(
+            select(func.nextval(sequencia)).select_from(func.generate_series(1, len(linhas)))
+        ).scalars().all()
+        for linha, novo_id in zip(linhas, ids):
+            linha["id"] = novo_id
+        colunas = ("id",) + tuple(colunas)
+
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    for linha in linhas:
+        escritor.writerow(["" if linha.get(c) is None else linha.get(c) for c in colunas])
+    buffer.seek(0)
+
+    comando = "COPY {} ({}) FROM STDIN WITH (FORMAT csv)".format(
+        preparador.format_table(tabela),
+        ", ".join(preparador.quote(c) for c in colunas)
+    )
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(comando, buffer)
+    finally:
+        cursor.close()
+    return [linha["id"] for linha in linhas] if gerar_ids else []
+
+def _inserir(tabela, colunas, linhas, gerar_ids=True):
+    if not linhas:
+        return []
+    if _dialeto() == "postgresql":
+        return _copiar(tabela, colunas, linhas, gerar_ids)
+
+    registros = [{c: linha.get(c) for c in colunas} for linha in linhas]
+    if not gerar_ids:
+        db.session.execute(insert(tabela), registros)
+        return []
+    return db.session.execute(
+        insert(tabela).returning(tabela.c.id, sort_by_parameter_order=True),
+        registros
+    ).scalars().all()
+
+def _validar_jogadores(registros, contexto):
+    from Model.time import Time
+
+    times = _por_nome(Time, {n for _, r in registros for n in _lista_de_nomes(r.get("times"))})
+    validos, erros = [], []
+    for linha, r in registros:
+        if not r.get("nome"):
+            erros.append({"linha": linha, "mensagem": "Nome é obrigatório"})
+            continue
+        if not r.get("posicao"):
+            erros.append({"linha": linha, "mensagem": "Posição é obrigatória"})
+            continue
+        nomes_times = _lista_de_nomes(r.get("times"))
+        faltando = [n for n in nomes_times if n not in times]
+        if faltando:
+            erros.append({"linha": linha, "mensagem": f"Time '{faltando[0]}' não encontrado"})
+            continue
+        validos.append({
+            "nome": r["nome"],
+            "posicao": r["posicao"],
+            "nacionalidade": r.get("nacionalidade"),
+            "times": [times[n] for n in nomes_times]
+        })
+    return validos, erros
+
+def _gravar_jogadores(validos):
+    from Model.jogador import Jogador
+    from Model.jogador_time import jogador_time
+
+    ids = _inserir(Jogador.__table__, ("nome", "posicao", "nacionalidade"), validos)
+    vinculos = [
+        {"jogador_id": jogador_id, "time_id": time_id}
+        for jogador_id, j in zip(ids, validos)
+        for time_id in dict.fromkeys(j["times"])
+    ]
+    _inserir(jogador_time, ("jogador_id", "time_id"), vinculos, gerar_ids=False)
+    registrar_alteracao()
+
+def _validar_times(registros, contexto):
+    from Model.competicao import Competicao
+    from Model.grupo import Grupo
+    from Model.time import Time
+
+    # nomes aceitos em lotes anteriores: na simulação eles não estão no banco
+    aceitos = contexto.setdefault("nomes", set())
+    existentes = aceitos | set(_por_nome(Time, {r.get("nome") for _, r in registros}))
+    competicoes = _por_nome(Competicao, {r.get("competicao") for _, r in registros}, Competicao.tipo)
+    grupos = {}
+    if competicoes:
+        consulta = select(Grupo.liga_id, Grupo.nome, Grupo.id).where(
+            Grupo.liga_id.in_([c[0] for c in competicoes.values()])
+        ).order_by(Grupo.id)
+        for liga_id, nome, grupo_id in db.session.execute(consulta):
+            grupos.setdefault((liga_id, nome), grupo_id)
+
+    validos, erros = [], []
+    for linha, r in registros:
+        if not r.get("nome"):
+            erros.append({"linha": linha, "mensagem": "Nome é obrigatório"})
+            continue
+        if r["nome"] in existentes:
+            erros.append({"linha": linha, "mensagem": "Já existe um time com esse nome"})
+            continue
+
+        competicao_id = grupo_id = None
+        if r.get("competicao"):
+            if r["competicao"] not in competicoes:
+                erros.append({"linha": linha, "mensagem": "Competição não encontrada"})
+                continue
+            competicao_id, tipo = competicoes[r["competicao"]]
+            if r.get("grupo") and tipo == "liga":
+                grupo_id = grupos.get((competicao_id, r["grupo"]))
+                if grupo_id is None:
+                    erros.append({"linha": linha, "mensagem": "Grupo não encontrado ou não pertence à liga"})
+                    continue
+
+        existentes.add(r["nome"])
+        aceitos.add(r["nome"])
+        validos.append({
+            "nome": r["nome"],
+            "logo": r.get("logo"),
+            "competicao_id": competicao_id,
+            "grupo_id": grupo_id
+        })
+    return validos, erros
+
+def _gravar_times(validos):
+    from Model.time import Time
+
+    _inserir(Time.__table__, ("nome", "logo", "competicao_id", "grupo_id"), validos)
+    registrar_alteracao(*{t["competicao_id"] for t in validos})
+
+def _validar_partidas(registros, contexto):
+    from Model.competicao import Competicao
+    from Model.grupo import Grupo
+    from Model.time import Time
+
+    competicoes = _por_nome(Competicao, {r.get("competicao") for _, r in registros})
+    times = _por_nome(Time, {r.get(c) for _, r in registros for c in ("time_casa", "time_fora")})
+    grupos = {}
+    if competicoes:
+        consulta = select(Grupo.liga_id, Grupo.nome, Grupo.id).where(
+            Grupo.liga_id.in_(list(competicoes.values()))
+        ).order_by(Grupo.id)
+        for liga_id, nome, grupo_id in db.session.execute(consulta):
+            grupos.setdefault((liga_id, nome), grupo_id)
+
+    validos, erros = [], []
+    for linha, r in registros:
+        if not all(r.get(c) for c in ("rodada", "time_casa", "time_fora")):
+            erros.append({"linha": linha, "mensagem": "Campos obrigatórios faltando"})
+            continue
+
+        competicao_id = grupo_id = None
+        if r.get("competicao"):
+            competicao_id = competicoes.get(r["competicao"])
+            if competicao_id is None:
+                erros.append({"linha": linha, "mensagem": "Competição não encontrada"})
+                continue
+        if r.get("grupo"):
+            grupo_id = grupos.get((competicao_id, r["grupo"]))
+            if grupo_id is None:
+                erros.append({"linha": linha, "mensagem": "Grupo não encontrado"})
+                continue
+        if r["time_casa"] not in times:
+            erros.append({"linha": linha, "mensagem": "Time da casa não encontrado"})
+            continue
+        if r["time_fora"] not in times:
+            erros.append({"linha": linha, "mensagem": "Time visitante não encontrado"})
+            continue
+        try:
+            gols_casa, gols_fora = _inteiro(r.get("gols_casa")), _inteiro(r.get("gols_fora"))
+        except (TypeError, ValueError):
+            erros.append({"linha": linha, "mensagem": "Placar inválido"})
+            continue
+
+        validos.append({
+            "competicao_id": competicao_id,
+            "grupo_id": grupo_id,
+            "rodada": str(r["rodada"]),
+            "time_casa_id": times[r["time_casa"]],
+            "time_fora_id": times[r["time_fora"]],
+            "gols_casa": gols_casa,
+            "gols_fora": gols_fora,
+            "link": r.get("link")
+        })
+    return validos, erros
+
+def _gravar_partidas(validos):
+    from Model.partida import Partida
+    from Model.classificacao import atualizar_classificacao_em_lote
+
+    colunas = ("competicao_id", "grupo_id", "rodada", "time_casa_id", "time_fora_id", "gols_casa", "gols_fora", "link")
+    _inserir(Partida.__table__, colunas, validos)
+    atualizar_classificacao_em_lote(adicionados=[
+        (p["grupo_id"], p["time_casa_id"], p["time_fora_id"], p["gols_casa"], p["gols_fora"])
+        for p in validos
+    ])
+    registrar_alteracao(*{p["competicao_id"] for p in validos})
+
+ETAPAS_IMPORTACAO = {
+    "jogadores": (_validar_jogadores, _gravar_jogadores),
+    "times": (_validar_times, _gravar_times),
+    "partidas": (_validar_partidas, _gravar_partidas)
+}
+
+def ImportarRegistros(tipo, arquivo, formato, simular=False, tamanho_lote=TAMANHO_LOTE_IMPORTACAO):
+    if tipo not in ETAPAS_IMPORTACAO:
+        return None, f"Tipo deve ser um de: {', '.join(TIPOS_IMPORTACAO)}"
+    if formato not in FORMATOS_IMPORTACAO:
+        return None, f"Formato deve ser um de: {', '.join(FORMATOS_IMPORTACAO)}"
+
+    # a linha 1 do CSV é o cabeçalho
+    primeira = 2 if formato == "csv" else 1
+    registros = enumerate(ler_registros(arquivo, formato), start=primeira)
+    validar, gravar = ETAPAS_IMPORTACAO[tipo]
+    contexto = {}
+    total = validas = 0
+    erros = []
+
+    # cada lote é validado e gravado antes de o próximo ser lido; a numeração
+    # das linhas segue o arquivo inteiro e tudo é confirmado numa transação só
+    while True:
+        try:
+            lote = list(islice(registros, tamanho_lote))
+        except (ValueError, csv.Error) as e:
+            db.session.rollback()
+            return None, f"Arquivo inválido: {e}"
+        if not lote:
+            break
+
+        total += len(lote)
+        invalidos = [{"linha": linha, "mensagem": "Registro inválido"} for linha, r in lote if not isinstance(r, dict)]
+        validos, erros_validacao = validar([(linha, r) for linha, r in lote if isinstance(r, dict)], contexto)
+        erros += sorted(invalidos + erros_validacao, key=lambda e: e["linha"])
+        validas += len(validos)
+        if validos and not simular:
+            gravar(validos)
+
+    if validas and not simular:
+        db.session.commit()
+
+    return {
+        "tipo": tipo,
+        "simulacao": simular,
+        "linhas": total,
+        "validas": validas,
+        "importadas": 0 if simular else validas,
+        "erros": erros
+    }, None
@@ -1,7 +1,15 @@
 from flask import request
+from sqlalchemy import select
 from Model.jogador_time import jogador_time
+from Model.estatistica_jogador import EstatisticaJogador
 from Model.time import Time
 from config import db
+from Model.paginacao import paginar
+from Model.versao import registrar_alteracao
+from Model.carregamento import com_perfil, perfil
+from Model.resolvedor import resolver_ids
+
+CAMPOS_JOGADOR = ("id", "nome", "posicao", "nacionalidade")
 
 class Jogador(db.Model):
     __tablename__ = "jogador"
@@ -12,161 +20,94 @@ class Jogador(db.Model):
     nacionalidade = db.Column(db.String(30), nullable=True)
 
     times = db.relationship("Time", secondary=jogador_time, back_populates="jogadores")
+    estatistica = db.relationship("EstatisticaJogador", uselist=False, cascade="all, delete-orphan")
 
     def __init__(self, nome, posicao, nacionalidade=None):
         self.nome = nome
         self.posicao = posicao
         self.nacionalidade = nacionalidade
 
-    def contar_estatisticas(self):
-        from Model.sumula import Gol, Cartao, Sumula, CleanSheet
-        from Model.selecao import JogadorSelecao
-        from Model.premiacao import Premiacao, TopJogadorPremiacao
-
-        gols = Gol.query.filter_by(jogador_id=self.id, contra=False).count()
-        assistencias = Gol.query.filter(Gol.assistencia_id == self.id).count()
-        cleansheets = CleanSheet.query.filter_by(jogador_id=self.id).count()
-        gols_contra = Gol.query.filter_by(jogador_id=self.id, contra=True).count()
-        amarelos = Cartao.query.filter_by(jogador_id=self.id, tipo='amarelo').count()
-        vermelhos = Cartao.query.filter_by(jogador_id=self.id, tipo='vermelho').count()
-        selecao = JogadorSelecao.query.filter_by(jogador_id=self.id).count()
-        mvps = Sumula.query.filter_by(mvp_id=self.id).count()
-
-        premiacoes = []
-
-        premiacoes_recebidas = Premiacao.query.filter(
-            (Premiacao.mvp_id == self.id) |
-            (Premiacao.artilheiro_id == self.id) |
-            (Premiacao.luva_de_ouro_id == self.id) |
-            (Premiacao.revelacao_id == self.id)
-        ).all()
-
-        for p in premiacoes_recebidas:
-            if p.mvp_id == self.id:
-                premiacoes.append({"tipo": "MVP", "competicao": p.competicao.nome})
-            if p.artilheiro_id == self.id:
-                premiacoes.append({"tipo": "Artilheiro", "competicao": p.competicao.nome})
-            if p.luva_de_ouro_id == self.id:
-                premiacoes.append({"tipo": "Luva de Ouro", "competicao": p.competicao.nome})
-            if p.revelacao_id == self.id:
-                premiacoes.append({"tipo": "Revelação", "competicao": p.competicao.nome})
-
-        tops = TopJogadorPremiacao.query.filter_by(jogador_id=self.id).all()
-        for t in tops:
-            premiacoes.append({
-                "tipo": f"Top {t.posicao} - {t.categoria}",
-                "competicao": t.premiacao.competicao.nome
-            })
-
-        return {
-            "gols": gols,
-            "assistencias": assistencias,
-            "cleansheets": cleansheets,
-            "gols_contra": gols_contra,
-            "cartoes_amarelos": amarelos,
-            "cartoes_vermelhos": vermelhos,
-            "selecao": selecao,
-            "mvps": mvps,
-            "premiacoes": premiacoes
-        }
-    
-    def contar_estatisticas_na_competicao(self, competicao_id):
-        from Model.sumula import Gol, Cartao, Sumula, CleanSheet
-        from Model.partida import Partida
-
-        partidas_ids = db.session.query(Partida.id).filter_by(competicao_id=competicao_id).subquery()
-
-        gols = Gol.query.join(Sumula).filter(
-            Gol.jogador_id == self.id,
-            Sumula.partida_id.in_(partidas_ids),
-            Gol.contra == False
-        ).count()
-
-        assistencias = Gol.query.join(Sumula).filter(
-            Gol.assistencia_id == self.id,
-            Sumula.partida_id.in_(partidas_ids)
-        ).count()
-
-        cleansheets = CleanSheet.query.join(Sumula).filter(
-            CleanSheet.jogador_id == self.id,
-            Sumula.partida_id.in_(partidas_ids)
-        ).count()
-
-        gols_contra = Gol.query.join(Sumula).filter(
-            Gol.jogador_id == self.id,
-            Sumula.partida_id.in_(partidas_ids),
-            Gol.contra == True
-        ).count()
-
-        amarelos = Cartao.query.join(Sumula).filter(
-            Cartao.jogador_id == self.id,
-            Cartao.tipo == 'amarelo',
-            Sumula.partida_id.in_(partidas_ids)
-        ).count()
-
-        vermelhos = Cartao.query.join(Sumula).filter(
-            Cartao.jogador_id == self.id,
-            Cartao.tipo == 'vermelho',
-            Sumula.partida_id.in_(partidas_ids)
-        ).count()
-
-        mvps = Sumula.query.filter(
-            Sumula.mvp_id == self.id,
-            Sumula.partida_id.in_(partidas_ids)
-        ).count()
-
-        return {
-            "gols": gols,
-            "assistencias": assistencias,
-            "cleansheets": cleansheets,
-            "gols_contra": gols_contra,
-            "cartoes_amarelos": amarelos,
-            "cartoes_vermelhos": vermelhos,
-            "mvps": mvps
-        }
+    def contar_estatisticas(self, campos=None):
+        from Model.estatisticas import contar_estatisticas_em_lote
+        return contar_estatisticas_em_lote([self], campos)[self.id]
     
-    def estatisticas_ranking(self):
-        estat = self.contar_estatisticas()
-        return {
-            "id": self.id,
-            "nome": self.nome,
-            "posicao": self.posicao,
-            "nacionalidade": self.nacionalidade,
-            "gols": estat["gols"],
-            "assistencias": estat["assistencias"],
-            "cleansheets": estat["cleansheets"],
-            "mvps": estat["mvps"]
-        }
-
-    def estatisticas_ranking_competicao(self, competicao_id):
-        estat = self.contar_estatisticas_na_competicao(competicao_id)
-        return {
-            "id": self.id,
-            "nome": self.nome,
-            "posicao": self.posicao,
-            "nacionalidade": self.nacionalidade,
-            "gols": estat["gols"],
-            "assistencias": estat["assistencias"],
-            "cleansheets": estat["cleansheets"],
-            "mvps": estat["mvps"]
-        }
-
-    def dici(self):
-        estatisticas = self.contar_estatisticas()
-        return {
+    def dici(self, estatisticas=None, campos=None):
+        if estatisticas is None:
+            estatisticas = self.contar_estatisticas(campos)
+        dados = {
             "id": self.id,
             "nome": self.nome,
             "posicao": self.posicao,
             "nacionalidade": self.nacionalidade,
-            **estatisticas,
-            "times": [{"id": t.id, "nome": t.nome, "competicao": t.competicao} for t in self.times]
+            **estatisticas
         }
-
-def ListarJogadores():
-    return Jogador.query.all()
-
-def ListarJogadorPorNome(NomeJogador):
-    return Jogador.query.filter_by(nome=NomeJogador).first()
+        if campos is not None:
+            dados = {k: v for k, v in dados.items() if k in campos}
+        if campos is None or "times" in campos:
+            dados["times"] = [{"id": t.id, "nome": t.nome, "competicao": t.competicao} for t in self.times]
+        return dados
+
+def ListarJogadores(limite=None, apos=None):
+    return paginar(com_perfil(Jogador.query, "jogador"), Jogador.id, limite, apos).all()
+
+def ListarJogadoresResumidos(limite=None, apos=None):
+    from Model.competicao import Competicao
+
+    pagina = paginar(
+        select(Jogador.id, Jogador.nome, Jogador.posicao, Jogador.nacionalidade),
+        Jogador.id, limite, apos
+    )
+    jogadores = [dict(linha) for linha in db.session.execute(pagina).mappings()]
+    if not jogadores:
+        return []
+
+    ids = pagina.with_only_columns(Jogador.id).subquery()
+    vinculos = select(
+        jogador_time.c.jogador_id,
+        Time.id,
+        Time.nome,
+        Competicao.id.label("competicao_id"),
+        Competicao.nome.label("competicao_nome")
+    ).join(
+        Time, Time.id == jogador_time.c.time_id
+    ).outerjoin(
+        Competicao, Competicao.id == Time.competicao_id
+    ).where(
+        jogador_time.c.jogador_id.in_(select(ids.c.id))
+    )
+
+    times = {j["id"]: [] for j in jogadores}
+    for jogador_id, time_id, nome, competicao_id, competicao_nome in db.session.execute(vinculos):
+        times[jogador_id].append({
+            "id": time_id,
+            "nome": nome,
+            "competicao": {
+                "id": competicao_id,
+                "nome": competicao_nome
+            } if competicao_id is not None else None
+        })
+
+    for jogador in jogadores:
+        jogador["times"] = times[jogador["id"]]
+    return jogadores
+
+def ListarJogadoresComEstatisticas(limite=None, apos=None, campos=None):
+    from Model.estatisticas import contar_estatisticas_em_lote
+    jogadores = paginar(com_perfil(Jogador.query, "jogador", campos), Jogador.id, limite, apos).all()
+    estatisticas = contar_estatisticas_em_lote(jogadores, campos)
+    return [j.dici(estatisticas[j.id], campos) for j in jogadores]
+
+def IterarJogadoresComEstatisticas(apos=None, limite=None, campos=None, tamanho_lote=500):
+    from Model.estatisticas import contar_estatisticas_em_lote
+    consulta = paginar(select(Jogador).options(*perfil("jogador", campos)), Jogador.id, limite, apos)
+    resultado = db.session.scalars(consulta.execution_options(yield_per=tamanho_lote))
+    for jogadores in resultado.partitions():
+        estatisticas = contar_estatisticas_em_lote(jogadores, campos)
+        for j in jogadores:
+            yield j.dici(estatisticas[j.id], campos)
+
+def ListarJogadorPorNome(NomeJogador, campos=None):
+    return com_perfil(Jogador.query, "jogador", campos).filter_by(nome=NomeJogador).first()
 
 def CriarJogador(dados):
     nome = dados.get("nome")
@@ -178,23 +119,32 @@ def CriarJogador(dados):
     if not posicao:
         return None, "Posição é obrigatória"
 
-    novoJogador = Jogador(nome=nome, posicao=posicao, nacionalidade=nacionalidade)
+    times, faltando = resolver_ids(Time, times_ids)
+    if faltando:
+        return None, f"Time {min(faltando)} não encontrado"
 
+    novoJogador = Jogador(nome=nome, posicao=posicao, nacionalidade=nacionalidade)
     for time_id in times_ids:
-        time = Time.query.get(time_id)
+        time = times.get(time_id)
         if time:
             novoJogador.times.append(time)
 
     db.session.add(novoJogador)
+    registrar_alteracao()
     db.session.commit()
 
     return novoJogador, None
 
 def AtualizarJogador(idJogador, dados):
-    jogador = Jogador.query.get(idJogador)
+    jogador = db.session.get(Jogador, idJogador)
     if not jogador:
         return None, "Jogador não encontrado"
 
+    if "times_ids" in dados:
+        times, faltando = resolver_ids(Time, dados["times_ids"])
+        if faltando:
+            return None, f"Time {min(faltando)} não encontrado"
+
     jogador.nome = dados.get("nome", jogador.nome)
     jogador.posicao = dados.get("posicao", jogador.posicao)
     jogador.nacionalidade = dados.get("nacionalidade", jogador.nacionalidade)
@@ -202,18 +152,20 @@ def AtualizarJogador(idJogador, dados):
     if "times_ids" in dados:
         jogador.times = []
         for time_id in dados["times_ids"]:
-            time = Time.query.get(time_id)
+            time = times.get(time_id)
             if time:
                 jogador.times.append(time)
 
+    registrar_alteracao()
     db.session.commit()
     return jogador, None
 
 def DeletarJogador(idJogador):
-    jogador = Jogador.query.get(idJogador)
+    jogador = db.session.get(Jogador, idJogador)
     if not jogador:
         return False, "Jogador não encontrado"
 
     db.session.delete(jogador)
+    registrar_alteracao()
     db.session.commit()
     return True, None
\ No newline at end of file
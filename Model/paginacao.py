@@ -0,0 +1,7 @@
+def paginar(consulta, coluna, limite=None, apos=None):
+    consulta = consulta.order_by(coluna)
+    if apos is not None:
+        consulta = consulta.filter(coluna > apos)
+    if limite is not None:
+        consulta = consulta.limit(limite)
+    return consulta
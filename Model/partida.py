@@ -1,5 +1,12 @@
 from flask import request
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
 from config import db
+from Model.paginacao import paginar
+from Model.versao import registrar_alteracao
+from Model.carregamento import com_perfil, perfil
+from Model.resolvedor import resolver_ids
+from Model.classificacao import atualizar_classificacao, resultado_da_partida
 
 class Partida(db.Model):
     __tablename__ = "partida"
@@ -48,14 +55,48 @@ class Partida(db.Model):
             "gols_fora": self.gols_fora
         }
 
-def ListarPartidas():
-    return Partida.query.all()
+def ListarPartidas(limite=None, apos=None):
+    return paginar(com_perfil(Partida.query, "partida"), Partida.id, limite, apos).all()
+
+def _consulta_partidas_resumidas():
+    from Model.competicao import Competicao
+    from Model.time import Time
+    casa = aliased(Time)
+    fora = aliased(Time)
+
+    return select(
+        Partida.id,
+        Competicao.nome.label("competicao"),
+        Partida.competicao_id,
+        Partida.grupo_id,
+        Partida.link,
+        Partida.rodada,
+        casa.nome.label("time_casa"),
+        Partida.gols_casa,
+        fora.nome.label("time_fora"),
+        Partida.gols_fora
+    ).outerjoin(
+        Competicao, Competicao.id == Partida.competicao_id
+    ).outerjoin(
+        casa, casa.id == Partida.time_casa_id
+    ).outerjoin(
+        fora, fora.id == Partida.time_fora_id
+    )
+
+def ListarPartidasResumidas(limite=None, apos=None):
+    consulta = paginar(_consulta_partidas_resumidas(), Partida.id, limite, apos)
+    return [dict(linha) for linha in db.session.execute(consulta).mappings()]
+
+def IterarPartidasResumidas(apos=None, limite=None, tamanho_lote=1000):
+    consulta = paginar(_consulta_partidas_resumidas(), Partida.id, limite, apos)
+    for linha in db.session.execute(consulta.execution_options(yield_per=tamanho_lote)).mappings():
+        yield dict(linha)
 
 def ListarPartidasPorRodada(rodada):
-    return Partida.query.filter(db.func.lower(Partida.rodada) == rodada.lower()).all()
+    return com_perfil(Partida.query, "partida").filter(db.func.lower(Partida.rodada) == rodada.lower()).all()
 
 def ListarPartidaPorId(idPartida):
-    return Partida.query.get(idPartida)
+    return db.session.get(Partida, idPartida, options=perfil("partida"))
 
 def CriarPartida(dados):
     required_fields = ["rodada", "time_casa_id", "time_fora_id"]
@@ -64,20 +105,21 @@ def CriarPartida(dados):
     
     from Model.competicao import Competicao
     competicao_id = dados.get("competicao_id")
-    if competicao_id and not Competicao.query.get(competicao_id):
+    if competicao_id and not db.session.get(Competicao, competicao_id):
         return None, "Competição não encontrada"
     
     from Model.grupo import Grupo
     grupo_id = dados.get("grupo_id")
     if grupo_id:
-        grupo = Grupo.query.get(grupo_id)
+        grupo = db.session.get(Grupo, grupo_id)
         if not grupo:
             return None, "Grupo não encontrado"
 
     from Model.time import Time
-    if not Time.query.get(dados["time_casa_id"]):
+    times, _ = resolver_ids(Time, (dados["time_casa_id"], dados["time_fora_id"]))
+    if dados["time_casa_id"] not in times:
         return None, "Time da casa não encontrado"
-    if not Time.query.get(dados["time_fora_id"]):
+    if dados["time_fora_id"] not in times:
         return None, "Time visitante não encontrado"
 
     novaPartida = Partida(
@@ -92,6 +134,8 @@ def CriarPartida(dados):
     )
     
     db.session.add(novaPartida)
+    atualizar_classificacao(atual=resultado_da_partida(novaPartida))
+    registrar_alteracao(novaPartida.competicao_id)
     db.session.commit()
     return novaPartida, None
 
@@ -99,6 +143,9 @@ def AtualizarPartida(idPartida, dados):
     partida = db.session.get(Partida, idPartida)
     if not partida:
         return None, "Partida não encontrada."
+
+    resultado_anterior = resultado_da_partida(partida)
+    competicao_anterior = partida.competicao_id
     
     from Model.time import Time
     if "time_casa_id" in dados:
@@ -138,13 +185,29 @@ def AtualizarPartida(idPartida, dados):
             return None, "Grupo não encontrado."
         partida.grupo_id = dados["grupo_id"]
 
+    atualizar_classificacao(anterior=resultado_anterior, atual=resultado_da_partida(partida))
+
+    from Model.chaveamento import avancar_chave
+    erro = avancar_chave(partida, dados.get("vencedor_id"))
+    if erro:
+        db.session.rollback()
+        return None, erro
+
+    registrar_alteracao(competicao_anterior, partida.competicao_id)
     db.session.commit()
     return partida, None
 
 def DeletarPartida(id):
-    partida = Partida.query.get(id)
+    partida = db.session.get(Partida, id)
     if not partida:
         return False, "Partida não encontrada"
+
+    from Model.chaveamento import partida_na_chave
+    if partida_na_chave(partida.id):
+        return False, "A partida faz parte do chaveamento do torneio"
+
+    atualizar_classificacao(anterior=resultado_da_partida(partida))
     db.session.delete(partida)
+    registrar_alteracao(partida.competicao_id)
     db.session.commit()
     return True, None
\ No newline at end of file
@@ -1,4 +1,8 @@
 from config import db
+from Model.paginacao import paginar
+from Model.versao import registrar_alteracao
+from Model.carregamento import com_perfil, perfil
+from Model.resolvedor import resolver_ids
 from Model.jogador import Jogador
 from Model.competicao import Competicao
 from Model.time import Time
@@ -63,9 +67,18 @@ class Premiacao(db.Model):
             "campeao": self.campeao.nome if self.campeao else None
         }
 
-def adicionar_tops(premiacao, categoria, lista):
+CAMPOS_JOGADORES = ("mvp_id", "artilheiro_id", "luva_de_ouro_id", "revelacao_id")
+CAMPOS_TOPS = ("top_gk", "top_zag", "top_mid", "top_atk")
+
+def resolver_jogadores(dados):
+    ids = {dados.get(campo) for campo in CAMPOS_JOGADORES}
+    for campo in CAMPOS_TOPS:
+        ids.update(item.get("jogador_id") for item in dados.get(campo, []))
+    return resolver_ids(Jogador, ids)
+
+def adicionar_tops(premiacao, categoria, lista, jogadores):
     for item in lista:
-        jogador = Jogador.query.get(item["jogador_id"])
+        jogador = jogadores.get(item["jogador_id"])
         if jogador:
             top = TopJogadorPremiacao(
                 jogador=jogador,
@@ -74,53 +87,62 @@ def adicionar_tops(premiacao, categoria, lista):
             )
             premiacao.tops.append(top)
 
-def atualizar_tops(premiacao, categoria, lista):
+def atualizar_tops(premiacao, categoria, lista, jogadores):
     premiacao.tops = [t for t in premiacao.tops if t.categoria != categoria]
-    adicionar_tops(premiacao, categoria, lista)
+    adicionar_tops(premiacao, categoria, lista, jogadores)
 
-def ListarPremiacoes():
-    return Premiacao.query.all()
+def ListarPremiacoes(limite=None, apos=None):
+    return paginar(com_perfil(Premiacao.query, "premiacao"), Premiacao.id, limite, apos).all()
 
 def BuscarPremiacaoPorId(premiacao_id):
-    return Premiacao.query.get(premiacao_id)
+    return db.session.get(Premiacao, premiacao_id, options=perfil("premiacao"))
 
 def CriarPremiacao(dados):
-    competicao = Competicao.query.get(dados.get("competicao_id"))
+    competicao = db.session.get(Competicao, dados.get("competicao_id"))
     if not competicao:
         return None, "Competição não encontrada"
 
+    jogadores, faltando = resolver_jogadores(dados)
+    if faltando:
+        return None, f"Jogador {min(faltando)} não encontrado"
+
     premiacao = Premiacao(competicao=competicao)
 
     if dados.get("campeao_id"):
-        campeao = Time.query.get(dados["campeao_id"])
+        campeao = db.session.get(Time, dados["campeao_id"])
         if not campeao:
             return None, "Time campeão não encontrado"
         premiacao.campeao = campeao
 
     def buscar_jogador(campo):
-        return Jogador.query.get(dados.get(campo)) if dados.get(campo) else None
+        return jogadores.get(dados.get(campo))
 
     premiacao.mvp = buscar_jogador("mvp_id")
     premiacao.artilheiro = buscar_jogador("artilheiro_id")
     premiacao.luva_de_ouro = buscar_jogador("luva_de_ouro_id")
     premiacao.revelacao = buscar_jogador("revelacao_id")
 
-    adicionar_tops(premiacao, "GK", dados.get("top_gk", []))
-    adicionar_tops(premiacao, "ZAG", dados.get("top_zag", []))
-    adicionar_tops(premiacao, "MID", dados.get("top_mid", []))
-    adicionar_tops(premiacao, "ATK", dados.get("top_atk", []))
+    adicionar_tops(premiacao, "GK", dados.get("top_gk", []), jogadores)
+    adicionar_tops(premiacao, "ZAG", dados.get("top_zag", []), jogadores)
+    adicionar_tops(premiacao, "MID", dados.get("top_mid", []), jogadores)
+    adicionar_tops(premiacao, "ATK", dados.get("top_atk", []), jogadores)
 
     db.session.add(premiacao)
+    registrar_alteracao(competicao.id)
     db.session.commit()
     return premiacao, None
 
 def AtualizarPremiacao(premiacao_id, dados):
-    premiacao = Premiacao.query.get(premiacao_id)
+    premiacao = db.session.get(Premiacao, premiacao_id)
     if not premiacao:
         return None, "Premiação não encontrada"
 
+    jogadores, faltando = resolver_jogadores(dados)
+    if faltando:
+        return None, f"Jogador {min(faltando)} não encontrado"
+
     def buscar_jogador(campo):
-        return Jogador.query.get(dados.get(campo)) if dados.get(campo) else None
+        return jogadores.get(dados.get(campo))
 
     if "mvp_id" in dados:
         premiacao.mvp = buscar_jogador("mvp_id")
@@ -132,28 +154,30 @@ def AtualizarPremiacao(premiacao_id, dados):
         premiacao.revelacao = buscar_jogador("revelacao_id")
 
     if "campeao_id" in dados:
-        novo_campeao = Time.query.get(dados["campeao_id"])
+        novo_campeao = db.session.get(Time, dados["campeao_id"])
         if not novo_campeao:
             return None, "Time campeão não encontrado"
         premiacao.campeao = novo_campeao
 
     if "top_gk" in dados:
-        atualizar_tops(premiacao, "GK", dados["top_gk"])
+        atualizar_tops(premiacao, "GK", dados["top_gk"], jogadores)
     if "top_zag" in dados:
-        atualizar_tops(premiacao, "ZAG", dados["top_zag"])
+        atualizar_tops(premiacao, "ZAG", dados["top_zag"], jogadores)
     if "top_mid" in dados:
-        atualizar_tops(premiacao, "MID", dados["top_mid"])
+        atualizar_tops(premiacao, "MID", dados["top_mid"], jogadores)
     if "top_atk" in dados:
-        atualizar_tops(premiacao, "ATK", dados["top_atk"])
+        atualizar_tops(premiacao, "ATK", dados["top_atk"], jogadores)
 
+    registrar_alteracao(premiacao.competicao_id)
     db.session.commit()
     return premiacao, None
 
 def DeletarPremiacao(premiacao_id):
-    premiacao = Premiacao.query.get(premiacao_id)
+    premiacao = db.session.get(Premiacao, premiacao_id)
     if not premiacao:
         return False, "Premiação não encontrada"
 
     db.session.delete(premiacao)
+    registrar_alteracao(premiacao.competicao_id)
     db.session.commit()
     return True, None
\ No newline at end of file
@@ -0,0 +1,13 @@
+from config import db
+
+TAMANHO_LOTE = 1000
+
+def resolver_ids(modelo, ids):
+    procurados = {i for i in ids if i is not None}
+    encontrados = {}
+    pendentes = list(procurados)
+    for inicio in range(0, len(pendentes), TAMANHO_LOTE):
+        lote = pendentes[inicio:inicio + TAMANHO_LOTE]
+        for obj in db.session.query(modelo).filter(modelo.id.in_(lote)):
+            encontrados[obj.id] = obj
+    return encontrados, procurados - set(encontrados)
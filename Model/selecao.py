@@ -1,4 +1,8 @@
 from config import db
+from Model.paginacao import paginar
+from Model.versao import registrar_alteracao
+from Model.carregamento import com_perfil, perfil
+from Model.resolvedor import resolver_ids
 from Model.jogador import Jogador
 from Model.competicao import Competicao
 
@@ -9,6 +13,7 @@ class SelecaoRodada(db.Model):
     competicao_id = db.Column(db.Integer, db.ForeignKey("competicao.id"), nullable=False)
     observacoes = db.Column(db.Text)
 
+    competicao = db.relationship("Competicao")
     jogadores = db.relationship("JogadorSelecao", backref="selecao", cascade="all, delete-orphan")
 
     def dici(self):
@@ -16,7 +21,7 @@ class SelecaoRodada(db.Model):
             "id": self.id,
             "rodada": self.rodada,
             "competicao_id": self.competicao_id,
-            "competicao": Competicao.query.get(self.competicao_id).nome if self.competicao_id else None,
+            "competicao": self.competicao.nome if self.competicao else None,
             "observacoes": self.observacoes,
             "jogadores":  [js.dici() for js in self.jogadores]
         }
@@ -56,9 +61,17 @@ class JogadorSelecao(db.Model):
         }
 
 
-def adicionar_jogadores(selecao, categoria, lista_ids):
+CATEGORIAS_SELECAO = (("gk", "GK"), ("zag", "ZAG"), ("mid", "MID"), ("atk", "ATK"))
+
+def resolver_jogadores(dados):
+    ids = set()
+    for campo, _ in CATEGORIAS_SELECAO:
+        ids.update(dados.get(campo, []))
+    return resolver_ids(Jogador, ids)
+
+def adicionar_jogadores(selecao, categoria, lista_ids, jogadores):
     for jogador_id in lista_ids:
-        jogador = Jogador.query.get(jogador_id)
+        jogador = jogadores.get(jogador_id)
         if jogador:
             js = JogadorSelecao(
                 jogador=jogador,
@@ -66,46 +79,57 @@ def adicionar_jogadores(selecao, categoria, lista_ids):
             )
             selecao.jogadores.append(js)
 
-def atualizar_jogadores(selecao, categoria, lista_ids):
+def atualizar_jogadores(selecao, categoria, lista_ids, jogadores):
     selecao.jogadores = [j for j in selecao.jogadores if j.categoria != categoria]
-    adicionar_jogadores(selecao, categoria, lista_ids)
+    adicionar_jogadores(selecao, categoria, lista_ids, jogadores)
 
-def ListarSelecoes():
-    return SelecaoRodada.query.all()
+def ListarSelecoes(limite=None, apos=None):
+    return paginar(com_perfil(SelecaoRodada.query, "selecao"), SelecaoRodada.id, limite, apos).all()
 
 def BuscarSelecaoPorId(selecao_id):
-    return SelecaoRodada.query.get(selecao_id)
+    return db.session.get(SelecaoRodada, selecao_id, options=perfil("selecao"))
 
 def CriarSelecao(dados):
-    competicao = Competicao.query.get(dados.get("competicao_id"))
+    competicao = db.session.get(Competicao, dados.get("competicao_id"))
     if not competicao:
         return None, "Competição não encontrada"
 
+    jogadores, faltando = resolver_jogadores(dados)
+    if faltando:
+        return None, f"Jogador {min(faltando)} não encontrado"
+
     selecao = SelecaoRodada(
         rodada=dados.get("rodada"),
         competicao_id=competicao.id,
         observacoes=dados.get("observacoes", "")
     )
 
-    adicionar_jogadores(selecao, "GK", dados.get("gk", []))
-    adicionar_jogadores(selecao, "ZAG", dados.get("zag", []))
-    adicionar_jogadores(selecao, "MID", dados.get("mid", []))
-    adicionar_jogadores(selecao, "ATK", dados.get("atk", []))
+    adicionar_jogadores(selecao, "GK", dados.get("gk", []), jogadores)
+    adicionar_jogadores(selecao, "ZAG", dados.get("zag", []), jogadores)
+    adicionar_jogadores(selecao, "MID", dados.get("mid", []), jogadores)
+    adicionar_jogadores(selecao, "ATK", dados.get("atk", []), jogadores)
 
     db.session.add(selecao)
+    registrar_alteracao(selecao.competicao_id)
     db.session.commit()
     return selecao, None
 
 def AtualizarSelecao(selecao_id, dados):
-    selecao = SelecaoRodada.query.get(selecao_id)
+    selecao = db.session.get(SelecaoRodada, selecao_id)
     if not selecao:
         return None, "Seleção não encontrada"
 
+    jogadores, faltando = resolver_jogadores(dados)
+    if faltando:
+        return None, f"Jogador {min(faltando)} não encontrado"
+
+    competicao_anterior = selecao.competicao_id
+
     if "rodada" in dados:
         selecao.rodada = dados["rodada"]
 
     if "competicao_id" in dados:
-        nova_competicao = Competicao.query.get(dados["competicao_id"])
+        nova_competicao = db.session.get(Competicao, dados["competicao_id"])
         if not nova_competicao:
             return None, "Competição não encontrada"
         selecao.competicao_id = nova_competicao.id
@@ -114,22 +138,24 @@ def AtualizarSelecao(selecao_id, dados):
         selecao.observacoes = dados["observacoes"]
 
     if "gk" in dados:
-        atualizar_jogadores(selecao, "GK", dados["gk"])
+        atualizar_jogadores(selecao, "GK", dados["gk"], jogadores)
     if "zag" in dados:
-        atualizar_jogadores(selecao, "ZAG", dados["zag"])
+        atualizar_jogadores(selecao, "ZAG", dados["zag"], jogadores)
     if "mid" in dados:
-        atualizar_jogadores(selecao, "MID", dados["mid"])
+        atualizar_jogadores(selecao, "MID", dados["mid"], jogadores)
     if "atk" in dados:
-        atualizar_jogadores(selecao, "ATK", dados["atk"])
+        atualizar_jogadores(selecao, "ATK", dados["atk"], jogadores)
 
+    registrar_alteracao(competicao_anterior, selecao.competicao_id)
     db.session.commit()
     return selecao, None
 
 def DeletarSelecao(selecao_id):
-    selecao = SelecaoRodada.query.get(selecao_id)
+    selecao = db.session.get(SelecaoRodada, selecao_id)
     if not selecao:
         return False, "Seleção não encontrada"
 
     db.session.delete(selecao)
+    registrar_alteracao(selecao.competicao_id)
     db.session.commit()
     return True, None
\ No newline at end of file
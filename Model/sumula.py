@@ -1,4 +1,9 @@
+from sqlalchemy import select, insert
 from config import db
+from Model.paginacao import paginar
+from Model.versao import registrar_alteracao
+from Model.resolvedor import resolver_ids
+from Model.carregamento import com_perfil, perfil
 from Model.partida import Partida
 from Model.jogador import Jogador
 
@@ -81,71 +86,209 @@ class CleanSheet(db.Model):
             "jogador": self.jogador.nome
         }
 
-def ListarSumulas():
-    return Sumula.query.all()
+def ListarSumulas(limite=None, apos=None):
+    return paginar(com_perfil(Sumula.query, "sumula"), Sumula.id, limite, apos).all()
+
+def IterarSumulas(apos=None, limite=None, tamanho_lote=500):
+    consulta = paginar(select(Sumula).options(*perfil("sumula")), Sumula.id, limite, apos)
+    for sumula in db.session.scalars(consulta.execution_options(yield_per=tamanho_lote)):
+        yield sumula.dici()
 
 def BuscarSumulaPorId(sumula_id):
-    return Sumula.query.get(sumula_id)
+    return db.session.get(Sumula, sumula_id, options=perfil("sumula"))
+
+def _ids_de_jogadores(dados):
+    ids = {dados.get("mvp_id")}
+    ids.update(dados.get("cleansheets", []))
+    for g in dados.get("gols", []):
+        ids.update((g.get("jogador_id"), g.get("assistencia_id")))
+    for c in dados.get("cartoes", []):
+        ids.add(c.get("jogador_id"))
+    return ids
 
 def CriarSumula(dados):
-    partida = Partida.query.get(dados.get("partida_id"))
+    partida = db.session.get(Partida, dados.get("partida_id"))
     if not partida:
         return None, "Partida não encontrada"
 
     if hasattr(partida, "sumula") and partida.sumula:
         return None, "Súmula já registrada para esta partida"
 
+    jogadores, faltando = resolver_ids(Jogador, _ids_de_jogadores(dados))
+    if faltando:
+        return None, f"Jogador {min(faltando)} não encontrado"
+
     sumula = Sumula(partida_id=partida.id)
 
     mvp_id = dados.get("mvp_id")
     if mvp_id:
-        sumula.mvp = Jogador.query.get(mvp_id)
+        sumula.mvp = jogadores.get(mvp_id)
 
     for g in dados.get("gols", []):
-        jogador = Jogador.query.get(g.get("jogador_id"))
+        jogador = jogadores.get(g.get("jogador_id"))
         if not jogador:
             continue
         gol = Gol(
             jogador=jogador,
-            assistencia=Jogador.query.get(g.get("assistencia_id")) if g.get("assistencia_id") else None,
+            assistencia=jogadores.get(g.get("assistencia_id")),
             contra=g.get("contra", False)
         )
         sumula.gols.append(gol)
 
     for id_jogador in dados.get("cleansheets", []):
-        jogador = Jogador.query.get(id_jogador)
+        jogador = jogadores.get(id_jogador)
         if jogador:
             cs = CleanSheet(jogador=jogador)
             sumula.cleansheets.append(cs)
 
     for c in dados.get("cartoes", []):
-        jogador = Jogador.query.get(c.get("jogador_id"))
+        jogador = jogadores.get(c.get("jogador_id"))
         if not jogador:
             continue
         cartao = Cartao(jogador=jogador, tipo=c.get("tipo", "amarelo"))
         sumula.cartoes.append(cartao)
 
     db.session.add(sumula)
+    db.session.flush()
+
+    from Model.estatisticas import atualizar_estatisticas, eventos_da_sumula
+    atualizar_estatisticas(adicionados=eventos_da_sumula(sumula))
+
+    registrar_alteracao(partida.competicao_id)
     db.session.commit()
     return sumula, None
 
+def _eventos_dos_dados(item, jogadores_validos):
+    eventos = []
+    for g in item.get("gols", []):
+        if g.get("jogador_id") not in jogadores_validos:
+            continue
+        eventos.append((g["jogador_id"], "gols_contra" if g.get("contra") else "gols"))
+        if g.get("assistencia_id") in jogadores_validos:
+            eventos.append((g["assistencia_id"], "assistencias"))
+    for id_jogador in item.get("cleansheets", []):
+        if id_jogador in jogadores_validos:
+            eventos.append((id_jogador, "cleansheets"))
+    for c in item.get("cartoes", []):
+        if c.get("jogador_id") not in jogadores_validos:
+            continue
+        tipo = c.get("tipo", "amarelo")
+        if tipo in ("amarelo", "vermelho"):
+            eventos.append((c["jogador_id"], "cartoes_amarelos" if tipo == "amarelo" else "cartoes_vermelhos"))
+    if item.get("mvp_id") in jogadores_validos:
+        eventos.append((item["mvp_id"], "mvps"))
+    return eventos
+
+def CriarSumulasEmLote(itens):
+    if not isinstance(itens, list) or not itens:
+        return None, "Informe uma lista de súmulas"
+
+    partida_ids = {item.get("partida_id") for item in itens if isinstance(item, dict)}
+    partidas, _ = resolver_ids(Partida, partida_ids)
+    com_sumula = set(db.session.execute(
+        select(Sumula.partida_id).where(Sumula.partida_id.in_(list(partida_ids)))
+    ).scalars())
+
+    jogador_ids = set()
+    for item in itens:
+        if isinstance(item, dict):
+            jogador_ids |= _ids_de_jogadores(item)
+    jogadores, jogadores_faltando = resolver_ids(Jogador, jogador_ids)
+    jogadores_validos = set(jogadores)
+
+    aceitos = []
+    erros = []
+    for indice, item in enumerate(itens):
+        if not isinstance(item, dict):
+            erros.append({"indice": indice, "mensagem": "Súmula inválida"})
+            continue
+        partida_id = item.get("partida_id")
+        if partida_id not in partidas:
+            erros.append({"indice": indice, "mensagem": "Partida não encontrada"})
+            continue
+        if partida_id in com_sumula:
+            erros.append({"indice": indice, "mensagem": "Súmula já registrada para esta partida"})
+            continue
+        faltando = _ids_de_jogadores(item) & jogadores_faltando
+        if faltando:
+            erros.append({"indice": indice, "mensagem": f"Jogador {min(faltando)} não encontrado"})
+            continue
+        com_sumula.add(partida_id)
+        aceitos.append((indice, item))
+
+    if not aceitos:
+        return {"criadas": [], "erros": erros}, None
+
+    linhas = db.session.execute(
+        insert(Sumula).returning(Sumula.id, sort_by_parameter_order=True),
+        [
+            {
+                "partida_id": item["partida_id"],
+                "mvp_id": item.get("mvp_id") if item.get("mvp_id") in jogadores_validos else None
+            }
+            for _, item in aceitos
+        ]
+    ).scalars().all()
+
+    gols, cleansheets, cartoes, eventos = [], [], [], []
+    for sumula_id, (_, item) in zip(linhas, aceitos):
+        for g in item.get("gols", []):
+            if g.get("jogador_id") not in jogadores_validos:
+                continue
+            gols.append({
+                "sumula_id": sumula_id,
+                "jogador_id": g["jogador_id"],
+                "assistencia_id": g.get("assistencia_id") if g.get("assistencia_id") in jogadores_validos else None,
+                "contra": bool(g.get("contra"))
+            })
+        for id_jogador in item.get("cleansheets", []):
+            if id_jogador in jogadores_validos:
+                cleansheets.append({"sumula_id": sumula_id, "jogador_id": id_jogador})
+        for c in item.get("cartoes", []):
+            if c.get("jogador_id") in jogadores_validos:
+                cartoes.append({"sumula_id": sumula_id, "jogador_id": c["jogador_id"], "tipo": c.get("tipo", "amarelo")})
+        eventos.extend(_eventos_dos_dados(item, jogadores_validos))
+
+    for modelo, registros in ((Gol, gols), (CleanSheet, cleansheets), (Cartao, cartoes)):
+        if registros:
+            db.session.execute(insert(modelo), registros)
+
+    from Model.estatisticas import atualizar_estatisticas
+    atualizar_estatisticas(adicionados=eventos)
+
+    registrar_alteracao(*{partidas[item["partida_id"]].competicao_id for _, item in aceitos})
+    db.session.commit()
+
+    criadas = [
+        {"indice": indice, "id": sumula_id, "partida_id": item["partida_id"]}
+        for sumula_id, (indice, item) in zip(linhas, aceitos)
+    ]
+    return {"criadas": criadas, "erros": erros}, None
+
 def AtualizarSumula(sumula_id, dados):
-    sumula = Sumula.query.get(sumula_id)
+    sumula = db.session.get(Sumula, sumula_id)
     if not sumula:
         return None, "Súmula não encontrada"
 
+    jogadores, faltando = resolver_ids(Jogador, _ids_de_jogadores(dados))
+    if faltando:
+        return None, f"Jogador {min(faltando)} não encontrado"
+
+    from Model.estatisticas import atualizar_estatisticas, eventos_da_sumula
+    eventos_anteriores = eventos_da_sumula(sumula)
+
     if "mvp_id" in dados:
-        sumula.mvp = Jogador.query.get(dados["mvp_id"])
+        sumula.mvp = jogadores.get(dados["mvp_id"])
 
     if "gols" in dados:
         sumula.gols = []
         for g in dados["gols"]:
-            jogador = Jogador.query.get(g.get("jogador_id"))
+            jogador = jogadores.get(g.get("jogador_id"))
             if not jogador:
                 continue
             gol = Gol(
                 jogador=jogador,
-                assistencia=Jogador.query.get(g.get("assistencia_id")) if g.get("assistencia_id") else None,
+                assistencia=jogadores.get(g.get("assistencia_id")),
                 contra=g.get("contra", False)
             )
             sumula.gols.append(gol)
@@ -153,7 +296,7 @@ def AtualizarSumula(sumula_id, dados):
     if "cleansheets" in dados:
         sumula.cleansheets = []
         for id_jogador in dados["cleansheets"]:
-            jogador = Jogador.query.get(id_jogador)
+            jogador = jogadores.get(id_jogador)
             if jogador:
                 cs = CleanSheet(jogador=jogador)
                 sumula.cleansheets.append(cs)
@@ -161,19 +304,28 @@ def AtualizarSumula(sumula_id, dados):
     if "cartoes" in dados:
         sumula.cartoes = []
         for c in dados["cartoes"]:
-            jogador = Jogador.query.get(c.get("jogador_id"))
+            jogador = jogadores.get(c.get("jogador_id"))
             if not jogador:
                 continue
             cartao = Cartao(jogador=jogador, tipo=c.get("tipo", "amarelo"))
             sumula.cartoes.append(cartao)
 
+    db.session.flush()
+    atualizar_estatisticas(removidos=eventos_anteriores, adicionados=eventos_da_sumula(sumula))
+
+    registrar_alteracao(sumula.partida.competicao_id)
     db.session.commit()
     return sumula, None
 
 def DeletarSumula(sumula_id):
-    sumula = Sumula.query.get(sumula_id)
+    sumula = db.session.get(Sumula, sumula_id)
     if not sumula:
         return False, "Súmula não encontrada"
+
+    from Model.estatisticas import atualizar_estatisticas, eventos_da_sumula
+    atualizar_estatisticas(removidos=eventos_da_sumula(sumula))
+
     db.session.delete(sumula)
+    registrar_alteracao(sumula.partida.competicao_id)
     db.session.commit()
     return True, None
\ No newline at end of file
@@ -0,0 +1,125 @@
+from sqlalchemy import select, insert
+from config import db
+from Model.versao import registrar_alteracao
+
+TURNOS_VALIDOS = (1, 2)
+
+def confrontos_round_robin(times, turnos=1):
+    # Método do círculo: o primeiro time fica fixo e os demais giram uma
+    # posição por rodada. Com número ímpar de times, None ocupa a posição
+    # fixa e marca a folga. O mando alterna pela posição do confronto (e pela
+    # paridade da rodada no confronto fixo), deixando cada time com no
+    # máximo um mando de diferença e sem sequências maiores que duas.
+    # O returno começa pelo espelho da segunda rodada e termina com o da
+    # primeira: espelhado na mesma ordem, o fim do turno emendaria com o
+    # começo do returno em sequências de três mandos.
+    times = list(times)
+    if len(times) % 2:
+        times.insert(0, None)
+    n = len(times)
+
+    rodadas = []
+    for r in range(n - 1):
+        confrontos = []
+        for i in range(n // 2):
+            casa, fora = times[i], times[n - 1 - i]
+            if (i == 0 and r % 2) or (i > 0 and i % 2):
+                casa, fora = fora, casa
+            if casa is not None and fora is not None:
+                confrontos.append((casa, fora))
+        rodadas.append(confrontos)
+        times = [times[0], times[-1]] + times[1:-1]
+
+    if turnos == 2:
+        espelho = [[(fora, casa) for casa, fora in confrontos] for confrontos in rodadas]
+        rodadas += espelho[1:] + espelho[:1]
+    return rodadas
+
+def _alvo_da_tabela(dados):
+    from Model.grupo import Grupo
+    from Model.liga import Liga
+    from Model.partida import Partida
+    from Model.time import Time
+
+    grupo_id = dados.get("grupo_id")
+    liga_id = dados.get("liga_id")
+    if bool(grupo_id) == bool(liga_id):
+        return None, "Informe grupo_id ou liga_id"
+
+    if grupo_id:
+        grupo = db.session.get(Grupo, grupo_id)
+        if not grupo:
+            return None, "Grupo não encontrado"
+        competicao_id = grupo.liga_id
+        filtro_times = Time.grupo_id == grupo_id
+        filtro_partidas = Partida.grupo_id == grupo_id
+    else:
+        liga = db.session.get(Liga, liga_id)
+        if not liga:
+            return None, "Liga não encontrada"
+        if liga.usar_grupos and liga.grupos:
+            return None, "A liga usa grupos; gere a tabela de cada grupo"
+        competicao_id = liga.id
+        filtro_times = Time.competicao_id == liga.id
+        filtro_partidas = Partida.competicao_id == liga.id
+
+    times = db.session.execute(
+        select(Time.id).where(filtro_times).order_by(Time.id)
+    ).scalars().all()
+    if len(times) < 2:
+        return None, "São necessários pelo menos dois times"
+
+    existe = db.session.execute(select(Partida.id).where(filtro_partidas).limit(1)).first()
+    if existe:
+        return None, "Já existem partidas cadastradas para esse grupo ou liga"
+
+    return (competicao_id, grupo_id, times), None
+
+def GerarTabela(dados):
+    from Model.partida import Partida
+
+    turnos = dados.get("turnos", 1)
+    if turnos not in TURNOS_VALIDOS:
+        return None, "Turnos deve ser 1 ou 2"
+
+    prefixo = dados.get("prefixo_rodada", "R")
+    primeira = dados.get("rodada_inicial", 1)
+    if not isinstance(prefixo, str):
+        return None, "Prefixo da rodada deve ser um texto"
+    if not isinstance(primeira, int) or isinstance(primeira, bool) or primeira < 0:
+        return None, "Rodada inicial deve ser um número inteiro não negativo"
+
+    alvo, erro = _alvo_da_tabela(dados)
+    if erro:
+        return None, erro
+    competicao_id, grupo_id, times = alvo
+
+    rodadas = confrontos_round_robin(times, turnos)
+    if len(f"{prefixo}{primeira + len(rodadas) - 1}") > Partida.rodada.type.length:
+        return None, "Prefixo da rodada muito longo"
+
+    partidas = [
+        {
+            "competicao_id": competicao_id,
+            "grupo_id": grupo_id,
+            "rodada": f"{prefixo}{primeira + numero}",
+            "time_casa_id": casa,
+            "time_fora_id": fora
+        }
+        for numero, confrontos in enumerate(rodadas)
+        for casa, fora in confrontos
+    ]
+
+    # partidas sem placar não alteram a classificação
+    db.session.execute(insert(Partida), partidas)
+    registrar_alteracao(competicao_id)
+    db.session.commit()
+
+    return {
+        "competicao_id": competicao_id,
+        "grupo_id": grupo_id,
+        "turnos": turnos,
+        "times": len(times),
+        "rodadas": len(rodadas),
+        "partidas": len(partidas)
+    }, None
@@ -1,9 +1,14 @@
 from flask import request
+from sqlalchemy import select, insert, delete, tuple_
 from Model.jogador_time import jogador_time
 from Model.competicao import Competicao
 from Model.grupo import Grupo
 from Model.liga import Liga
 from config import db
+from Model.paginacao import paginar
+from Model.versao import registrar_alteracao
+from Model.carregamento import com_perfil, perfil
+from Model.resolvedor import resolver_ids
 
 class Time (db.Model):
     __tablename__ = "time"
@@ -17,6 +22,7 @@ class Time (db.Model):
     competicao = db.relationship("Competicao", backref="times")
     grupo = db.relationship("Grupo", back_populates="times")
     jogadores = db.relationship("Jogador", secondary=jogador_time, back_populates="times")
+    classificacao = db.relationship("ClassificacaoGrupo", cascade="all, delete-orphan")
 
     def __init__(self, nome, logo=None, competicao=None, grupo=None):
         self.nome = nome
@@ -55,11 +61,11 @@ class Time (db.Model):
             "jogadores": [j.nome for j in self.jogadores]
         }
     
-def ListarTimes():
-    return Time.query.all()
+def ListarTimes(limite=None, apos=None):
+    return paginar(com_perfil(Time.query, "time"), Time.id, limite, apos).all()
 
 def ListarTimePorId(idTime):
-    return Time.query.get(idTime)
+    return db.session.get(Time, idTime, options=perfil("time"))
 
 def CriarTime(dados):
     nome = dados.get("nome")
@@ -75,7 +81,7 @@ def CriarTime(dados):
     novoTime = Time(nome=nome, logo=logo)
 
     if competicao_id:
-        competicao = Competicao.query.get(competicao_id)
+        competicao = db.session.get(Competicao, competicao_id)
         if not competicao:
             return None, "Competição não encontrada"
         novoTime.competicao = competicao
@@ -87,14 +93,17 @@ def CriarTime(dados):
             novoTime.grupo = grupo
 
     db.session.add(novoTime)
+    registrar_alteracao(novoTime.competicao.id if novoTime.competicao else None)
     db.session.commit()
     return novoTime, None
 
 def AtualizarTime(idTime, dados):
-    time = Time.query.get(idTime)
+    time = db.session.get(Time, idTime)
     if not time:
         return None, "Time não encontrado"
 
+    competicao_anterior = time.competicao_id
+
     if 'nome' in dados:
         nome = dados['nome']
         if nome and nome != time.nome:
@@ -106,7 +115,7 @@ def AtualizarTime(idTime, dados):
         time.logo = dados['logo']
 
     if 'competicao_id' in dados:
-        competicao = Competicao.query.get(dados['competicao_id'])
+        competicao = db.session.get(Competicao, dados['competicao_id'])
         if not competicao:
             return None, "Competição não encontrada"
         
@@ -119,21 +128,117 @@ def AtualizarTime(idTime, dados):
             return None, "Grupo não encontrado ou não pertence à liga"
         time.grupo = grupo
     
+    registrar_alteracao(competicao_anterior, time.competicao.id if time.competicao else None)
     db.session.commit()
     return time, None
 
 def DeletarTime(idTime):
-    time = Time.query.get(idTime)
+    time = db.session.get(Time, idTime)
     if not time:
         return False, "Time não encontrado"
 
     db.session.delete(time)
+    registrar_alteracao(time.competicao_id)
     db.session.commit()
     return True, None
 
-def AdicionarJogadoresAoTime(id_time, dados):
+def _vinculos_existentes(pares):
+    if not pares:
+        return set()
+    consulta = select(jogador_time.c.jogador_id, jogador_time.c.time_id).where(
+        tuple_(jogador_time.c.jogador_id, jogador_time.c.time_id).in_(list(pares))
+    )
+    return set(db.session.execute(consulta).tuples())
+
+def _inserir_vinculos(pares):
+    if not pares:
+        return
+
+    dialeto = db.session.get_bind().dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+        comando = insert_dialeto(jogador_time).on_conflict_do_nothing()
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+        comando = insert_dialeto(jogador_time).on_conflict_do_nothing()
+    else:
+        pares = set(pares) - _vinculos_existentes(pares)
+        comando = insert(jogador_time)
+
+    if pares:
+        db.session.execute(comando, [{"jogador_id": j, "time_id": t} for j, t in pares])
+
+def _remover_vinculos(pares):
+    if not pares:
+        return
+    db.session.execute(
+        delete(jogador_time).where(
+            tuple_(jogador_time.c.jogador_id, jogador_time.c.time_id).in_(list(pares))
+        )
+    )
+
+def _jogadores_validos(ids):
     from Model.jogador import Jogador
-    time = Time.query.get(id_time)
+    return set(resolver_ids(Jogador, ids)[0])
+
+def EditarElencos(operacoes, expandir=False):
+    if not isinstance(operacoes, list) or not operacoes:
+        return None, "Informe uma lista de operações"
+
+    times, _ = resolver_ids(Time, [op.get("time_id") for op in operacoes if isinstance(op, dict)])
+    jogador_ids = set()
+    for op in operacoes:
+        if isinstance(op, dict):
+            jogador_ids.update(op.get("adicionar", []))
+            jogador_ids.update(op.get("remover", []))
+    validos = _jogadores_validos(jogador_ids)
+
+    pedidos = []
+    erros = []
+    for indice, op in enumerate(operacoes):
+        if not isinstance(op, dict) or op.get("time_id") not in times:
+            erros.append({"indice": indice, "mensagem": "Time não encontrado"})
+            continue
+        time_id = op["time_id"]
+        adicionar = {(j, time_id) for j in op.get("adicionar", []) if j in validos}
+        remover = {(j, time_id) for j in op.get("remover", []) if j in validos}
+        ignorados = (set(op.get("adicionar", [])) | set(op.get("remover", []))) - validos
+        pedidos.append((indice, time_id, adicionar, remover, len(ignorados)))
+
+    envolvidos = set()
+    for _, _, adicionar, remover, _ in pedidos:
+        envolvidos |= adicionar | remover
+    existentes = _vinculos_existentes(envolvidos)
+
+    atual = set(existentes)
+    resultados = []
+    for indice, time_id, adicionar, remover, ignorados in pedidos:
+        removidos = remover & atual
+        atual -= removidos
+        adicionados = adicionar - atual
+        atual |= adicionados
+        resultados.append({
+            "indice": indice,
+            "time_id": time_id,
+            "removidos": len(removidos),
+            "adicionados": len(adicionados),
+            "ignorados": ignorados
+        })
+
+    _remover_vinculos(existentes - atual)
+    _inserir_vinculos(atual - existentes)
+
+    if resultados:
+        registrar_alteracao(*{times[r["time_id"]].competicao_id for r in resultados})
+        db.session.commit()
+
+    if expandir:
+        for r in resultados:
+            r["time"] = times[r["time_id"]].dici()
+    return {"times": resultados, "erros": erros}, None
+
+def AdicionarJogadoresAoTime(id_time, dados):
+    time = db.session.get(Time, id_time)
     if not time:
         return None, "Time não encontrado"
 
@@ -141,17 +246,14 @@ def AdicionarJogadoresAoTime(id_time, dados):
     if not jogador_ids:
         return None, "Lista de jogadores vazia"
 
-    for jogador_id in jogador_ids:
-        jogador = Jogador.query.get(jogador_id)
-        if jogador and jogador not in time.jogadores:
-            time.jogadores.append(jogador)
+    _inserir_vinculos({(j, time.id) for j in _jogadores_validos(jogador_ids)})
 
+    registrar_alteracao(time.competicao_id)
     db.session.commit()
     return time, None
 
 def RemoverJogadoresDoTime(id_time, dados):
-    from Model.jogador import Jogador
-    time = Time.query.get(id_time)
+    time = db.session.get(Time, id_time)
     if not time:
         return None, "Time não encontrado"
 
@@ -159,10 +261,8 @@ def RemoverJogadoresDoTime(id_time, dados):
     if not jogador_ids:
         return None, "Lista de jogadores vazia"
 
-    for jogador_id in jogador_ids:
-        jogador = Jogador.query.get(jogador_id)
-        if jogador and jogador in time.jogadores:
-            time.jogadores.remove(jogador)
+    _remover_vinculos({(j, time.id) for j in _jogadores_validos(jogador_ids)})
 
+    registrar_alteracao(time.competicao_id)
     db.session.commit()
-    return time, None
\ No newline at end of file
+    return time, None
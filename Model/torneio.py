@@ -1,6 +1,7 @@
 from flask import request
 from config import db
 from Model.competicao import Competicao
+from Model.chaveamento import ChaveConfronto
 
 class Torneio(Competicao):
     __tablename__ = "torneio"
@@ -12,7 +13,8 @@ class Torneio(Competicao):
         'polymorphic_identity': 'torneio'
     }
     
-    partidas = db.relationship("Partida", back_populates="competicao", overlaps="competicao")
+    partidas = db.relationship("Partida", back_populates="competicao", overlaps="competicao", order_by="[Partida.rodada, Partida.id]")
+    chave = db.relationship("ChaveConfronto", cascade="all, delete-orphan")
 
     def __init__(self, nome, fase_atual='inscricoes'):
         super().__init__(nome=nome, tipo='torneio')
@@ -28,5 +30,5 @@ class Torneio(Competicao):
             "tipo": "torneio",
             "fase_atual": self.fase_atual,
             "times": [time.nome for time in self.times],
-            "partidas": [p.dici() for p in sorted(self.partidas, key=lambda p: p.rodada)]
+            "partidas": [p.dici() for p in self.partidas]
         }
\ No newline at end of file
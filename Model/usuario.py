@@ -1,6 +1,24 @@
+from functools import lru_cache
+from flask import current_app
+from sqlalchemy import select
 from config import db
 from werkzeug.security import generate_password_hash, check_password_hash
 
+def _metodo_hash():
+    return current_app.config.get("SENHA_METODO_HASH", "scrypt")
+
+@lru_cache(maxsize=None)
+def _prefixo_do_metodo(metodo):
+    # "scrypt" vira "scrypt:32768:8:1"; calculado uma vez por método
+    return generate_password_hash("", method=metodo).split("$", 1)[0]
+
+def gerar_hash_senha(senha):
+    return generate_password_hash(senha, method=_metodo_hash())
+
+def _senha_vazia_legada(senha_hash):
+    # usuários antigos sem senha guardavam o hash de ""
+    return check_password_hash(senha_hash, "")
+
 class Usuario(db.Model):
     __tablename__ = "usuarios"
 
@@ -9,11 +27,19 @@ class Usuario(db.Model):
     senha_hash = db.Column(db.Text, nullable=False)
     papel = db.Column(db.String(20), nullable=False)  # 'admin' ou 'editor'
 
+    @property
+    def senha_definida(self):
+        # senha_hash vazio indica usuário criado sem senha
+        return bool(self.senha_hash)
+
     def verificar_senha(self, senha):
-        if not self.senha_hash or check_password_hash(self.senha_hash, ""):
+        if not self.senha_definida or not senha:
             return False
         return check_password_hash(self.senha_hash, senha)
 
+    def precisa_rehash(self):
+        return self.senha_definida and self.senha_hash.split("$", 1)[0] != _prefixo_do_metodo(_metodo_hash())
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -26,7 +52,7 @@ def criar_usuario(username, senha, papel):
         return None, "Usuário já existe"
     novo = Usuario(
         username=username,
-        senha_hash=generate_password_hash(senha),
+        senha_hash=gerar_hash_senha(senha),
         papel=papel
     )
     db.session.add(novo)
@@ -36,10 +62,9 @@ def criar_usuario(username, senha, papel):
 def criar_editor_sem_senha(username):
     if Usuario.query.filter_by(username=username).first():
         return None, "Usuário já existe"
-    senha_vazia_hash = generate_password_hash("") 
     novo = Usuario(
         username=username,
-        senha_hash=senha_vazia_hash,
+        senha_hash="",
         papel="editor"
     )
     db.session.add(novo)
@@ -50,15 +75,25 @@ def definir_senha(username, nova_senha):
     usuario = Usuario.query.filter_by(username=username).first()
     if not usuario:
         return None, "Usuário não encontrado"
-    if not usuario.senha_hash or not check_password_hash(usuario.senha_hash, ""):
+    if usuario.senha_definida and not _senha_vazia_legada(usuario.senha_hash):
         return None, "Senha já foi definida"
+    if not nova_senha:
+        return None, "A senha não pode ser vazia"
     
-    usuario.senha_hash = generate_password_hash(nova_senha)
+    usuario.senha_hash = gerar_hash_senha(nova_senha)
     db.session.commit()
     return usuario, None
 
 def autenticar_usuario(username, senha):
     user = Usuario.query.filter_by(username=username).first()
     if user and user.verificar_senha(senha):
+        if user.precisa_rehash():
+            user.senha_hash = gerar_hash_senha(senha)
+            db.session.commit()
         return user
-    return None
\ No newline at end of file
+    return None
+
+def papeis_dos_usuarios():
+    return dict(db.session.execute(select(Usuario.id, Usuario.papel)).tuples().all())
+def papel_do_usuario(usuario_id):
+    return db.session.execute(select(Usuario.papel).where(Usuario.id == usuario_id)).scalar()
@@ -0,0 +1,54 @@
+from sqlalchemy import select, insert, update, func
+from config import db
+
+VERSAO_CADASTROS = -1
+
+class VersaoDados(db.Model):
+    __tablename__ = "versao_dados"
+
+    # uma linha por competição; -1 muda em escritas que não pertencem a uma competição.
+    # A versão global é a soma de todas as linhas, para que escritas em competições
+    # diferentes não disputem o lock de uma mesma linha
+    competicao_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    versao = db.Column(db.Integer, nullable=False, default=0)
+
+def _garantir_linhas(chaves):
+    dialeto = db.session.get_bind().dialect.name
+    if dialeto == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as insert_dialeto
+        comando = insert_dialeto(VersaoDados).on_conflict_do_nothing()
+    elif dialeto == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as insert_dialeto
+        comando = insert_dialeto(VersaoDados).on_conflict_do_nothing()
+    else:
+        existentes = set(db.session.execute(
+            select(VersaoDados.competicao_id).where(VersaoDados.competicao_id.in_(chaves))
+        ).scalars())
+        chaves = {c for c in chaves if c not in existentes}
+        comando = insert(VersaoDados)
+
+    if chaves:
+        db.session.execute(comando, [{"competicao_id": c} for c in chaves])
+
+def registrar_alteracao(*competicao_ids):
+    chaves = {c for c in competicao_ids if c} or {VERSAO_CADASTROS}
+
+    # duas primeiras escritas simultâneas numa competição não podem falhar por
+    # chave duplicada, senão a escrita do usuário é desfeita junto
+    _garantir_linhas(chaves)
+    db.session.execute(
+        update(VersaoDados)
+        .where(VersaoDados.competicao_id.in_(chaves))
+        .values(versao=VersaoDados.versao + 1)
+    )
+
+def obter_versao(competicao_id=None):
+    if competicao_id is None:
+        total = db.session.execute(select(func.coalesce(func.sum(VersaoDados.versao), 0))).scalar()
+        return str(total)
+
+    chaves = [competicao_id, VERSAO_CADASTROS]
+    versoes = dict(db.session.execute(
+        select(VersaoDados.competicao_id, VersaoDados.versao).where(VersaoDados.competicao_id.in_(chaves))
+    ).tuples().all())
+    return ".".join(str(versoes.get(c, 0)) for c in chaves)
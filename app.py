@@ -8,6 +8,7 @@ from Controller.partida import Partida_Blueprint
 from Controller.time import Time_Blueprint
 from Controller.competicao import Competicao_Blueprint
 from Controller.grupo import Grupo_Blueprint
+from Controller.comandos import Estatisticas_CLI, Classificacao_CLI, Importacao_CLI, Backup_CLI
 from swagger.swagger_config import configure_swagger
 
 app = Flask(__name__)
@@ -16,6 +17,7 @@ CORS(app,
          r"/*": {
              "origins": ["http://localhost:3000", "https://talkfhf.vercel.app"],
              "supports_credentials": True,
+             "expose_headers": ["ETag", "X-Next-Cursor"],
              "always_send": True
          }
      })
@@ -53,6 +55,10 @@ app.register_blueprint(Partida_Blueprint, url_prefix="/partida")
 app.register_blueprint(Time_Blueprint, url_prefix="/time")
 app.register_blueprint(Competicao_Blueprint, url_prefix="/competicao")
 app.register_blueprint(Grupo_Blueprint, url_prefix="/grupo")
+app.cli.add_command(Estatisticas_CLI)
+app.cli.add_command(Classificacao_CLI)
+app.cli.add_command(Importacao_CLI)
+app.cli.add_command(Backup_CLI)
 
 with app.app_context():
     db.create_all()
@@ -14,4 +14,14 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
-    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
\ No newline at end of file
+    JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+    # intervalo de recarga dos papéis usados para invalidar tokens de usuários removidos ou rebaixados
+    PAPEIS_TTL_SEGUNDOS = int(os.getenv("PAPEIS_TTL_SEGUNDOS", 60))
+    # método do werkzeug para novos hashes, ex.: 'scrypt', 'scrypt:16384:8:1', 'pbkdf2:sha256:600000';
+    # hashes antigos com outro método são refeitos no próximo login
+    SENHA_METODO_HASH = os.getenv("SENHA_METODO_HASH", "scrypt")
+
+    # 'persistida', 'sql' ou 'partidas'
+    CLASSIFICACAO_MODO = os.getenv("CLASSIFICACAO_MODO", "persistida")
+
+    CACHE_RESPOSTAS_BYTES = int(os.getenv("CACHE_RESPOSTAS_BYTES", 64 * 1024 * 1024))
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""Mede POST /auth/login (req/s) com o test client do Flask sobre um SQLite temporário.
+
+Uso, a partir da raiz do repositório:
+
+    python scripts/benchmark_login.py --requisicoes 40
+
+Para comparar versões, rode o script em cada commit.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+def medir(cliente, senha, status, requisicoes):
+    inicio = time.perf_counter()
+    for _ in range(requisicoes):
+        resposta = cliente.post("/auth/login", json={"username": "benchmark", "senha": senha})
+        assert resposta.status_code == status, resposta.get_data(as_text=True)
+    return requisicoes / (time.perf_counter() - inicio)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requisicoes", type=int, default=40, help="Logins sequenciais por cenário")
+    parser.add_argument("--metodo", help="Sobrescreve SENHA_METODO_HASH, ex.: 'pbkdf2:sha256:600000'")
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="benchmark_login_")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(pasta, "benchmark.db")
+    os.environ.setdefault("JWT_SECRET_KEY", "chave-do-benchmark-com-tamanho-suficiente")
+    if args.metodo:
+        os.environ["SENHA_METODO_HASH"] = args.metodo
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from app import app
+    from Model.usuario import criar_usuario
+
+    with app.app_context():
+        _, erro = criar_usuario("benchmark", "senha-do-benchmark", "admin")
+        if erro:
+            sys.exit(erro)
+
+    cliente = app.test_client()
+    # aquecimento: primeira conexão, compilação das consultas
+    medir(cliente, "senha-do-benchmark", 200, 2)
+
+    print(f"método: {app.config.get('SENHA_METODO_HASH', 'padrão do werkzeug')}, {args.requisicoes} requisições por cenário")
+    print(f"login ok:    {medir(cliente, 'senha-do-benchmark', 200, args.requisicoes):.1f} req/s")
+    print(f"login falho: {medir(cliente, 'senha-errada', 401, args.requisicoes):.1f} req/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import io
+from flask import request
+from flask_restx import Namespace, Resource, fields
+from Controller.decorators import admin_required
+from Controller.cache import cache
+from Model.importacao import ImportarRegistros
+
+admin_ns = Namespace("Administração", description="Operações administrativas")
+
+cache_model = admin_ns.model("CacheEstatisticas", {
+    "itens": fields.Integer(description="Respostas armazenadas", example=12),
+    "bytes": fields.Integer(description="Memória ocupada pelas respostas", example=48213),
+    "acertos": fields.Integer(description="Requisições atendidas pelo cache", example=340),
+    "falhas": fields.Integer(description="Requisições que recalcularam a resposta", example=25),
+    "descartes": fields.Integer(description="Respostas removidas por falta de espaço", example=0)
+})
+
+@admin_ns.route('/cache')
+class CacheResource(Resource):
+    @admin_ns.marshal_with(cache_model)
+    @admin_required
+    def get(self):
+        """Mostra o uso do cache de respostas"""
+        return cache.estatisticas()
+
+    @admin_ns.response(200, "Cache esvaziado")
+    @admin_required
+    def delete(self):
+        """Esvazia o cache de respostas"""
+        cache.limpar()
+        return {"mensagem": "Cache esvaziado"}, 200
+
+
+importacao_model = admin_ns.model("ImportacaoResultado", {
+    "tipo": fields.String(example="jogadores"),
+    "simulacao": fields.Boolean(description="Se nada foi gravado", example=False),
+    "linhas": fields.Integer(description="Registros lidos do arquivo", example=120),
+    "validas": fields.Integer(description="Registros sem erro de validação", example=118),
+    "importadas": fields.Integer(description="Registros gravados", example=118),
+    "erros": fields.List(fields.Raw(example={"linha": 7, "mensagem": "Time 'Vasco' não encontrado"}))
+})
+
+@admin_ns.route('/importar/<string:tipo>')
+class ImportacaoResource(Resource):
+    @admin_ns.response(200, "Importação concluída", importacao_model)
+    @admin_ns.response(400, "Arquivo ou tipo inválido")
+    @admin_required
+    def post(self, tipo):
+        """Importa jogadores, times ou partidas de um arquivo CSV ou JSON"""
+        simular = request.args.get("simular", "false").lower() in ("1", "true", "sim")
+        enviado = request.files.get("arquivo")
+        formato = request.args.get("formato")
+        if enviado is not None:
+            formato = formato or enviado.filename.rsplit(".", 1)[-1].lower()
+            arquivo = io.TextIOWrapper(enviado.stream, encoding="utf-8-sig")
+        else:
+            formato = formato or ("json" if request.mimetype == "application/json" else "csv")
+            arquivo = io.TextIOWrapper(request.stream, encoding="utf-8-sig")
+        if formato == "jsonl":
+            formato = "json"
+
+        resultado, erro = ImportarRegistros(tipo, arquivo, formato, simular)
+        if erro:
+            return {"mensagem": erro}, 400
+        return resultado, 200
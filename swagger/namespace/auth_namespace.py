@@ -2,6 +2,7 @@ from flask_restx import Namespace, Resource, fields
 from flask import request
 from flask_jwt_extended import create_access_token, get_jwt_identity
 from datetime import timedelta
+from config import db
 from Controller.decorators import admin_required, editor_ou_admin
 from Model.usuario import ( Usuario, criar_usuario, criar_editor_sem_senha, autenticar_usuario, definir_senha)
 
@@ -77,7 +78,11 @@ class Login(Resource):
         usuario = autenticar_usuario(dados['username'], dados['senha'])
         if not usuario:
             return {"mensagem": "Usuário ou senha inválidos"}, 401
-        token = create_access_token(identity=str(usuario.id), expires_delta=timedelta(hours=12))
+        token = create_access_token(
+            identity=str(usuario.id),
+            additional_claims={"papel": usuario.papel},
+            expires_delta=timedelta(hours=12)
+        )
         return {"access_token": token, "papel": usuario.papel}, 200
 
 @api.route("/listar")
@@ -96,5 +101,5 @@ class UsuarioAtual(Resource):
     def get(self):
         """Ver dados do usuário logado"""
         user_id = get_jwt_identity()
-        usuario = Usuario.query.get(user_id)
+        usuario = db.session.get(Usuario, user_id)
         return usuario.to_dict()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from flask_restx import Namespace, Resource, fields
 from Controller.decorators import editor_ou_admin
+from Controller.cache import cache_resposta, etag_versionado
 from Model.competicao import ListarCompeticoes, ListarCompeticaoPorId, CriarCompeticao, AtualizarCompeticao, DeletarCompeticao
 
 competicao_ns = Namespace("Competição", description="Operações relacionadas às competições")
@@ -21,6 +22,8 @@ erro_model = competicao_ns.model("Erro", {
 
 @competicao_ns.route('/view')
 class CompeticaoViewResource(Resource):
+    @etag_versionado()
+    @cache_resposta()
     @competicao_ns.marshal_list_with(competicao_output_model)
     def get(self):
         """Lista todas as competições"""
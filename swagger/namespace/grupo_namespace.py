@@ -1,6 +1,8 @@
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
 from Controller.decorators import editor_ou_admin
-from Model.grupo import (ListarGrupos, ListarGrupoPorId, CriarGrupo, AtualizarGrupo, DeletarGrupo, ObterClassificacaoPorGrupoId)
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.campos import ler_campos, filtrar_modelo
+from Model.grupo import (CAMPOS_GRUPO, ListarGrupos, ListarGrupoPorId, CriarGrupo, AtualizarGrupo, DeletarGrupo, ObterClassificacaoPorGrupoId)
 
 grupo_ns = Namespace("Grupo", description="Operações relacionadas aos grupos de competições")
 
@@ -41,15 +43,19 @@ erro_model = grupo_ns.model("Erro", {
 
 @grupo_ns.route('/view')
 class GrupoViewResource(Resource):
-    @grupo_ns.marshal_list_with(grupo_output_model)
+    @etag_versionado()
+    @cache_resposta()
+    @grupo_ns.response(200, "Lista de grupos", [grupo_output_model])
     def get(self):
         """Lista todos os grupos"""
-        grupos = ListarGrupos()
+        campos = ler_campos(CAMPOS_GRUPO)
+        modelo = filtrar_modelo(grupo_output_model, campos)
+        grupos = ListarGrupos(campos)
         
         if not grupos:
-            return {"message": "Nenhum grupo cadastrado"}, 200
+            return marshal({"message": "Nenhum grupo cadastrado"}, modelo), 200
             
-        return [g.dici() for g in grupos], 200
+        return marshal([g.dici(campos) for g in grupos], modelo), 200
 
 @grupo_ns.route('/')
 class GrupoResource(Resource):  
@@ -71,10 +77,11 @@ class GrupoIdResource(Resource):
     @grupo_ns.response(404, "Grupo não encontrado", erro_model)
     def get(self, id_grupo):
         """Obtém um grupo pelo ID"""
-        grupo = ListarGrupoPorId(id_grupo)
+        campos = ler_campos(CAMPOS_GRUPO)
+        grupo = ListarGrupoPorId(id_grupo, campos)
         if not grupo:
             return {"mensagem": "Grupo não encontrado"}, 404
-        return grupo.dici(), 200
+        return grupo.dici(campos), 200
 
     @grupo_ns.expect(grupo_model)
     @grupo_ns.response(200, "Grupo atualizado com sucesso", grupo_output_model)
@@ -100,6 +107,8 @@ class GrupoIdResource(Resource):
     
 @grupo_ns.route('/<int:id_grupo>/classificacao')
 class GrupoClassificacaoResource(Resource):
+    @etag_versionado()
+    @cache_resposta()
     def get(self, id_grupo):
         """Obtém a classificação atual do grupo"""
         classificacao, erro = ObterClassificacaoPorGrupoId(id_grupo)
@@ -1,7 +1,12 @@
 from flask import request
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
 from Controller.decorators import editor_ou_admin
-from Model.jogador import Jogador, ListarJogadores, ListarJogadorPorNome, CriarJogador, AtualizarJogador, DeletarJogador
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
+from Controller.fluxo import em_fluxo
+from Controller.campos import ler_campos, filtrar_modelo
+from Model.jogador import Jogador, CAMPOS_JOGADOR, ListarJogadoresResumidos, ListarJogadoresComEstatisticas, IterarJogadoresComEstatisticas, ListarJogadorPorNome, CriarJogador, AtualizarJogador, DeletarJogador
+from Model.estatisticas import CAMPOS_ESTATISTICAS, RankingGeral, RankingPorCompeticao, ListarEstatisticasPorCompeticao
 
 jogador_ns = Namespace("Jogador", description="Operações relacionadas aos jogadores")
 
@@ -45,60 +50,41 @@ erro_model = jogador_ns.model("Erro", {
     
 @jogador_ns.route('/view')
 class JogadorLeveResource(Resource):
+    @etag_versionado()
+    @cache_resposta()
     def get(self):
         """Lista jogadores sem estatísticas"""
-        jogadores = Jogador.query.all()
-        return [
-            {
-                "id": j.id,
-                "nome": j.nome,
-                "posicao": j.posicao,
-                "nacionalidade": j.nacionalidade,
-                "times": [
-                    {
-                        "id": t.id,
-                        "nome": t.nome,
-                        "competicao": {
-                            "id": t.competicao.id,
-                            "nome": t.competicao.nome
-                        } if t.competicao else None
-                    }
-                    for t in j.times
-                ]
-            }
-            for j in jogadores
-        ], 200
+        limite, apos = ler_paginacao()
+        jogadores = ListarJogadoresResumidos(limite, apos)
+        return jogadores, 200, cabecalhos_paginacao(jogadores, limite)
     
 @jogador_ns.route('/geral')
 class JogadorViewResource(Resource):
-    @jogador_ns.marshal_list_with(jogador_output_model)
+    @etag_versionado()
+    @cache_resposta()
+    @em_fluxo(IterarJogadoresComEstatisticas, jogador_output_model, CAMPOS_JOGADOR, {"estatisticas": CAMPOS_ESTATISTICAS})
+    @jogador_ns.response(200, "Lista de jogadores", [jogador_output_model])
     def get(self):
         """Lista todos os jogadores e suas estatísticas"""
-        jogadores = ListarJogadores()
+        limite, apos = ler_paginacao()
+        campos = ler_campos(CAMPOS_JOGADOR, {"estatisticas": CAMPOS_ESTATISTICAS})
+        modelo = filtrar_modelo(jogador_output_model, campos)
+        jogadores = ListarJogadoresComEstatisticas(limite, apos, campos)
         
         if not jogadores:
-            return {"message": "Nenhum jogador cadastrado"}, 200
+            return marshal({"message": "Nenhum jogador cadastrado"}, modelo), 200
             
-        return [j.dici() for j in jogadores], 200
+        return marshal(jogadores, modelo), 200, cabecalhos_paginacao(jogadores, limite)
     
 @jogador_ns.route('/estatisticas/<int:competicao_id>')
 class EstatisticasPorCompeticao(Resource):
+    @etag_versionado(competicao_arg="competicao_id")
+    @cache_resposta(competicao_arg="competicao_id")
     def get(self, competicao_id):
         """Lista as estatísticas dos jogadores por uma competição"""
-        jogadores = ListarJogadores()
+        incluir_sem_eventos = request.args.get("incluir_sem_eventos", "true").lower() in ("1", "true", "sim")
 
-        resultado = []
-        for jogador in jogadores:
-            estat = jogador.contar_estatisticas_na_competicao(competicao_id)
-            resultado.append({
-                "id": jogador.id,
-                "nome": jogador.nome,
-                "posicao": jogador.posicao,
-                "nacionalidade": jogador.nacionalidade,
-                **estat
-            })
-
-        return resultado, 200
+        return ListarEstatisticasPorCompeticao(competicao_id, incluir_sem_eventos), 200
 
 @jogador_ns.route('/')
 class JogadorResource(Resource):
@@ -120,10 +106,11 @@ class JogadorPorNomeResource(Resource):
     @jogador_ns.response(404, "Jogador não encontrado", model=erro_model)
     def get(self, nome):
         """Obtém um jogador pelo nome"""
-        jogador = ListarJogadorPorNome(nome)
+        campos = ler_campos(CAMPOS_JOGADOR, {"estatisticas": CAMPOS_ESTATISTICAS})
+        jogador = ListarJogadorPorNome(nome, campos)
         if not jogador:
             return {"mensagem": "Jogador não encontrado"}, 404
-        return jogador.dici(), 200
+        return jogador.dici(campos=campos), 200
 
 @jogador_ns.route('/<int:id_jogador>')
 class JogadorIdResource(Resource):
@@ -152,64 +139,22 @@ class JogadorIdResource(Resource):
 
 @jogador_ns.route('/ranking')
 class RankingGeralResource(Resource):
+    @etag_versionado()
+    @cache_resposta()
     def get(self):
         """Lista o ranking geral de artilheiros, assistentes, cleansheets e mvps"""
         limite = min(int(request.args.get("limite", 10)), 10)
+        colocacao = request.args.get("colocacao", "").lower() in ("1", "true", "sim")
 
-        jogadores = ListarJogadores()
-        ranking = [j.estatisticas_ranking() for j in jogadores]
-
-        return {
-            "gols": sorted(
-                [j for j in ranking if j["gols"] > 0],
-                key=lambda x: x["gols"],
-                reverse=True
-            )[:limite],
-            "assistencias": sorted(
-                [j for j in ranking if j["assistencias"] > 0],
-                key=lambda x: x["assistencias"],
-                reverse=True
-            )[:limite],
-            "cleansheets": sorted(
-                [j for j in ranking if j["cleansheets"] > 0],
-                key=lambda x: x["cleansheets"],
-                reverse=True
-            )[:limite],
-            "mvps": sorted(
-                [j for j in ranking if j["mvps"] > 0],
-                key=lambda x: x["mvps"],
-                reverse=True
-            )[:limite]
-        }, 200
+        return RankingGeral(limite, colocacao), 200
 
 @jogador_ns.route('/ranking/<int:competicao_id>')
 class RankingPorCompeticaoResource(Resource):
+    @etag_versionado(competicao_arg="competicao_id")
+    @cache_resposta(competicao_arg="competicao_id")
     def get(self, competicao_id):
         """Lista o ranking por competição (gols, assistências, cleansheets e mvps)"""
         limite = min(int(request.args.get("limite", 10)), 10)
+        colocacao = request.args.get("colocacao", "").lower() in ("1", "true", "sim")
 
-        jogadores = ListarJogadores()
-        ranking = [j.estatisticas_ranking_competicao(competicao_id) for j in jogadores]
-
-        return {
-            "gols": sorted(
-                [j for j in ranking if j["gols"] > 0],
-                key=lambda x: x["gols"],
-                reverse=True
-            )[:limite],
-            "assistencias": sorted(
-                [j for j in ranking if j["assistencias"] > 0],
-                key=lambda x: x["assistencias"],
-                reverse=True
-            )[:limite],
-            "cleansheets": sorted(
-                [j for j in ranking if j["cleansheets"] > 0],
-                key=lambda x: x["cleansheets"],
-                reverse=True
-            )[:limite],
-            "mvps": sorted(
-                [j for j in ranking if j["mvps"] > 0],
-                key=lambda x: x["mvps"],
-                reverse=True
-            )[:limite]
-        }, 200
\ No newline at end of file
+        return RankingPorCompeticao(competicao_id, limite, colocacao), 200
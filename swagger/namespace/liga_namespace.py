@@ -0,0 +1,47 @@
+from flask_restx import Namespace, Resource, fields
+from Model.classificacao import ClassificacaoLiga
+from Controller.cache import cache_resposta, etag_versionado
+
+liga_ns = Namespace("Liga", description="Operações relacionadas às ligas")
+
+time_classificacao_model = liga_ns.model("TimeClassificacaoLiga", {
+    "id": fields.Integer(description="ID do time"),
+    "nome": fields.String(description="Nome do time"),
+    "pontos": fields.Integer(description="Pontuação do time"),
+    "vitorias": fields.Integer(description="Número de vitórias"),
+    "empates": fields.Integer(description="Número de empates"),
+    "derrotas": fields.Integer(description="Número de derrotas"),
+    "gols_marcados": fields.Integer(description="Gols marcados"),
+    "gols_sofridos": fields.Integer(description="Gols sofridos"),
+    "saldo_de_gols": fields.Integer(description="Saldo de gols"),
+    "jogos": fields.Integer(description="Número de jogos")
+})
+
+grupo_classificacao_model = liga_ns.model("GrupoClassificacaoLiga", {
+    "id": fields.Integer(description="ID do grupo (nulo em ligas sem grupos)"),
+    "nome": fields.String(description="Nome do grupo"),
+    "classificacao": fields.List(fields.Nested(time_classificacao_model), description="Classificação do grupo")
+})
+
+liga_classificacao_model = liga_ns.model("LigaClassificacao", {
+    "id": fields.Integer(description="ID da liga"),
+    "nome": fields.String(description="Nome da liga"),
+    "grupos": fields.List(fields.Nested(grupo_classificacao_model), description="Classificação de cada grupo")
+})
+
+erro_model = liga_ns.model("Erro", {
+    "mensagem": fields.String(example="Liga não encontrada")
+})
+
+@liga_ns.route('/<int:id_liga>/classificacao')
+class LigaClassificacaoResource(Resource):
+    @etag_versionado(competicao_arg="id_liga")
+    @cache_resposta(competicao_arg="id_liga")
+    @liga_ns.response(200, "Classificação da liga", liga_classificacao_model)
+    @liga_ns.response(404, "Liga não encontrada", erro_model)
+    def get(self, id_liga):
+        """Obtém a classificação de todos os grupos da liga"""
+        classificacao, erro = ClassificacaoLiga(id_liga)
+        if erro:
+            return {"mensagem": erro}, 404
+        return classificacao, 200
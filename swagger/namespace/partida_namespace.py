@@ -1,7 +1,11 @@
 from flask_cors import cross_origin
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, marshal
 from Controller.decorators import editor_ou_admin
-from Model.partida import ListarPartidas, ListarPartidasPorRodada, ListarPartidaPorId, CriarPartida, AtualizarPartida, DeletarPartida
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
+from Controller.fluxo import em_fluxo
+from Model.tabela import GerarTabela
+from Model.partida import ListarPartidasResumidas, IterarPartidasResumidas, ListarPartidasPorRodada, ListarPartidaPorId, CriarPartida, AtualizarPartida, DeletarPartida
 
 partida_ns = Namespace("Partida", description="Operações relacionadas às partidas")
 
@@ -13,7 +17,8 @@ partida_model = partida_ns.model("Partida", {
     "gols_casa": fields.Integer(required=False, example=2),
     "gols_fora": fields.Integer(required=False, example=1),
     "rodada": fields.String(required=True, example="C3"),
-    "link": fields.String(required=False, example="https://youtube.com/partida123")
+    "link": fields.String(required=False, example="https://youtube.com/partida123"),
+    "vencedor_id": fields.Integer(required=False, description="Vencedor de um empate no mata-mata (pênaltis)")
 })
 
 partida_view = partida_ns.model("PartidaView", {
@@ -55,6 +60,22 @@ partida_model_output = partida_ns.model("PartidaOutput", {
     "time_fora_id": fields.Integer(example=2)
 })
 
+tabela_model = partida_ns.model("Tabela", {
+    "grupo_id": fields.Integer(required=False, description="ID do grupo (informe grupo_id ou liga_id)", example=1),
+    "liga_id": fields.Integer(required=False, description="ID de uma liga sem grupos"),
+    "turnos": fields.Integer(required=False, description="1 (só ida) ou 2 (ida e volta)", example=2),
+    "prefixo_rodada": fields.String(required=False, description="Prefixo do rótulo das rodadas", example="R"),
+    "rodada_inicial": fields.Integer(required=False, description="Número da primeira rodada", example=1)
+})
+
+tabela_output_model = partida_ns.model("TabelaOutput", {
+    "competicao_id": fields.Integer(example=1),
+    "grupo_id": fields.Integer(example=1),
+    "turnos": fields.Integer(example=2),
+    "times": fields.Integer(example=20),
+    "rodadas": fields.Integer(example=38),
+    "partidas": fields.Integer(example=380)
+})
 
 erro_model = partida_ns.model("Erro", {
     "erro": fields.String(example="Partida não encontrada")
@@ -62,15 +83,19 @@ erro_model = partida_ns.model("Erro", {
 
 @partida_ns.route('/view')
 class PartidaViewResource(Resource):
-    @partida_ns.marshal_list_with(partida_view)
+    @etag_versionado()
+    @cache_resposta()
+    @em_fluxo(IterarPartidasResumidas)
+    @partida_ns.response(200, "Lista de partidas", [partida_view])
     def get(self):
         """Lista todas as partidas"""
-        partidas = ListarPartidas()
+        limite, apos = ler_paginacao()
+        partidas = ListarPartidasResumidas(limite, apos)
         
         if not partidas:
-            return {"message": "Nenhuma partida cadastrada"}, 200
+            return marshal({"message": "Nenhuma partida cadastrada"}, partida_view), 200
             
-        return [p.dici() for p in partidas], 200
+        return partidas, 200, cabecalhos_paginacao(partidas, limite)
 
 @partida_ns.route('/')
 class PartidaResource(Resource):
@@ -86,6 +111,19 @@ class PartidaResource(Resource):
             return {"erro": erro}, 400
         return partida.dici(), 201
     
+@partida_ns.route('/tabela')
+class TabelaResource(Resource):
+    @partida_ns.expect(tabela_model)
+    @partida_ns.response(201, "Tabela gerada com sucesso", tabela_output_model)
+    @partida_ns.response(400, "Dados inválidos", erro_model)
+    @editor_ou_admin
+    def post(self):
+        """Gera todas as partidas de turno (e returno) de um grupo ou liga"""
+        resumo, erro = GerarTabela(partida_ns.payload)
+        if erro:
+            return {"erro": erro}, 400
+        return resumo, 201
+
 @partida_ns.route('/rodada/<string:rodada>')
 class PartidaPorRodadaResource(Resource):
     @partida_ns.marshal_list_with(partida_view)
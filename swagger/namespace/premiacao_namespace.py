@@ -1,5 +1,7 @@
 from flask_restx import Namespace, Resource, fields
 from Controller.decorators import editor_ou_admin
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
 from Model.premiacao import (
     ListarPremiacoes, BuscarPremiacaoPorId,
     CriarPremiacao, AtualizarPremiacao, DeletarPremiacao
@@ -50,11 +52,14 @@ erro_model = premiacao_ns.model("Erro", {
 
 @premiacao_ns.route('/view')
 class PremiacaoViewResource(Resource):
+    @etag_versionado()
+    @cache_resposta()
     @premiacao_ns.marshal_list_with(premiacao_output_model)
     def get(self):
         """Lista todas as premiações"""
-        premiacoes = ListarPremiacoes()
-        return [p.dici() for p in premiacoes], 200
+        limite, apos = ler_paginacao()
+        premiacoes = ListarPremiacoes(limite, apos)
+        return [p.dici() for p in premiacoes], 200, cabecalhos_paginacao(premiacoes, limite)
 
 
 @premiacao_ns.route('/<int:premiacao_id>')
@@ -1,5 +1,7 @@
 from flask_restx import Namespace, Resource, fields
 from Controller.decorators import editor_ou_admin
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
 from Model.selecao import (
     ListarSelecoes, BuscarSelecaoPorId, CriarSelecao, AtualizarSelecao, DeletarSelecao
 )
@@ -44,11 +46,14 @@ erro_model = selecao_ns.model("Erro", {
 
 @selecao_ns.route("/")
 class SelecaoListResource(Resource):
+    @etag_versionado()
+    @cache_resposta()
     @selecao_ns.marshal_list_with(selecao_output_model)
     def get(self):
         """Lista todas as seleções da rodada"""
-        selecoes = ListarSelecoes()
-        return [s.dici() for s in selecoes], 200
+        limite, apos = ler_paginacao()
+        selecoes = ListarSelecoes(limite, apos)
+        return [s.dici() for s in selecoes], 200, cabecalhos_paginacao(selecoes, limite)
 
     @selecao_ns.expect(selecao_input_model)
     @selecao_ns.marshal_with(selecao_output_model)
@@ -1,6 +1,9 @@
 from flask_restx import Namespace, Resource, fields
 from Controller.decorators import editor_ou_admin
-from Model.sumula import ( ListarSumulas, BuscarSumulaPorId, CriarSumula, AtualizarSumula, DeletarSumula)
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
+from Controller.fluxo import em_fluxo
+from Model.sumula import ( ListarSumulas, IterarSumulas, BuscarSumulaPorId, CriarSumula, CriarSumulasEmLote, AtualizarSumula, DeletarSumula)
 
 sumula_ns = Namespace("Sumula", description="Operações relacionadas às súmulas das partidas")
 
@@ -36,6 +39,15 @@ erro_model = sumula_ns.model("Erro", {
     "mensagem": fields.String
 })
 
+sumula_lote_model = sumula_ns.model("SumulaLote", {
+    "sumulas": fields.List(fields.Nested(sumula_input_model), required=True, description="Súmulas a registrar")
+})
+
+sumula_lote_output_model = sumula_ns.model("SumulaLoteOutput", {
+    "criadas": fields.List(fields.Raw, description="Índice, ID e partida de cada súmula criada"),
+    "erros": fields.List(fields.Raw, description="Índice e mensagem de cada súmula rejeitada")
+})
+
 @sumula_ns.route('/')
 class SumulaCreateResource(Resource):
     @sumula_ns.expect(sumula_input_model)
@@ -51,13 +63,31 @@ class SumulaCreateResource(Resource):
             return {"mensagem": erro}, 400
         return sumula.dici(), 201
 
+@sumula_ns.route('/lote')
+class SumulaLoteResource(Resource):
+    @sumula_ns.expect(sumula_lote_model)
+    @sumula_ns.response(201, "Súmulas criadas", sumula_lote_output_model)
+    @sumula_ns.response(400, "Nenhuma súmula criada", sumula_lote_output_model)
+    @editor_ou_admin
+    def post(self):
+        """Cria várias súmulas de uma vez"""
+        dados = sumula_ns.payload or {}
+        resultado, erro = CriarSumulasEmLote(dados.get("sumulas"))
+        if erro:
+            return {"mensagem": erro}, 400
+        return resultado, 201 if resultado["criadas"] else 400
+
 @sumula_ns.route('/view')
 class SumulaViewResource(Resource):
+    @etag_versionado()
+    @cache_resposta()
+    @em_fluxo(IterarSumulas, sumula_output_model)
     @sumula_ns.marshal_list_with(sumula_output_model)
     def get(self):
         """Lista todas as súmulas"""
-        sumulas = ListarSumulas()
-        return [s.dici() for s in sumulas], 200
+        limite, apos = ler_paginacao()
+        sumulas = ListarSumulas(limite, apos)
+        return [s.dici() for s in sumulas], 200, cabecalhos_paginacao(sumulas, limite)
 
 @sumula_ns.route('/<int:sumula_id>')
 class SumulaResource(Resource):
@@ -1,6 +1,8 @@
 from flask_restx import Namespace, Resource, fields
 from Controller.decorators import editor_ou_admin
-from Model.time import ListarTimes, ListarTimePorId, CriarTime, AtualizarTime, DeletarTime, AdicionarJogadoresAoTime, RemoverJogadoresDoTime
+from Controller.cache import cache_resposta, etag_versionado
+from Controller.paginacao import ler_paginacao, cabecalhos_paginacao
+from Model.time import ListarTimes, ListarTimePorId, CriarTime, AtualizarTime, DeletarTime, AdicionarJogadoresAoTime, RemoverJogadoresDoTime, EditarElencos
 
 time_ns = Namespace("Time", description="Operações relacionadas aos times")
 
@@ -35,17 +37,36 @@ erro_model = time_ns.model("Erro", {
     "erro": fields.String(example="Time não encontrado")
 })
 
+elenco_operacao_model = time_ns.model("ElencoOperacao", {
+    "time_id": fields.Integer(required=True, example=1),
+    "adicionar": fields.List(fields.Integer, description="IDs dos jogadores a vincular ao time"),
+    "remover": fields.List(fields.Integer, description="IDs dos jogadores a desvincular do time")
+})
+
+elencos_model = time_ns.model("Elencos", {
+    "operacoes": fields.List(fields.Nested(elenco_operacao_model), required=True),
+    "expandir": fields.Boolean(default=False, description="Inclui o time completo em cada resultado")
+})
+
+elencos_output_model = time_ns.model("ElencosOutput", {
+    "times": fields.List(fields.Raw(example={"indice": 0, "time_id": 1, "adicionados": 2, "removidos": 1, "ignorados": 0})),
+    "erros": fields.List(fields.Raw(example={"indice": 1, "mensagem": "Time não encontrado"}))
+})
+
 @time_ns.route('/view')
 class TimeViewResource(Resource):
+    @etag_versionado()
+    @cache_resposta()
     @time_ns.marshal_list_with(time_model_output)
     def get(self):
         """Lista todos os times"""
-        times = ListarTimes()
+        limite, apos = ler_paginacao()
+        times = ListarTimes(limite, apos)
         
         if not times:
             return {"message": "Nenhum time cadastrado"}, 200
             
-        return [t.dici() for t in times], 200
+        return [t.dici() for t in times], 200, cabecalhos_paginacao(times, limite)
 
 @time_ns.route('/')
 class TimeResource(Resource):
@@ -95,6 +116,20 @@ class TimeIdResource(Resource):
             time_ns.abort(404, erro)
         return '', 204
     
+@time_ns.route('/elencos')
+class TimeElencosResource(Resource):
+    @time_ns.expect(elencos_model)
+    @time_ns.response(200, "Elencos atualizados", elencos_output_model)
+    @time_ns.response(400, "Dados inválidos", erro_model)
+    @editor_ou_admin
+    def post(self):
+        """Adiciona e remove jogadores de vários times de uma vez"""
+        dados = time_ns.payload or {}
+        resultado, erro = EditarElencos(dados.get("operacoes"), dados.get("expandir", False))
+        if erro:
+            time_ns.abort(400, erro)
+        return resultado, 200
+
 @time_ns.route('/<int:id>/jogadores')
 class TimeJogadoresResource(Resource):
     @time_ns.expect(jogador_ids_model)
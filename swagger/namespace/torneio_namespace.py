@@ -0,0 +1,66 @@
+from flask_restx import Namespace, Resource, fields
+from Controller.decorators import editor_ou_admin
+from Controller.cache import cache_resposta, etag_versionado
+from Model.chaveamento import ListarChave, MontarChave
+
+torneio_ns = Namespace("Torneio", description="Operações relacionadas ao mata-mata dos torneios")
+
+chave_model = torneio_ns.model("Chave", {
+    "times_ids": fields.List(fields.Integer, required=False, description="Times em ordem de semente", example=[1, 2, 3, 4]),
+    "grupos_ids": fields.List(fields.Integer, required=False, description="Grupos cuja classificação define as sementes", example=[1, 2]),
+    "classificados_por_grupo": fields.Integer(required=False, description="Quantos times de cada grupo avançam", example=2)
+})
+
+confronto_model = torneio_ns.model("ConfrontoChave", {
+    "id": fields.Integer(example=1),
+    "posicao": fields.Integer(description="Posição do confronto dentro da fase", example=0),
+    "time_casa_id": fields.Integer(example=1),
+    "time_casa": fields.String(example="Flamengo"),
+    "time_fora_id": fields.Integer(example=4),
+    "time_fora": fields.String(example="Vasco"),
+    "vencedor_id": fields.Integer(example=1),
+    "partida_id": fields.Integer(example=10),
+    "gols_casa": fields.Integer(example=2),
+    "gols_fora": fields.Integer(example=1),
+    "link": fields.String(example="https://youtube.com/partida123")
+})
+
+fase_model = torneio_ns.model("FaseChave", {
+    "fase": fields.Integer(description="0 é a primeira rodada do mata-mata", example=0),
+    "nome": fields.String(example="Semifinal"),
+    "confrontos": fields.List(fields.Nested(confronto_model))
+})
+
+chave_output_model = torneio_ns.model("ChaveOutput", {
+    "torneio_id": fields.Integer(example=1),
+    "fase_atual": fields.String(example="Semifinal"),
+    "fases": fields.List(fields.Nested(fase_model))
+})
+
+erro_model = torneio_ns.model("Erro", {
+    "mensagem": fields.String(example="Torneio não encontrado")
+})
+
+@torneio_ns.route('/<int:id_torneio>/chave')
+class TorneioChaveResource(Resource):
+    @etag_versionado(competicao_arg="id_torneio")
+    @cache_resposta(competicao_arg="id_torneio")
+    @torneio_ns.response(200, "Chaveamento do torneio", chave_output_model)
+    @torneio_ns.response(404, "Torneio ou chaveamento não encontrado", erro_model)
+    def get(self, id_torneio):
+        """Obtém o chaveamento completo do torneio"""
+        chave, erro = ListarChave(id_torneio)
+        if erro:
+            return {"mensagem": erro}, 404
+        return chave, 200
+
+    @torneio_ns.expect(chave_model)
+    @torneio_ns.response(201, "Chaveamento criado", chave_output_model)
+    @torneio_ns.response(400, "Dados inválidos", erro_model)
+    @editor_ou_admin
+    def post(self, id_torneio):
+        """Monta o chaveamento do torneio a partir das sementes ou da classificação dos grupos"""
+        chave, erro = MontarChave(id_torneio, torneio_ns.payload)
+        if erro:
+            return {"mensagem": erro}, 400
+        return chave, 201
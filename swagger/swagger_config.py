@@ -4,10 +4,13 @@ from swagger.namespace.time_namespace import time_ns
 from swagger.namespace.partida_namespace import partida_ns
 from swagger.namespace.competicao_namespace import competicao_ns
 from swagger.namespace.grupo_namespace import grupo_ns
+from swagger.namespace.liga_namespace import liga_ns
+from swagger.namespace.torneio_namespace import torneio_ns
 from swagger.namespace.auth_namespace import api as auth_ns
 from swagger.namespace.premiacao_namespace import premiacao_ns
 from swagger.namespace.sumula_namespace import sumula_ns
 from swagger.namespace.selecao_namespace import selecao_ns
+from swagger.namespace.admin_namespace import admin_ns
 
 def configure_swagger(app):
     api.init_app(app)
@@ -16,10 +19,13 @@ def configure_swagger(app):
     api.add_namespace(jogador_ns, path="/jogador")
     api.add_namespace(competicao_ns, path="/competicao")
     api.add_namespace(grupo_ns, path="/grupo")
+    api.add_namespace(liga_ns, path="/liga")
+    api.add_namespace(torneio_ns, path="/torneio")
     api.add_namespace(time_ns, path="/time")
     api.add_namespace(partida_ns, path="/partida")
     api.add_namespace(sumula_ns, path="/sumula")
     api.add_namespace(selecao_ns, path="/selecao")
     api.add_namespace(premiacao_ns, path="/premiacao")
+    api.add_namespace(admin_ns, path="/admin")
     
     api.mask_swagger = False
\ No newline at end of file
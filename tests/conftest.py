@@ -0,0 +1,14 @@
+import os
+import sys
+import tempfile
+
+# app.py lê a configuração e cria as tabelas ao ser importado. Por padrão os
+# testes usam um SQLite temporário; TESTES_DATABASE_URL aponta para um banco
+# vazio (ex.: PostgreSQL) para exercitar os caminhos específicos do dialeto
+_pasta = tempfile.mkdtemp(prefix="talkfhf_testes_")
+os.environ["DATABASE_URL"] = os.environ.get("TESTES_DATABASE_URL") or "sqlite:///" + os.path.join(_pasta, "testes.db")
+os.environ.setdefault("JWT_SECRET_KEY", "chave-de-testes-com-tamanho-suficiente")
+# sem cache de respostas, toda requisição chega ao banco
+os.environ["CACHE_RESPOSTAS_BYTES"] = "0"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
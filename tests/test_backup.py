@@ -0,0 +1,37 @@
+import sqlite3
+
+from sqlalchemy import update
+
+from app import app
+from Backup.backup import create_delta_backup, create_sqlite_backup, restore_backup
+from config import db
+from Model.competicao import CriarCompeticao
+from Model.jogador import CriarJogador, Jogador
+from Model.time import CriarTime
+
+def test_incremental_pega_update_no_lugar_e_pula_tabelas_paradas(tmp_path, monkeypatch):
+    # BACKUP_DIR é relativo ao diretório atual
+    monkeypatch.chdir(tmp_path)
+    with app.app_context():
+        liga, _ = CriarCompeticao({"nome": "Liga backup", "tipo": "liga"})
+        time, _ = CriarTime({"nome": "Time backup", "competicao_id": liga.id})
+        jogador, _ = CriarJogador({"nome": "Backup 1", "posicao": "ATK", "times_ids": [time.id]})
+
+        create_sqlite_backup()
+        db.session.execute(update(Jogador).where(Jogador.id == jogador.id).values(nome="Backup 2"))
+        db.session.commit()
+        caminho, relatorio = create_delta_backup()
+
+        linhas = {item["tabela"]: item["linhas"] for item in relatorio}
+        assert linhas["jogador"] > 0
+        if db.engine.dialect.name == "postgresql":
+            assert linhas["time"] == linhas["competicao"] == 0
+
+        restaurado = str(tmp_path / "restaurado.db")
+        restore_backup(caminho, restaurado)
+        conn = sqlite3.connect(restaurado)
+        try:
+            assert conn.execute("SELECT nome FROM jogador WHERE id = ?", (jogador.id,)).fetchone() == ("Backup 2",)
+            assert conn.execute("SELECT nome FROM time WHERE id = ?", (time.id,)).fetchone() == ("Time backup",)
+        finally:
+            conn.close()
@@ -0,0 +1,23 @@
+import pytest
+
+from app import app
+from Model.chaveamento import MontarChave
+from Model.competicao import CriarCompeticao
+
+@pytest.mark.parametrize("dados, mensagem", [
+    ({"grupos_ids": [1], "classificados_por_grupo": "2"}, None),
+    ({"grupos_ids": [1], "classificados_por_grupo": "dois"}, "Classificados por grupo deve ser um número inteiro"),
+    ({"grupos_ids": [1], "classificados_por_grupo": None}, "Classificados por grupo deve ser um número inteiro"),
+    ({"grupos_ids": ["1"]}, "grupos_ids deve ser uma lista de ids inteiros"),
+    ({"times_ids": [1, "2"]}, "times_ids deve ser uma lista de ids inteiros"),
+    ({"times_ids": 3}, "times_ids deve ser uma lista de ids inteiros"),
+])
+def test_montar_chave_valida_os_tipos(dados, mensagem):
+    with app.app_context():
+        torneio, _ = CriarCompeticao({"nome": "Torneio tipos", "tipo": "torneio"})
+        _, erro = MontarChave(torneio.id, dados)
+        if mensagem is None:
+            # "2" é convertido; o erro seguinte já é de dados, não de tipo
+            assert erro is not None and "inteiro" not in erro
+        else:
+            assert erro == mensagem
@@ -0,0 +1,31 @@
+from sqlalchemy import insert
+
+from app import app
+from config import db
+from Model.classificacao import ClassificacaoGrupo, atualizar_classificacao
+from Model.competicao import CriarCompeticao
+from Model.grupo import CriarGrupo
+from Model.time import CriarTime
+
+def _grupo_com_dois_times():
+    liga, _ = CriarCompeticao({"nome": "Liga classificação", "tipo": "liga"})
+    grupo, _ = CriarGrupo({"nome": "C", "liga_id": liga.id})
+    casa, _ = CriarTime({"nome": "Casa", "competicao_id": liga.id, "grupo_id": grupo.id})
+    fora, _ = CriarTime({"nome": "Fora", "competicao_id": liga.id, "grupo_id": grupo.id})
+    return grupo.id, casa.id, fora.id
+
+def test_atualizar_com_linha_ja_criada_por_outra_escrita():
+    with app.app_context():
+        grupo_id, casa_id, fora_id = _grupo_com_dois_times()
+        # linha criada por um resultado concorrente depois que este começou
+        db.session.execute(insert(ClassificacaoGrupo), [
+            {"grupo_id": grupo_id, "time_id": casa_id, "pontos": 3, "vitorias": 1, "jogos": 1}
+        ])
+
+        atualizar_classificacao(atual=(grupo_id, casa_id, fora_id, 2, 1))
+        db.session.commit()
+
+        casa = db.session.get(ClassificacaoGrupo, (grupo_id, casa_id))
+        fora = db.session.get(ClassificacaoGrupo, (grupo_id, fora_id))
+        assert (casa.pontos, casa.vitorias, casa.jogos) == (6, 2, 2)
+        assert (fora.pontos, fora.derrotas, fora.jogos) == (0, 1, 1)
@@ -0,0 +1,30 @@
+from sqlalchemy import insert
+
+from app import app
+from config import db
+from Model.estatistica_jogador import EstatisticaJogador
+from Model.estatisticas import atualizar_estatisticas
+from Model.jogador import CriarJogador
+
+def test_atualizar_com_linha_ja_criada_por_outra_escrita():
+    with app.app_context():
+        jogador, _ = CriarJogador({"nome": "Estatística existente", "posicao": "ATK"})
+        jogador_id = jogador.id
+        # linha criada por uma escrita concorrente depois que esta começou
+        db.session.execute(insert(EstatisticaJogador), [{"jogador_id": jogador_id, "gols": 2}])
+
+        atualizar_estatisticas(adicionados=[(jogador_id, "gols"), (jogador_id, "mvps")])
+        db.session.commit()
+
+        linha = db.session.get(EstatisticaJogador, jogador_id)
+        assert (linha.gols, linha.mvps) == (3, 1)
+
+def test_atualizar_cria_a_primeira_linha():
+    with app.app_context():
+        jogador, _ = CriarJogador({"nome": "Estatística nova", "posicao": "GK"})
+        jogador_id = jogador.id
+
+        atualizar_estatisticas(adicionados=[(jogador_id, "cleansheets")])
+        db.session.commit()
+
+        assert db.session.get(EstatisticaJogador, jogador_id).cleansheets == 1
@@ -0,0 +1,43 @@
+import pytest
+
+from app import app
+from Model.competicao import CriarCompeticao
+from Model.jogador import CriarJogador
+from Model.partida import CriarPartida
+from Model.sumula import CriarSumula
+from Model.time import CriarTime
+
+@pytest.fixture(scope="module")
+def primeiro_id():
+    with app.app_context():
+        liga, _ = CriarCompeticao({"nome": "Liga fluxo", "tipo": "liga"})
+        casa, _ = CriarTime({"nome": "Casa fluxo", "competicao_id": liga.id})
+        fora, _ = CriarTime({"nome": "Fora fluxo", "competicao_id": liga.id})
+        jogadores = [
+            CriarJogador({"nome": f"Fluxo {i}", "posicao": "ATK", "times_ids": [casa.id]})[0].id
+            for i in range(5)
+        ]
+        for i in range(5):
+            partida, _ = CriarPartida({
+                "competicao_id": liga.id, "rodada": f"F{i}",
+                "time_casa_id": casa.id, "time_fora_id": fora.id, "gols_casa": i, "gols_fora": 0
+            })
+            CriarSumula({"partida_id": partida.id, "mvp_id": jogadores[i], "gols": [{"jogador_id": jogadores[0]}]})
+        return jogadores[0]
+
+@pytest.mark.parametrize("url", [
+    "/jogador/geral?limit=2&after={apos}",
+    "/jogador/geral?fields=nome,gols&limit=3&after={apos}",
+    "/jogador/geral?fields=nome&include=estatisticas&after={apos}",
+    "/partida/view?limit=2&after=1",
+    "/sumula/view?limit=2&after=1",
+])
+def test_fluxo_devolve_o_mesmo_corpo(primeiro_id, url):
+    cliente = app.test_client()
+    url = url.format(apos=primeiro_id)
+
+    comum = cliente.get(url)
+    fluxo = cliente.get(url + "&stream=true")
+
+    assert comum.status_code == fluxo.status_code == 200
+    assert fluxo.get_json() == comum.get_json()
@@ -0,0 +1,87 @@
+import io
+import json
+
+from sqlalchemy import select
+
+from app import app
+from config import db
+from Model import importacao
+from Model.importacao import ImportarRegistros, ler_registros
+from Model.jogador import Jogador
+from Model.time import Time
+
+class ArquivoContado(io.StringIO):
+    def __init__(self, texto):
+        super().__init__(texto)
+        self.lido = 0
+
+    def read(self, tamanho=-1):
+        dados = super().read(tamanho)
+        self.lido += len(dados)
+        return dados
+
+def test_array_json_e_lido_aos_poucos(monkeypatch):
+    monkeypatch.setattr(importacao, "TAMANHO_LEITURA_JSON", 16)
+    registros = [{"nome": f"Item {i}", "gols": 10 ** i, "tags": ["a", "b"]} for i in range(200)]
+    texto = "  [\n" + ",\n".join(json.dumps(r) for r in registros) + "\n]\n"
+    arquivo = ArquivoContado(texto)
+
+    leitor = ler_registros(arquivo, "json")
+    assert next(leitor) == registros[0]
+    assert arquivo.lido < len(texto) // 10
+    assert [registros[0]] + list(leitor) == registros
+
+def test_array_json_truncado_e_invalido():
+    leitor = ler_registros(io.StringIO('[{"nome": "A"}, {"nome": '), "json")
+    assert next(leitor) == {"nome": "A"}
+    try:
+        next(leitor)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("array truncado deveria falhar")
+
+def test_importacao_em_lotes_numera_as_linhas_do_arquivo():
+    linhas = ["nome,logo"] + [f"Lote {i}," for i in range(5)] + ["Lote 1,", ",", "Lote 5,"]
+    arquivo = io.StringIO("\n".join(linhas) + "\n")
+
+    with app.app_context():
+        resultado, erro = ImportarRegistros("times", arquivo, "csv", simular=True, tamanho_lote=2)
+
+        assert erro is None
+        assert (resultado["linhas"], resultado["validas"], resultado["importadas"]) == (8, 6, 0)
+        # o nome repetido está num lote diferente do original
+        assert resultado["erros"] == [
+            {"linha": 7, "mensagem": "Já existe um time com esse nome"},
+            {"linha": 8, "mensagem": "Nome é obrigatório"}
+        ]
+        assert db.session.execute(select(Time.id).where(Time.nome.like("Lote %"))).first() is None
+
+def test_importacao_grava_todos_os_lotes():
+    with app.app_context():
+        arquivo = io.StringIO("nome\n" + "".join(f"Elenco {i}\n" for i in range(3)))
+        resultado, erro = ImportarRegistros("times", arquivo, "csv", tamanho_lote=2)
+        assert erro is None and resultado["importadas"] == 3
+
+        jogadores = [
+            {"nome": f"Importado {i}", "posicao": "MID", "times": f"Elenco {i % 3};Elenco {(i + 1) % 3}"}
+            for i in range(7)
+        ]
+        arquivo = io.StringIO("\n".join(json.dumps(j) for j in jogadores))
+        resultado, erro = ImportarRegistros("jogadores", arquivo, "json", tamanho_lote=3)
+        assert erro is None
+        assert (resultado["linhas"], resultado["importadas"], resultado["erros"]) == (7, 7, [])
+
+        importados = db.session.execute(
+            select(Jogador).where(Jogador.nome.like("Importado %")).order_by(Jogador.id)
+        ).scalars().all()
+        assert [j.nome for j in importados] == [j["nome"] for j in jogadores]
+        assert all(len(j.times) == 2 for j in importados)
+
+def test_erro_de_leitura_no_meio_desfaz_os_lotes_gravados():
+    with app.app_context():
+        arquivo = io.StringIO('{"nome": "Parcial 1"}\n{"nome": "Parcial 2"}\n{"nome": \n')
+        resultado, erro = ImportarRegistros("times", arquivo, "json", tamanho_lote=1)
+
+        assert resultado is None and erro.startswith("Arquivo inválido")
+        assert db.session.execute(select(Time.id).where(Time.nome.like("Parcial %"))).first() is None
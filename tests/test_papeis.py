@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from app import app
+from Controller import decorators
+from Controller.decorators import PapeisUsuarios
+
+@pytest.fixture
+def banco(monkeypatch):
+    chamadas = {"todos": 0, "um": []}
+    papeis = {1: "admin", 2: "editor"}
+
+    def todos():
+        chamadas["todos"] += 1
+        return dict(papeis)
+
+    def um(usuario_id):
+        chamadas["um"].append(usuario_id)
+        return papeis.get(usuario_id)
+
+    monkeypatch.setattr(decorators, "papeis_dos_usuarios", todos)
+    monkeypatch.setattr(decorators, "papel_do_usuario", um)
+    with app.app_context():
+        yield papeis, chamadas
+
+def test_token_antigo_usa_o_retrato(banco):
+    _, chamadas = banco
+    cache = PapeisUsuarios()
+    antigo = int(time.time()) - 10
+
+    assert [cache.obter(1, antigo) for _ in range(3)] == ["admin"] * 3
+    assert chamadas == {"todos": 1, "um": []}
+
+def test_token_novo_rele_so_o_usuario(banco):
+    papeis, chamadas = banco
+    cache = PapeisUsuarios()
+    cache.obter(1, 0)
+
+    papeis[2] = "admin"
+    assert cache.obter(2, int(time.time())) == "admin"
+    assert cache.obter(1, 0) == "admin"
+    assert chamadas == {"todos": 1, "um": [2]}
+
+def test_usuario_desconhecido_e_lido_uma_vez(banco):
+    _, chamadas = banco
+    cache = PapeisUsuarios()
+    antigo = int(time.time()) - 10
+
+    assert cache.obter(99, antigo) is None
+    assert cache.obter(99, antigo) is None
+    assert chamadas == {"todos": 1, "um": [99]}
+
+def test_ttl_recarrega_o_retrato(banco, monkeypatch):
+    papeis, chamadas = banco
+    cache = PapeisUsuarios()
+    cache.obter(1, 0)
+
+    papeis[1] = "editor"
+    monkeypatch.setitem(app.config, "PAPEIS_TTL_SEGUNDOS", 0)
+    assert cache.obter(1, 0) == "editor"
+    assert chamadas == {"todos": 2, "um": []}
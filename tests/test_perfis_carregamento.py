@@ -0,0 +1,128 @@
+import pytest
+from sqlalchemy import event
+
+from app import app
+from config import db
+from Model.competicao import CriarCompeticao
+from Model.grupo import CriarGrupo
+from Model.time import CriarTime
+from Model.jogador import CriarJogador
+from Model.partida import CriarPartida
+from Model.sumula import CriarSumula
+from Model.premiacao import CriarPremiacao
+from Model.selecao import CriarSelecao
+
+N = 3
+
+LISTAS = (
+    "/partida/",
+    "/partida/view",
+    "/jogador/view",
+    "/jogador/geral",
+    "/time/",
+    "/time/view",
+    "/competicao/",
+    "/competicao/view",
+    "/grupo/",
+    "/grupo/view",
+    "/sumula/view",
+    "/premiacao/view",
+    "/selecao/",
+)
+
+DETALHES = (
+    "/partida/{partida}",
+    "/time/{time}",
+    "/competicao/{liga}",
+    "/grupo/{grupo}",
+    "/sumula/{sumula}",
+    "/premiacao/{premiacao}",
+    "/selecao/{selecao}",
+)
+
+def semear(quantidade):
+    # uma liga com dois grupos de `quantidade` times; a súmula, a premiação e a
+    # seleção crescem junto, para que os detalhes também tenham mais filhos
+    liga, _ = CriarCompeticao({"nome": f"Liga {quantidade}", "tipo": "liga"})
+    ids = {"liga": liga.id}
+    jogadores, partidas = [], []
+    for nome in ("A", "B"):
+        grupo, _ = CriarGrupo({"nome": f"{nome}{quantidade}", "liga_id": liga.id})
+        ids["grupo"] = grupo.id
+        times = []
+        for i in range(quantidade):
+            time, _ = CriarTime({"nome": f"{nome}{quantidade}-{i}", "competicao_id": liga.id, "grupo_id": grupo.id})
+            times.append(time.id)
+            for j in range(2):
+                jogador, _ = CriarJogador({"nome": f"{nome}{quantidade}-{i}-{j}", "posicao": "ATK", "times_ids": [time.id]})
+                jogadores.append(jogador.id)
+        ids["time"] = times[0]
+        for i, casa in enumerate(times):
+            fora = times[(i + 1) % quantidade]
+            if casa == fora:
+                continue
+            partida, _ = CriarPartida({
+                "competicao_id": liga.id, "grupo_id": grupo.id, "rodada": f"R{i}",
+                "time_casa_id": casa, "time_fora_id": fora, "gols_casa": i % 3, "gols_fora": 1
+            })
+            partidas.append(partida.id)
+
+    for partida_id in partidas:
+        sumula, erro = CriarSumula({
+            "partida_id": partida_id,
+            "mvp_id": jogadores[0],
+            "gols": [
+                {"jogador_id": j, "assistencia_id": jogadores[0], "contra": False}
+                for j in jogadores[:quantidade]
+            ],
+            "cleansheets": jogadores[:quantidade],
+            "cartoes": [{"jogador_id": j, "tipo": "amarelo"} for j in jogadores[:quantidade]]
+        })
+        assert erro is None, erro
+    ids["partida"] = partidas[0]
+    ids["sumula"] = sumula.id
+
+    premiacao, erro = CriarPremiacao({
+        "competicao_id": liga.id,
+        "mvp_id": jogadores[0],
+        "artilheiro_id": jogadores[1],
+        "top_atk": [{"jogador_id": j, "posicao": p} for p, j in enumerate(jogadores[:quantidade], 1)]
+    })
+    assert erro is None, erro
+    ids["premiacao"] = premiacao.id
+
+    selecao, erro = CriarSelecao({"competicao_id": liga.id, "rodada": "R1", "atk": jogadores[:quantidade]})
+    assert erro is None, erro
+    ids["selecao"] = selecao.id
+    return ids
+
+def contar_consultas(cliente, url):
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        resposta = cliente.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    assert resposta.status_code == 200, (url, resposta.status_code)
+    return len(consultas)
+
+@pytest.fixture(scope="module")
+def medicoes():
+    cliente = app.test_client()
+    resultado = {}
+    for quantidade in (N, 2 * N):
+        with app.app_context():
+            ids = semear(quantidade)
+        urls = LISTAS + tuple(url.format(**ids) for url in DETALHES)
+        resultado[quantidade] = [contar_consultas(cliente, url) for url in urls]
+    return resultado
+
+@pytest.mark.parametrize("indice, url", list(enumerate(LISTAS + DETALHES)))
+def test_numero_de_consultas_nao_depende_das_linhas(medicoes, indice, url):
+    assert medicoes[N][indice] == medicoes[2 * N][indice], url
@@ -0,0 +1,52 @@
+from sqlalchemy import select
+
+from app import app
+from config import db
+from Model.competicao import CriarCompeticao
+from Model.jogador import CriarJogador
+from Model.partida import CriarPartida
+from Model.sumula import Sumula, CriarSumula, CriarSumulasEmLote
+from Model.time import CriarTime
+
+def _duas_partidas(nome):
+    liga, _ = CriarCompeticao({"nome": f"Liga {nome}", "tipo": "liga"})
+    casa, _ = CriarTime({"nome": f"Casa {nome}", "competicao_id": liga.id})
+    fora, _ = CriarTime({"nome": f"Fora {nome}", "competicao_id": liga.id})
+    jogador, _ = CriarJogador({"nome": f"Jogador {nome}", "posicao": "ATK", "times_ids": [casa.id]})
+    partidas = [
+        CriarPartida({
+            "competicao_id": liga.id, "rodada": f"R{i}",
+            "time_casa_id": casa.id, "time_fora_id": fora.id, "gols_casa": 1, "gols_fora": 0
+        })[0].id
+        for i in range(2)
+    ]
+    return partidas, jogador.id
+
+def test_lote_reporta_jogador_inexistente_por_item():
+    with app.app_context():
+        (boa, ruim), jogador_id = _duas_partidas("lote")
+        inexistente = jogador_id + 10_000
+
+        resultado, erro = CriarSumulasEmLote([
+            {"partida_id": boa, "gols": [{"jogador_id": jogador_id}]},
+            {"partida_id": ruim, "gols": [{"jogador_id": jogador_id, "assistencia_id": inexistente}]}
+        ])
+
+        assert erro is None
+        assert [c["partida_id"] for c in resultado["criadas"]] == [boa]
+        assert resultado["erros"] == [{"indice": 1, "mensagem": f"Jogador {inexistente} não encontrado"}]
+        criadas = db.session.execute(
+            select(Sumula.partida_id).where(Sumula.partida_id.in_([boa, ruim]))
+        ).scalars().all()
+        assert criadas == [boa]
+
+def test_sumula_com_jogador_inexistente_nao_e_criada():
+    with app.app_context():
+        (partida_id, _), jogador_id = _duas_partidas("avulsa")
+        inexistente = jogador_id + 10_000
+
+        sumula, erro = CriarSumula({"partida_id": partida_id, "mvp_id": inexistente})
+
+        assert sumula is None
+        assert erro == f"Jogador {inexistente} não encontrado"
+        assert db.session.execute(select(Sumula.id).where(Sumula.partida_id == partida_id)).first() is None